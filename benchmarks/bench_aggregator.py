@@ -0,0 +1,117 @@
+"""Per-cycle cost: full-window rescan (MentionsAggregator) vs IncrementalAggregator.
+
+An in-memory row source stands in for `mention_events`; each cycle advances `--poll-seconds`
+and appends `--new` rows to a window already holding `--window-rows`.
+
+Usage: PYTHONPATH=src python benchmarks/bench_aggregator.py --window-rows 200000 --new 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+from corpus import TICKERS
+
+from common.models import MentionRecord, MinuteAggregation
+from trend.aggregator import IncrementalAggregator, MentionsAggregator
+
+MinuteKey = tuple[str, datetime]
+Row = tuple[datetime, MentionRecord]
+
+
+def _minute(mention: MentionRecord) -> MinuteKey:
+    return mention.ticker, mention.ts_utc.replace(second=0, microsecond=0)
+
+
+class MemorySource:
+    def __init__(self) -> None:
+        self.stamps: list[datetime] = []
+        self.rows: list[Row] = []
+        self.by_minute: dict[MinuteKey, list[Row]] = defaultdict(list)
+        self.upserted = 0
+
+    async def upsert(self, aggregations: Sequence[MinuteAggregation]) -> None:
+        self.upserted += len(aggregations)
+
+    async def fetch_changed_minutes(self, changed_since: datetime, since: datetime) -> list[Row]:
+        start = bisect_left(self.stamps, changed_since)
+        changed = {_minute(mention) for _, mention in self.rows[start:] if mention.ts_utc >= since}
+        return [row for key in changed for row in self.by_minute[key]]
+
+    async def fetch_mentions_since(self, since: datetime) -> list[MentionRecord]:
+        return [mention for _, mention in self.rows if mention.ts_utc >= since]
+
+    def append(self, count: int, now: datetime, span: timedelta, rng: random.Random) -> None:
+        """Insert `count` rows with `updated_at` = `now` and ts_utc up to `span` earlier."""
+
+        for _ in range(count):
+            row_id = len(self.rows) + 1
+            mention = MentionRecord(
+                ts_utc=now - span * rng.random(),
+                subreddit="wallstreetbets",
+                reddit_id=f"c{row_id}",
+                author=f"user{rng.randint(0, 5000)}",
+                ticker=rng.choice(TICKERS),
+                confidence=0.9,
+                thread_id=f"t{rng.randint(0, 300)}",
+                sentiment_score=rng.uniform(-0.5, 0.5),
+            )
+            self.stamps.append(now)
+            self.rows.append((now, mention))
+            self.by_minute[_minute(mention)].append((now, mention))
+
+
+async def run(
+    window_rows: int, new: int, cycles: int, window_minutes: int, poll_seconds: int
+) -> None:
+    rng = random.Random(7)  # noqa: S311 - seeded synthetic data, not security
+    now = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+    window = timedelta(minutes=window_minutes)
+    source = MemorySource()
+    source.append(window_rows, now, window - timedelta(minutes=1), rng)
+    incremental = IncrementalAggregator(source, window=window, clock=lambda: now.timestamp())
+    await incremental.run_once()
+
+    full_best = incremental_best = float("inf")
+    for _ in range(cycles):
+        now += timedelta(seconds=poll_seconds)
+        source.append(new, now, timedelta(seconds=poll_seconds), rng)
+
+        started = time.perf_counter()
+        aggregator = MentionsAggregator(source)
+        aggregator.extend(await source.fetch_mentions_since(now - window))
+        full_buckets = await aggregator.flush()
+        full_best = min(full_best, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await incremental.run_once()
+        incremental_best = min(incremental_best, time.perf_counter() - started)
+
+    print(f"full rescan:  {full_best * 1000:8.1f} ms/cycle, {full_buckets} buckets upserted")
+    print(
+        f"incremental:  {incremental_best * 1000:8.1f} ms/cycle, "
+        f"{incremental.buckets_rebuilt} buckets rebuilt"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--window-rows", type=int, default=200_000)
+    parser.add_argument("--new", type=int, default=500)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--window-minutes", type=int, default=60)
+    parser.add_argument("--poll-seconds", type=int, default=60)
+    args = parser.parse_args()
+    asyncio.run(
+        run(args.window_rows, args.new, args.cycles, args.window_minutes, args.poll_seconds)
+    )
+
+
+if __name__ == "__main__":
+    main()
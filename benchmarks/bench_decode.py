@@ -0,0 +1,125 @@
+"""Micro-benchmark: listing decode + RedditItem construction, old path vs fast path.
+
+Usage: PYTHONPATH=src python benchmarks/bench_decode.py --pages 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import UTC, datetime
+
+from common.models import RedditItem
+from ingestor.decoding import decode_listing, msgspec, orjson
+from ingestor.dedup import SeenIndex
+
+# Real listing children carry ~60 fields; pad with the kinds of noise we never store.
+_NOISE = {
+    "all_awardings": [],
+    "gildings": {},
+    "author_flair_richtext": [{"e": "text", "t": "flair"}],
+    "treatment_tags": [],
+    "approved_by": None,
+    "author_fullname": "t2_abcdef",
+    "body_html": "&lt;div class=\"md\"&gt;&lt;p&gt;text&lt;/p&gt;&lt;/div&gt;",
+    "subreddit_name_prefixed": "r/wallstreetbets",
+    "controversiality": 0,
+    "distinguished": None,
+    "stickied": False,
+    "locked": False,
+    "total_awards_received": 0,
+    "ups": 1,
+    "downs": 0,
+}
+
+
+def make_page(rng: random.Random, start_id: int, size: int = 100) -> bytes:
+    children = []
+    for offset in range(size):
+        comment = {
+            "id": format(start_id + offset, "x"),
+            "subreddit": "wallstreetbets",
+            "author": f"user{rng.randint(0, 5000)}",
+            "body": "GME to the moon " * rng.randint(1, 8),
+            "created_utc": 1704067200 + offset,
+            "score": rng.randint(-5, 500),
+            "permalink": f"/r/wallstreetbets/comments/x/{offset}",
+            "parent_id": "t3_x",
+            "link_id": "t3_x",
+            **_NOISE,
+        }
+        children.append({"kind": "t1", "data": comment})
+    return json.dumps({"data": {"after": "t1_x", "children": children}}).encode()
+
+
+def baseline(raw: bytes, seen: set[str]) -> list[RedditItem]:
+    """The pre-fast-path decode: stdlib json, validated model per child."""
+
+    comments = json.loads(raw).get("data", {}).get("children", [])
+    items = []
+    for comment_data in reversed(comments):
+        comment = comment_data.get("data", {})
+        if comment.get("id") in seen:
+            continue
+        seen.add(comment.get("id"))
+        items.append(
+            RedditItem(
+                id=comment.get("id", ""),
+                kind="comment",
+                subreddit=comment.get("subreddit", "wallstreetbets"),
+                author=comment.get("author", "[deleted]"),
+                body=comment.get("body", ""),
+                created_utc=datetime.fromtimestamp(comment.get("created_utc", 0), tz=UTC),
+                score=comment.get("score", 0),
+                permalink=comment.get("permalink", ""),
+                parent_id=comment.get("parent_id", ""),
+                link_id=comment.get("link_id", ""),
+            )
+        )
+    return items
+
+
+def fast(raw: bytes, seen: SeenIndex) -> list[RedditItem]:
+    records, _ = decode_listing(raw)
+    return [record.to_item("wallstreetbets") for record in reversed(records) if seen.add(record.id)]
+
+
+def run(pages: int, overlap: float) -> None:
+    rng = random.Random(7)  # noqa: S311 - seeded synthetic data, not security
+    # Consecutive polls overlap: only (1 - overlap) of each page is new.
+    step = max(1, int(100 * (1 - overlap)))
+    payloads = [make_page(rng, i * step) for i in range(pages)]
+    comments = pages * 100
+
+    started = time.perf_counter()
+    legacy_seen: set[str] = set()
+    for raw in payloads:
+        baseline(raw, legacy_seen)
+    legacy_secs = time.perf_counter() - started
+
+    started = time.perf_counter()
+    seen = SeenIndex(capacity=100_000)
+    for raw in payloads:
+        fast(raw, seen)
+    fast_secs = time.perf_counter() - started
+
+    print(
+        f"msgspec: {msgspec is not None}, orjson: {orjson is not None}; "
+        f"pages={pages} overlap={overlap:.0%}"
+    )
+    print(f"json + validated RedditItem: {comments / legacy_secs:,.0f} comments/s")
+    print(
+        f"fast decode + skip-seen: {comments / fast_secs:,.0f} comments/s "
+        f"({legacy_secs / fast_secs:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark listing decode paths")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument(
+        "--overlap", type=float, default=0.0, help="Fraction of each page already seen"
+    )
+    args = parser.parse_args()
+    run(args.pages, args.overlap)
@@ -0,0 +1,55 @@
+"""Memory/throughput benchmark for the ingestor dedup index.
+
+Usage: PYTHONPATH=src python benchmarks/bench_dedup.py --ids 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from ingestor.dedup import SeenIndex
+
+
+def _ids(count: int, start: int = 0) -> list[str]:
+    return [format(value, "x") for value in range(start, start + count)]
+
+
+def run(count: int, capacity: int, bloom_bits: int) -> None:
+    keys = _ids(count)
+    misses = _ids(count, start=count)
+
+    started = time.perf_counter()
+    index = SeenIndex(capacity=capacity, bloom_bits=bloom_bits)
+    for key in keys:
+        index.add(key)
+    insert_secs = time.perf_counter() - started
+
+    # Measured in a second pass: tracemalloc slows allocation-heavy loops considerably.
+    del index
+    tracemalloc.start()
+    index = SeenIndex(capacity=capacity, bloom_bits=bloom_bits)
+    index.update(keys)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    hits = sum(1 for key in keys[-capacity:] if key in index)
+    hit_secs = time.perf_counter() - started
+    started = time.perf_counter()
+    false_hits = sum(1 for key in misses if key in index)
+    miss_secs = time.perf_counter() - started
+
+    label = f"capacity={capacity} bloom_bits={bloom_bits}"
+    print(f"{label}: insert {count / insert_secs:,.0f} ids/s, peak {peak / 1e6:.1f} MB")
+    print(f"{label}: lookup hit {hits / hit_secs:,.0f} ids/s, miss {count / miss_secs:,.0f} ids/s")
+    print(f"{label}: false positives {false_hits}/{count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SeenIndex at scale")
+    parser.add_argument("--ids", type=int, default=1_000_000)
+    parser.add_argument("--capacity", type=int, default=1_000_000)
+    parser.add_argument("--bloom-bits", type=int, default=0)
+    args = parser.parse_args()
+    run(args.ids, args.capacity, args.bloom_bits)
@@ -0,0 +1,47 @@
+"""Throughput benchmark: MentionExtractor.extract per item vs extract_batch.
+
+Usage: PYTHONPATH=src python benchmarks/bench_extract.py --comments 50000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from corpus import ALIASES, STOPLIST, TICKERS, make_corpus
+
+from nlp.pipeline import MentionExtractor
+
+
+def run(comments: int, batch_size: int, repeats: int) -> None:
+    corpus = make_corpus(comments)
+    extractor = MentionExtractor(TICKERS, STOPLIST, alias_map=ALIASES)
+    batches = [corpus[offset : offset + batch_size] for offset in range(0, comments, batch_size)]
+
+    def per_item() -> int:
+        return sum(len(extractor.extract(item).mentions) for item in corpus)
+
+    def batched() -> int:
+        return sum(
+            len(result.mentions) for batch in batches for result in extractor.extract_batch(batch)
+        )
+
+    for name, fn in (("extract per item", per_item), (f"extract_batch({batch_size})", batched)):
+        best = float("inf")
+        mentions = 0
+        for _ in range(repeats):
+            started = time.perf_counter()
+            mentions = fn()
+            best = min(best, time.perf_counter() - started)
+        print(
+            f"{name}: {comments / best:,.0f} comments/s, "
+            f"{mentions / best:,.0f} mentions/s ({mentions} mentions)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark mention extraction throughput")
+    parser.add_argument("--comments", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.comments, args.batch_size, args.repeats)
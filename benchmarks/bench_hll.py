@@ -0,0 +1,83 @@
+"""HyperLogLog author sketches: estimate error, add throughput and window merge throughput.
+
+Usage: PYTHONPATH=src python benchmarks/bench_hll.py --minutes 43200 --authors-per-minute 40
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from trend.hll import HyperLogLog
+
+
+def error_table(precision: int, trials: int) -> None:
+    print(f"precision {precision}: relative error over {trials} trials")
+    for cardinality in (10, 100, 1_000, 10_000, 100_000):
+        errors = []
+        for trial in range(trials):
+            users = (f"t{trial}-user{idx}" for idx in range(cardinality))
+            sketch = HyperLogLog.from_items(users, precision)
+            errors.append(abs(sketch.estimate() - cardinality) / cardinality)
+        size = len(sketch.to_bytes())
+        print(
+            f"  n={cardinality:>7,}: mean {sum(errors) / trials:6.2%}, "
+            f"max {max(errors):6.2%}, {size:>5,} bytes"
+        )
+
+
+def window_merge(minutes: int, authors_per_minute: int, population: int, precision: int) -> None:
+    rng = random.Random(3)  # noqa: S311 - seeded synthetic data, not security
+    # A heavy-tailed population: a few regulars post nearly every minute.
+    weights = [1.0 / (rank + 1) for rank in range(population)]
+    exact: set[str] = set()
+    summed = 0
+    payloads = []
+    add_seconds = 0.0
+    adds = 0
+    for _ in range(minutes):
+        picks = rng.choices(range(population), weights=weights, k=authors_per_minute)
+        authors = {f"user{idx}" for idx in picks}
+        exact |= authors
+        summed += len(authors)
+        started = time.perf_counter()
+        payloads.append(HyperLogLog.from_items(authors, precision).to_bytes())
+        add_seconds += time.perf_counter() - started
+        adds += len(authors)
+
+    started = time.perf_counter()
+    merged = HyperLogLog.merge_all(payloads)
+    merge_seconds = time.perf_counter() - started
+    stored = sum(map(len, payloads))
+    print(
+        f"window of {minutes:,} minute sketches "
+        f"({stored / len(payloads):.0f} bytes avg, {stored / 1e6:.1f} MB total)"
+    )
+    print(f"  sketch build: {adds / add_seconds:,.0f} authors/s")
+    print(
+        f"  merge:        {minutes / merge_seconds:,.0f} sketches/s "
+        f"({merge_seconds * 1000:.0f} ms)"
+    )
+    print(
+        f"  distinct authors: exact {len(exact):,}, hll {merged.estimate():,.0f} "
+        f"({abs(merged.estimate() - len(exact)) / len(exact):.2%} off), "
+        f"summed per minute {summed:,}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--precision", type=int, default=12)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument(
+        "--minutes", type=int, default=43_200, help="43,200 = a 30d window of minute buckets"
+    )
+    parser.add_argument("--authors-per-minute", type=int, default=40)
+    parser.add_argument("--population", type=int, default=200_000)
+    args = parser.parse_args()
+    error_table(args.precision, args.trials)
+    window_merge(args.minutes, args.authors_per_minute, args.population, args.precision)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Micro-benchmark: per-token alias loop vs the compiled TickerMatcher.
+
+Usage: PYTHONPATH=src python benchmarks/bench_matcher.py --symbols 10000 --aliases 50000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import string
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from common.models import RedditItem
+from nlp.matcher import tokenize
+from nlp.pipeline import MentionExtractor
+
+_WORDS = (
+    "the to and moon calls puts earnings holding bought sold yolo tendies price target week"
+).split()
+_STOPLIST = {"A", "IT", "ON", "ALL", "ARE", "FOR", "GO", "BE", "DD", "CEO"}
+_TOKEN_PATTERN = re.compile(r"[A-Za-z$][A-Za-z0-9$']*")
+
+
+def make_universe(
+    rng: random.Random, symbols: int, aliases: int
+) -> tuple[list[str], dict[str, str]]:
+    tickers: set[str] = set()
+    while len(tickers) < symbols:
+        tickers.add("".join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5))))
+    ordered = sorted(tickers)
+    alias_map: dict[str, str] = {}
+    while len(alias_map) < aliases:
+        words = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        alias_map[" ".join(words)] = rng.choice(ordered)
+    return ordered, alias_map
+
+
+def make_items(
+    rng: random.Random, count: int, tickers: list[str], alias_map: dict[str, str]
+) -> list[RedditItem]:
+    aliases = list(alias_map)
+    items = []
+    for idx in range(count):
+        words = rng.choices(_WORDS, k=rng.randint(8, 60))
+        for _ in range(rng.randint(0, 3)):
+            roll = rng.random()
+            if roll < 0.4:
+                pick = rng.choice(tickers)
+            elif roll < 0.7:
+                pick = f"${rng.choice(tickers)}"
+            else:
+                pick = rng.choice(aliases).title()
+            words.insert(rng.randrange(len(words) + 1), pick)
+        items.append(
+            RedditItem(
+                id=str(idx),
+                kind="comment",
+                subreddit="wallstreetbets",
+                author="bench",
+                body=" ".join(words),
+                created_utc=datetime(2024, 1, 1, tzinfo=UTC),
+                score=1,
+                permalink="",
+            )
+        )
+    return items
+
+
+def legacy_tickers(
+    body: str, tickers: set[str], alias_map: dict[str, str], finance: set[str]
+) -> list[str]:
+    """The pre-matcher token loop (single-token aliases, per-token case folding)."""
+
+    tokens = _TOKEN_PATTERN.findall(body)
+    found: list[str] = []
+    seen: set[str] = set()
+    for idx, token in enumerate(tokens):
+        alias_symbol = alias_map.get(token.lower())
+        if alias_symbol and alias_symbol in tickers and alias_symbol not in seen:
+            found.append(alias_symbol)
+            seen.add(alias_symbol)
+            continue
+        if token.startswith("$"):
+            symbol = token[1:].upper()
+            if symbol in tickers and symbol not in seen:
+                found.append(symbol)
+                seen.add(symbol)
+            continue
+        if token.isalpha() and token.isupper() and 1 <= len(token) <= 5:
+            symbol = token.upper()
+            if symbol not in tickers or symbol in seen:
+                continue
+            if symbol in _STOPLIST and not any(
+                neighbor.lower() in finance for neighbor in tokens[max(idx - 3, 0) : idx + 4]
+            ):
+                continue
+            found.append(symbol)
+            seen.add(symbol)
+    return found
+
+
+def best_of(repeats: int, fn: Callable[[], int]) -> tuple[float, int]:
+    best = float("inf")
+    result = 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(symbols: int, aliases: int, items: int, repeats: int) -> None:
+    rng = random.Random(11)  # noqa: S311 - seeded synthetic data, not security
+    tickers, alias_map = make_universe(rng, symbols, aliases)
+    corpus = make_items(rng, items, tickers, alias_map)
+    bodies = [item.body for item in corpus]
+
+    started = time.perf_counter()
+    extractor = MentionExtractor(tickers, _STOPLIST, alias_map=alias_map)
+    build_secs = time.perf_counter() - started
+    matcher = extractor.matcher
+    ticker_set = set(tickers)
+    lowered_aliases = {alias.lower(): symbol for alias, symbol in alias_map.items()}
+    finance = set(extractor._finance_terms)
+
+    legacy_secs, legacy_found = best_of(
+        repeats,
+        lambda: sum(
+            len(legacy_tickers(body, ticker_set, lowered_aliases, finance)) for body in bodies
+        ),
+    )
+    scan_secs, scan_found = best_of(
+        repeats, lambda: sum(sum(1 for _ in matcher.scan(*tokenize(body))) for body in bodies)
+    )
+    extract_secs, mentions = best_of(
+        repeats, lambda: sum(len(extractor.extract(item).mentions) for item in corpus)
+    )
+
+    print(
+        f"symbols={symbols} aliases={matcher.alias_count} items={items}; "
+        f"matcher built in {build_secs * 1000:.0f} ms"
+    )
+    print(
+        f"legacy token loop: {items / legacy_secs:,.0f} items/s "
+        f"({legacy_found} tickers, single-word aliases only)"
+    )
+    print(
+        f"tokenize + scan:   {items / scan_secs:,.0f} items/s "
+        f"({scan_found} matches, {legacy_secs / scan_secs:.1f}x)"
+    )
+    print(f"extract (events):  {items / extract_secs:,.0f} items/s ({mentions} mentions)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ticker matching")
+    parser.add_argument("--symbols", type=int, default=10_000)
+    parser.add_argument("--aliases", type=int, default=50_000)
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    run(args.symbols, args.aliases, args.items, args.repeats)
@@ -0,0 +1,66 @@
+"""Benchmark: SimHash near-duplicate filter throughput and suppression on a spammy corpus.
+
+Usage: PYTHONPATH=src python benchmarks/bench_neardup.py --comments 50000 --pasta-rate 0.2
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import timedelta
+
+from corpus import make_corpus
+
+from common.models import RedditItem
+from ingestor.neardup import NearDuplicateDetector
+
+_EDITS = ["", " lol", " 🚀🚀🚀", "!!!", " this is the way", " (not financial advice)"]
+
+
+def make_spammy_corpus(
+    count: int, pasta_rate: float, seed: int = 9
+) -> tuple[list[RedditItem], set[str]]:
+    """Originals plus lightly edited reposts of a few dozen long 'pastas'."""
+
+    rng = random.Random(seed)  # noqa: S311 - seeded synthetic data, not security
+    corpus = make_corpus(count, seed=seed)
+    pastas = [item.body for item in corpus[:50] if len(item.body.split()) >= 20]
+    planted: set[str] = set()
+    for idx, item in enumerate(corpus[50:], start=50):
+        if pastas and rng.random() < pasta_rate:
+            body = rng.choice(pastas) + rng.choice(_EDITS)
+            if rng.random() < 0.1:
+                body = body.upper()
+            corpus[idx] = item.model_copy(update={"body": body})
+            planted.add(item.id)
+        created = item.created_utc + timedelta(seconds=idx)
+        corpus[idx] = corpus[idx].model_copy(update={"created_utc": created})
+    return corpus, planted
+
+
+def run(comments: int, pasta_rate: float) -> None:
+    corpus, planted = make_spammy_corpus(comments, pasta_rate)
+    detector = NearDuplicateDetector()
+    started = time.perf_counter()
+    flagged = {item.id for item in corpus if detector.is_duplicate(item)}
+    elapsed = time.perf_counter() - started
+
+    caught = len(flagged & planted)
+    print(f"comments={comments} planted reposts={len(planted)}")
+    print(
+        f"throughput: {comments / elapsed:,.0f} items/s "
+        f"({elapsed / comments * 1e6:.1f} µs/item)"
+    )
+    print(
+        f"suppressed {len(flagged)}: {caught} planted "
+        f"({caught / max(len(planted), 1):.1%} recall), {len(flagged) - caught} other"
+    )
+    print(detector.snapshot())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate detection")
+    parser.add_argument("--comments", type=int, default=50_000)
+    parser.add_argument("--pasta-rate", type=float, default=0.2)
+    args = parser.parse_args()
+    run(args.comments, args.pasta_rate)
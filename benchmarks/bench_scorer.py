@@ -0,0 +1,63 @@
+"""Throughput benchmark: sentiment scorers in spans/s at several batch sizes.
+
+Usage: PYTHONPATH=src python benchmarks/bench_scorer.py --spans 20000 --batch-sizes 1 64 1024
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Sequence
+
+import numpy as np
+from corpus import ALIASES, STOPLIST, TICKERS, make_corpus
+
+from nlp.pipeline import MentionExtractor
+from nlp.scoring import BlendedScorer, HashedLinearScorer, LexiconScorer, SentimentScorer
+
+
+def make_spans(count: int) -> list[Sequence[str]]:
+    extractor = MentionExtractor(TICKERS, STOPLIST, alias_map=ALIASES)
+    spans: list[Sequence[str]] = []
+    for result in extractor.extract_batch(make_corpus(count * 2)):
+        spans.extend(result.token_spans)
+    return spans[:count]
+
+
+def measure(
+    scorer: SentimentScorer, spans: list[Sequence[str]], batch_size: int, repeats: int
+) -> float:
+    batches = [spans[offset : offset + batch_size] for offset in range(0, len(spans), batch_size)]
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for batch in batches:
+            scorer.score_batch(batch)
+        best = min(best, time.perf_counter() - started)
+    return len(spans) / best
+
+
+def run(count: int, batch_sizes: list[int], features: int, repeats: int) -> None:
+    spans = make_spans(count)
+    weights = np.random.default_rng(0).normal(scale=0.1, size=features).astype(np.float32)
+    linear = HashedLinearScorer(weights)
+    scorers: dict[str, SentimentScorer] = {
+        "lexicon": LexiconScorer(),
+        f"linear (2^{features.bit_length() - 1} features)": linear,
+        "blend 50/50": BlendedScorer([(LexiconScorer(), 0.5), (linear, 0.5)]),
+    }
+    print(f"spans={len(spans)} avg tokens/span={sum(map(len, spans)) / len(spans):.1f}")
+    for name, scorer in scorers.items():
+        rates = ", ".join(
+            f"b={size}: {measure(scorer, spans, size, repeats):,.0f}/s" for size in batch_sizes
+        )
+        print(f"{name}: {rates}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batch sentiment scorers")
+    parser.add_argument("--spans", type=int, default=20_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1024])
+    parser.add_argument("--features", type=int, default=1 << 18)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.spans, args.batch_sizes, args.features, args.repeats)
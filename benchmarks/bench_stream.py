@@ -0,0 +1,111 @@
+"""Peak client memory of a window aggregation: materialized fetch vs streamed cursor chunks.
+
+A fake client stands in for Postgres and produces asyncpg-like rows lazily, so both paths run
+the real `AggregationRepository` and `MentionsAggregator` code without a database. The
+materialized path holds every row and `MentionEvent` at once; the streamed path holds one
+`--prefetch` chunk, so only the per-bucket author sets still grow with `--rows`.
+
+Usage: PYTHONPATH=src python benchmarks/bench_stream.py --rows 50000 200000 --prefetch 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from collections.abc import AsyncGenerator, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from corpus import TICKERS
+
+from trend.aggregator import AggregationRepository, MentionsAggregator
+
+
+class NullWriter:
+    async def upsert(self, aggregations) -> None:
+        return None
+
+
+class SyntheticDB:
+    """Serves `rows` seeded mention rows (14-minute span) for any query."""
+
+    def __init__(self, rows: int) -> None:
+        self._rows = rows
+        self._start = datetime(2024, 1, 1, tzinfo=UTC)
+
+    def _generate(self) -> Iterator[dict[str, Any]]:
+        rng = random.Random(5)  # noqa: S311 - seeded synthetic data, not security
+        for idx in range(self._rows):
+            yield {
+                "ts_utc": self._start + timedelta(seconds=rng.random() * 840),
+                "subreddit": "wallstreetbets",
+                "reddit_id": f"c{idx}",
+                "author": f"user{rng.randint(0, 20000)}",
+                "ticker": rng.choice(TICKERS),
+                "confidence": 0.9,
+                "upvotes": rng.randint(0, 500),
+                "span_text": "some span text that the rollup never needs to read",
+                "sentiment_label": 0,
+                "sentiment_score": rng.uniform(-0.9, 0.9),
+                "sentiment_conf": 0.5,
+                "has_options_intent": False,
+                "option_side": 0,
+                "thread_id": f"t3_{rng.randint(0, 2000)}",
+            }
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        return list(self._generate())
+
+    async def stream(
+        self, query: str, *args: Any, prefetch: int = 1000
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        chunk: list[dict[str, Any]] = []
+        for row in self._generate():
+            chunk.append(row)
+            if len(chunk) == prefetch:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+async def materialized(rows: int) -> int:
+    repo = AggregationRepository(SyntheticDB(rows))  # type: ignore[arg-type]
+    aggregator = MentionsAggregator(NullWriter())
+    aggregator.extend(await repo.fetch_mentions_since(datetime.min))
+    return await aggregator.flush()
+
+
+async def streamed(rows: int, prefetch: int) -> int:
+    repo = AggregationRepository(SyntheticDB(rows))  # type: ignore[arg-type]
+    aggregator = MentionsAggregator(NullWriter())
+    await aggregator.extend_chunks(repo.iter_mentions_since(datetime.min, prefetch=prefetch))
+    return await aggregator.flush()
+
+
+def measure(label: str, coro_fn, *args: Any) -> None:
+    started = time.perf_counter()
+    asyncio.run(coro_fn(*args))
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    buckets = asyncio.run(coro_fn(*args))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<13} {seconds:6.2f}s, peak {peak / 1e6:7.1f} MB, {buckets:,} buckets")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 200_000])
+    parser.add_argument("--prefetch", type=int, default=5000)
+    args = parser.parse_args()
+    for rows in args.rows:
+        print(f"{rows:,} rows")
+        measure("materialized", materialized, rows)
+        measure("streamed", streamed, rows, args.prefetch)
+
+
+if __name__ == "__main__":
+    main()
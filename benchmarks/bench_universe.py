@@ -0,0 +1,68 @@
+"""Benchmark: ticker universe rebuild (CSV parse + matcher compile + swap) time.
+
+Usage: PYTHONPATH=src python benchmarks/bench_universe.py --symbols 10000 --aliases 50000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import random
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from bench_matcher import make_universe
+
+from ingestor.universe import CsvUniverseSource, UniverseManager
+from nlp.matcher import TickerMatcher
+from nlp.pipeline import MentionExtractor
+
+
+def write_csv(path: Path, tickers: list[str], alias_map: dict[str, str]) -> None:
+    by_symbol: dict[str, list[str]] = defaultdict(list)
+    for alias, symbol in alias_map.items():
+        by_symbol[symbol].append(alias)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["symbol", "exchange", "name", "aliases"])
+        for ticker in tickers:
+            writer.writerow([ticker, "NASDAQ", "", "|".join(by_symbol[ticker])])
+
+
+async def run(symbols: int, aliases: int, repeats: int) -> None:
+    rng = random.Random(5)  # noqa: S311 - seeded synthetic data, not security
+    tickers, alias_map = make_universe(rng, symbols, aliases)
+
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        TickerMatcher(tickers, alias_map)
+        best = min(best, time.perf_counter() - started)
+    print(f"compile only: {best * 1000:.0f} ms ({symbols} symbols, {aliases} aliases)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tickers.csv"
+        extractor = MentionExtractor((), set())
+        manager = UniverseManager(CsvUniverseSource(path), extractor)
+        timings = []
+        for attempt in range(repeats):
+            # Each round adds one "IPO" so the fingerprint changes and a full rebuild happens.
+            write_csv(path, [*tickers, f"IPO{attempt}"], alias_map)
+            started = time.perf_counter()
+            await manager.refresh()
+            timings.append(time.perf_counter() - started)
+        print(
+            f"reload from CSV (parse + compile + swap): best {min(timings) * 1000:.0f} ms, "
+            f"worst {max(timings) * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ticker universe rebuilds")
+    parser.add_argument("--symbols", type=int, default=10_000)
+    parser.add_argument("--aliases", type=int, default=50_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.symbols, args.aliases, args.repeats))
@@ -0,0 +1,54 @@
+"""Seeded synthetic WSB-style corpora shared by the benchmarks."""
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime
+
+from common.models import RedditItem
+
+TICKERS = [
+    "GME", "AMC", "PLTR", "TSLA", "NVDA", "AAPL", "SPY", "AMD",
+    "BB", "A", "IT", "ON", "ALL", "GO", "BE",
+]
+STOPLIST = {"A", "IT", "ON", "ALL", "ARE", "FOR", "GO", "BE"}
+ALIASES = {
+    "palantir": "PLTR",
+    "gamestop": "GME",
+    "game stop": "GME",
+    "advanced micro devices": "AMD",
+}
+_FILLER = (
+    "i just bought more and the wife's boyfriend says we hold this is not financial advice "
+    "tendies apes together strong diamond hands paper hands bagholder moon rocket loss porn "
+    "yolo my whole portfolio on it are you for real go look at the chart"
+).split()
+_FINANCE = ["calls", "puts", "strike", "earnings", "iv", "gamma", "short", "float"]
+_SHOUTING = ["ALL", "IN", "IT", "IS", "ON", "FOR", "BE", "GO", "A", "LOL", "YOLO", "HOLD"]
+
+
+def make_corpus(count: int, seed: int = 42) -> list[RedditItem]:
+    rng = random.Random(seed)  # noqa: S311 - seeded synthetic data, not security
+    ticker_forms = [
+        *TICKERS,
+        *(f"${ticker}" for ticker in TICKERS),
+        *(alias.title() for alias in ALIASES),
+    ]
+    items = []
+    for idx in range(count):
+        words = rng.choices(_FILLER, k=rng.randint(5, 80))
+        for pool, rate in ((ticker_forms, 2), (_FINANCE, 2), (_SHOUTING, 3)):
+            for _ in range(rng.randint(0, rate)):
+                words.insert(rng.randrange(len(words) + 1), rng.choice(pool))
+        items.append(
+            RedditItem(
+                id=format(idx, "x"),
+                kind="comment",
+                subreddit="wallstreetbets",
+                author=f"user{rng.randint(0, 5000)}",
+                body=" ".join(words),
+                created_utc=datetime(2024, 1, 1, tzinfo=UTC),
+                score=rng.randint(-5, 500),
+                permalink="",
+            )
+        )
+    return items
@@ -0,0 +1,285 @@
+"""Hot-path benchmark suite: throughput, p99 latency and allocations, gated by a JSON baseline.
+
+Each case runs over seeded synthetic corpora (`corpus.make_corpus`) of every `--sizes` entry:
+
+- `extract`: `MentionExtractor.extract` per item
+- `annotate`: `SentimentAnnotator.annotate` per extracted item, reusing its token spans
+- `handle_item`: `RedditStreamIngestor.handle_item` with a writer that discards everything
+- `mention_event`: validated pydantic `MentionEvent` construction per mention
+- `mention_record`: hot-path `MentionRecord` construction per mention (compare with the above)
+
+Throughput is best-of-`--repeats`; latency percentiles pool every repeat's per-item samples.
+Allocations come from a separate tracemalloc pass that keeps each step's output, so
+`retained_b` is the memory one item's results hold and `transient_b` the pass's high-water mark
+above that (scratch memory a step allocates and frees).
+
+Usage:
+  PYTHONPATH=src python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+  PYTHONPATH=src python benchmarks/suite.py --baseline benchmarks/baseline.json \
+      --max-regression 0.15
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from corpus import ALIASES, STOPLIST, TICKERS, make_corpus
+
+from common.config import RedditSettings
+from common.models import Mention, MentionEvent, MentionRecord, RedditItem
+from ingestor.repository import MentionWriter
+from ingestor.service import RedditStreamIngestor
+from nlp.pipeline import MentionExtractor, SentimentAnnotator
+
+CASES = ("extract", "annotate", "handle_item", "mention_event", "mention_record")
+
+
+class NullWriter(MentionWriter):
+    async def persist(self, item: RedditItem, mentions: Sequence[Mention]) -> int:
+        return len(mentions)
+
+
+class _NoClient:
+    """`handle_item` never fetches; this only keeps the ingestor from building an HTTP client."""
+
+
+@dataclass
+class Case:
+    name: str
+    units: Sequence[Any]
+    step: Callable[[Any], Any]
+    mentions: int
+    is_async: bool = False
+
+
+@dataclass
+class CaseResult:
+    items: int
+    mentions: int
+    items_per_sec: float
+    mentions_per_sec: float
+    p50_us: float
+    p99_us: float
+    retained_b: float
+    transient_b: float
+
+
+def build_cases(corpus: Sequence[RedditItem]) -> list[Case]:
+    extractor = MentionExtractor(TICKERS, STOPLIST, alias_map=ALIASES)
+    annotator = SentimentAnnotator()
+    extractions = extractor.extract_batch(corpus)
+    mentions = sum(len(result.mentions) for result in extractions)
+    settings = RedditSettings(
+        client_id="bench",
+        client_secret="bench",  # noqa: S106 - the bench client never authenticates
+        username="bench",
+        password="bench",  # noqa: S106 - the bench client never authenticates
+    )
+    ingestor = RedditStreamIngestor(
+        extractor,
+        annotator,
+        NullWriter(),
+        reddit_client=_NoClient(),  # type: ignore[arg-type]
+        settings=settings,
+    )
+    fields = [
+        mention.to_event().model_dump() for result in extractions for mention in result.mentions
+    ]
+    return [
+        Case("extract", corpus, extractor.extract, mentions),
+        Case(
+            "annotate",
+            extractions,
+            lambda result: annotator.annotate(result.mentions, result.token_spans),
+            mentions,
+        ),
+        Case("handle_item", corpus, ingestor.handle_item, mentions, is_async=True),
+        Case("mention_event", fields, lambda kwargs: MentionEvent(**kwargs), len(fields)),
+        Case("mention_record", fields, lambda kwargs: MentionRecord(**kwargs), len(fields)),
+    ]
+
+
+def _timed_pass(case: Case) -> list[int]:
+    if case.is_async:
+        return asyncio.run(_timed_pass_async(case.units, case.step))
+    step = case.step
+    clock = time.perf_counter_ns
+    samples = []
+    for unit in case.units:
+        started = clock()
+        step(unit)
+        samples.append(clock() - started)
+    return samples
+
+
+async def _timed_pass_async(
+    units: Sequence[Any], step: Callable[[Any], Awaitable[Any]]
+) -> list[int]:
+    clock = time.perf_counter_ns
+    samples = []
+    for unit in units:
+        started = clock()
+        await step(unit)
+        samples.append(clock() - started)
+    return samples
+
+
+async def _kept_pass_async(
+    units: Sequence[Any], step: Callable[[Any], Awaitable[Any]]
+) -> list[Any]:
+    return [await step(unit) for unit in units]
+
+
+def _allocations(case: Case) -> tuple[float, float]:
+    """Return (retained bytes per item, transient peak bytes) for a pass keeping every output."""
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        if case.is_async:
+            kept = asyncio.run(_kept_pass_async(case.units, case.step))
+        else:
+            kept = [case.step(unit) for unit in case.units]
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    count = max(len(case.units), 1)
+    return (after - before) / count, float(peak - after)
+
+
+def _percentile(ordered: Sequence[int], pct: float) -> float:
+    idx = min(round(pct / 100.0 * (len(ordered) - 1)), len(ordered) - 1)
+    return ordered[idx] / 1000.0
+
+
+def measure(case: Case, repeats: int) -> CaseResult:
+    best = float("inf")
+    samples: list[int] = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        samples.extend(_timed_pass(case))
+        best = min(best, time.perf_counter() - started)
+    retained, transient = _allocations(case)
+    samples.sort()
+    return CaseResult(
+        items=len(case.units),
+        mentions=case.mentions,
+        items_per_sec=len(case.units) / best,
+        mentions_per_sec=case.mentions / best,
+        p50_us=_percentile(samples, 50),
+        p99_us=_percentile(samples, 99),
+        retained_b=retained,
+        transient_b=transient,
+    )
+
+
+def run(sizes: Sequence[int], cases: Sequence[str], repeats: int, seed: int) -> dict[str, Any]:
+    results: dict[str, dict[str, float]] = {}
+    print(
+        f"{'case':<24}{'items/s':>12}{'mentions/s':>12}{'p50 us':>9}{'p99 us':>9}"
+        f"{'retained B':>12}{'transient B':>13}"
+    )
+    for size in sizes:
+        for case in build_cases(make_corpus(size, seed=seed)):
+            if case.name not in cases:
+                continue
+            result = measure(case, repeats)
+            key = f"{case.name}@{size}"
+            results[key] = asdict(result)
+            print(
+                f"{key:<24}{result.items_per_sec:>12,.0f}{result.mentions_per_sec:>12,.0f}"
+                f"{result.p50_us:>9.1f}{result.p99_us:>9.1f}"
+                f"{result.retained_b:>12,.0f}{result.transient_b:>13,.0f}"
+            )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "repeats": repeats,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    max_regression: float,
+    max_p99_regression: float,
+) -> list[str]:
+    """Return one message per metric that regressed past its threshold against the baseline.
+
+    Throughput and retained bytes use `max_regression`; p99 is noisier and has its own limit.
+    Cases missing from either side are skipped.
+    """
+
+    failures = []
+    for key, result in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            continue
+        checks = (
+            (
+                "items_per_sec",
+                result["items_per_sec"] < base["items_per_sec"] * (1 - max_regression),
+            ),
+            ("p99_us", result["p99_us"] > base["p99_us"] * (1 + max_p99_regression)),
+            ("retained_b", result["retained_b"] > base["retained_b"] * (1 + max_regression) + 64),
+        )
+        for metric, regressed in checks:
+            if regressed:
+                failures.append(f"{key} {metric}: {base[metric]:,.1f} -> {result[metric]:,.1f}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--baseline", type=Path, help="Compare against this JSON baseline and exit 1 on regressions"
+    )
+    parser.add_argument(
+        "--save-baseline", type=Path, help="Write this run's results as a JSON baseline"
+    )
+    parser.add_argument(
+        "--max-regression", type=float, default=0.10, help="Allowed throughput/retained-bytes slip"
+    )
+    parser.add_argument(
+        "--max-p99-regression", type=float, default=0.30, help="Allowed p99 latency growth"
+    )
+    args = parser.parse_args()
+
+    current = run(args.sizes, args.cases, args.repeats, args.seed)
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(current, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.save_baseline}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        failures = compare(current, baseline, args.max_regression, args.max_p99_regression)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
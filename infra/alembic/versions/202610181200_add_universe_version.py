@@ -0,0 +1,18 @@
+"""Record which ticker-universe version matched each mention."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261018_1200"
+down_revision = "20250211_1245"
+branch_labels = None
+dependent_revisions = None
+
+
+def upgrade() -> None:
+    op.add_column("mention_events", sa.Column("universe_version", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("mention_events", "universe_version")
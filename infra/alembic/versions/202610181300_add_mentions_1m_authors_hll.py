@@ -0,0 +1,18 @@
+"""Store a mergeable HyperLogLog sketch of each minute bucket's authors."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261018_1300"
+down_revision = "20261018_1200"
+branch_labels = None
+dependent_revisions = None
+
+
+def upgrade() -> None:
+    op.add_column("mentions_1m", sa.Column("authors_hll", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("mentions_1m", "authors_hll")
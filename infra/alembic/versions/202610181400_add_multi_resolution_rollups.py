@@ -0,0 +1,60 @@
+"""Add mentions_5m/1h/1d rollup tables (sums plus mergeable author sketches)."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261018_1400"
+down_revision = "20261018_1300"
+branch_labels = None
+dependent_revisions = None
+
+_TABLES = ("mentions_5m", "mentions_1h", "mentions_1d")
+
+# (table, bucket width, finer source, sentiment sum and zscore over the source aliased `f`).
+_BACKFILL = (
+    ("mentions_5m", "5 minutes", "mentions_1m", "f.avg_sentiment * f.mentions", "f.zscore"),
+    ("mentions_1h", "1 hour", "mentions_5m", "f.sentiment_sum", "f.max_zscore"),
+    ("mentions_1d", "1 day", "mentions_1h", "f.sentiment_sum", "f.max_zscore"),
+)
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.create_table(
+            table,
+            sa.Column("ts_utc", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("ticker", sa.Text(), sa.ForeignKey("ticker_master.symbol"), nullable=False),
+            sa.Column("mentions", sa.Integer(), nullable=False),
+            sa.Column("unique_authors", sa.Integer(), nullable=False),
+            sa.Column("sentiment_sum", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("max_zscore", sa.Float(), nullable=True),
+            sa.Column("authors_hll", sa.LargeBinary(), nullable=True),
+            sa.PrimaryKeyConstraint("ticker", "ts_utc"),
+        )
+        # Optional hypertable call (no-op if TimescaleDB not installed)
+        op.execute(f"SELECT create_hypertable('{table}', 'ts_utc', if_not_exists=>TRUE);")
+
+    # Backfill from existing history so TrendService can serve long windows from these tables
+    # right away. Sketches cannot be built in SQL; readers fall back to the summed
+    # unique_authors for these buckets.
+    for table, width, source, sentiment, zscore in _BACKFILL:
+        op.execute(
+            f"""
+            INSERT INTO {table}
+                (ts_utc, ticker, mentions, unique_authors, sentiment_sum, max_zscore)
+            SELECT date_bin(INTERVAL '{width}', f.ts_utc, TIMESTAMPTZ '2000-01-01 00:00:00+00'),
+                   f.ticker,
+                   SUM(f.mentions),
+                   SUM(f.unique_authors),
+                   COALESCE(SUM({sentiment}), 0),
+                   MAX({zscore})
+            FROM {source} f
+            GROUP BY 1, 2
+            """  # noqa: S608 - identifiers come from _BACKFILL
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(_TABLES):
+        op.drop_table(table)
@@ -0,0 +1,28 @@
+"""Stamp mention_events rows on insert and update so aggregation can follow re-scores."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261018_1500"
+down_revision = "20261018_1400"
+branch_labels = None
+dependent_revisions = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "mention_events",
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.create_index("idx_mention_events_updated_at", "mention_events", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_mention_events_updated_at", table_name="mention_events")
+    op.drop_column("mention_events", "updated_at")
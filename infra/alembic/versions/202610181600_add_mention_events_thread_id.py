@@ -0,0 +1,50 @@
+"""Store each mention's resolved thread and key posts by their `t3_` fullname."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261018_1600"
+down_revision = "20261018_1500"
+branch_labels = None
+dependent_revisions = None
+
+
+def upgrade() -> None:
+    op.add_column("mention_events", sa.Column("thread_id", sa.Text(), nullable=True))
+
+    # Posts were stored under their bare base36 id, which shares the key space with comment
+    # ids. Move them (and their mentions) to the fullname the ingestor now writes.
+    op.execute(
+        """
+        INSERT INTO reddit_items (
+            id, kind, parent_id, link_id, author, body, created_utc, score, permalink
+        )
+        SELECT 't3_' || id, kind, parent_id, link_id, author, body, created_utc, score, permalink
+        FROM reddit_items
+        WHERE kind = 'post' AND id NOT LIKE 't3\\_%'
+        ON CONFLICT (id) DO NOTHING
+        """
+    )
+    op.execute(
+        """
+        UPDATE mention_events me
+        SET reddit_id = 't3_' || me.reddit_id
+        FROM reddit_items ri
+        WHERE ri.id = me.reddit_id AND ri.kind = 'post' AND ri.id NOT LIKE 't3\\_%'
+        """
+    )
+    op.execute("DELETE FROM reddit_items WHERE kind = 'post' AND id NOT LIKE 't3\\_%'")
+
+    op.execute(
+        """
+        UPDATE mention_events me
+        SET thread_id = NULLIF(ri.link_id, '')
+        FROM reddit_items ri
+        WHERE ri.id = me.reddit_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("mention_events", "thread_id")
@@ -1,5 +1,5 @@
 -- Initial schema for WSB Hype Radar
--- Based on Alembic migrations: 202502111200 and 202502111245
+-- Based on Alembic migrations: 202502111200, 202502111245, 202610181200, 202610181300, 202610181400, 202610181500 and 202610181600
 
 -- Create alembic version table
 CREATE TABLE IF NOT EXISTS alembic_version (
@@ -45,6 +45,9 @@ CREATE TABLE IF NOT EXISTS mention_events (
     has_options_intent BOOLEAN NOT NULL DEFAULT FALSE,
     option_side SMALLINT,
     price_at_mention NUMERIC(18, 6),
+    universe_version BIGINT,
+    thread_id TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
     CONSTRAINT uniq_reddit_ticker UNIQUE (reddit_id, ticker)
 );
 
@@ -71,6 +74,41 @@ CREATE TABLE IF NOT EXISTS mentions_1m (
     zscore DOUBLE PRECISION,
     ears_flag BOOLEAN,
     cusum_stat DOUBLE PRECISION,
+    authors_hll BYTEA,
+    PRIMARY KEY (ticker, ts_utc)
+);
+
+-- Coarser rollups of mentions_1m (sums plus mergeable author sketches)
+CREATE TABLE IF NOT EXISTS mentions_5m (
+    ts_utc TIMESTAMP WITH TIME ZONE NOT NULL,
+    ticker TEXT NOT NULL REFERENCES ticker_master(symbol),
+    mentions INTEGER NOT NULL,
+    unique_authors INTEGER NOT NULL,
+    sentiment_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    max_zscore DOUBLE PRECISION,
+    authors_hll BYTEA,
+    PRIMARY KEY (ticker, ts_utc)
+);
+
+CREATE TABLE IF NOT EXISTS mentions_1h (
+    ts_utc TIMESTAMP WITH TIME ZONE NOT NULL,
+    ticker TEXT NOT NULL REFERENCES ticker_master(symbol),
+    mentions INTEGER NOT NULL,
+    unique_authors INTEGER NOT NULL,
+    sentiment_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    max_zscore DOUBLE PRECISION,
+    authors_hll BYTEA,
+    PRIMARY KEY (ticker, ts_utc)
+);
+
+CREATE TABLE IF NOT EXISTS mentions_1d (
+    ts_utc TIMESTAMP WITH TIME ZONE NOT NULL,
+    ticker TEXT NOT NULL REFERENCES ticker_master(symbol),
+    mentions INTEGER NOT NULL,
+    unique_authors INTEGER NOT NULL,
+    sentiment_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    max_zscore DOUBLE PRECISION,
+    authors_hll BYTEA,
     PRIMARY KEY (ticker, ts_utc)
 );
 
@@ -90,6 +128,7 @@ CREATE TABLE IF NOT EXISTS alerts (
 );
 
 CREATE INDEX IF NOT EXISTS idx_alerts_ts_alert ON alerts(ts_alert);
+CREATE INDEX IF NOT EXISTS idx_mention_events_updated_at ON mention_events(updated_at);
 
 -- Try to create hypertables (will fail gracefully if TimescaleDB not installed)
 DO $$
@@ -104,6 +143,9 @@ BEGIN
         PERFORM create_hypertable('mention_events', 'ts_utc', if_not_exists => TRUE);
         PERFORM create_hypertable('minute_bars', 'ts_utc', if_not_exists => TRUE);
         PERFORM create_hypertable('mentions_1m', 'ts_utc', if_not_exists => TRUE);
+        PERFORM create_hypertable('mentions_5m', 'ts_utc', if_not_exists => TRUE);
+        PERFORM create_hypertable('mentions_1h', 'ts_utc', if_not_exists => TRUE);
+        PERFORM create_hypertable('mentions_1d', 'ts_utc', if_not_exists => TRUE);
         PERFORM create_hypertable('alerts', 'ts_alert', if_not_exists => TRUE);
     END IF;
 EXCEPTION
@@ -112,5 +154,5 @@ EXCEPTION
 END$$;
 
 -- Mark migrations as applied
-INSERT INTO alembic_version (version_num) VALUES ('20250211_1245')
+INSERT INTO alembic_version (version_num) VALUES ('20261018_1600')
 ON CONFLICT (version_num) DO NOTHING;
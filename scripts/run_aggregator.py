@@ -8,26 +8,46 @@ from datetime import datetime, timedelta, timezone
 from common.config import get_settings
 from common.db import PostgresClient
 from trend.aggregator import AggregationRepository, MentionsAggregator
+from trend.rollup import RollupStage
 
 
-async def main(window_minutes: int) -> None:
+async def main(window_minutes: int, mode: str, prefetch: int) -> None:
     settings = get_settings()
     db = PostgresClient(dsn=str(settings.postgres.dsn))
     await db.connect()
     try:
         repo = AggregationRepository(db)
+        rollups = RollupStage(db)
         since = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
-        mentions = await repo.fetch_mentions_since(since)
-        aggregator = MentionsAggregator(repo)
-        aggregator.extend(mentions)
+        if mode == "sql":
+            buckets = await repo.rollup_since(since)
+            coarse = await rollups.rollup_since(since)
+            print(f"Aggregated {buckets} minute buckets and {coarse} 5m/1h/1d buckets in Postgres")
+            return
+        aggregator = MentionsAggregator(repo, rollups)
+        mentions = await aggregator.extend_chunks(
+            repo.iter_mentions_since(since, prefetch=prefetch)
+        )
         buckets = await aggregator.flush()
     finally:
         await db.close()
-    print(f"Aggregated {buckets} minute buckets from {len(mentions)} mentions")
+    print(f"Aggregated {buckets} minute buckets from {mentions} mentions")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run mention aggregator once")
     parser.add_argument("--window", type=int, default=5)
+    parser.add_argument(
+        "--mode",
+        choices=["sql", "python"],
+        default="python",
+        help="python streams mentions and aggregates them here; sql rolls up inside Postgres",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=5000,
+        help="Rows per server-side cursor fetch in python mode; bounds client memory",
+    )
     args = parser.parse_args()
-    asyncio.run(main(args.window))
+    asyncio.run(main(args.window, args.mode, args.prefetch))
@@ -3,34 +3,59 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
 
 from common.config import get_settings
 from common.db import PostgresClient
-from trend.aggregator import AggregationRepository, MentionsAggregator
+from trend.aggregator import AggregationRepository, IncrementalAggregator
+from trend.rollup import RollupStage
 
 
-async def aggregate_once(repo: AggregationRepository, window_minutes: int) -> int:
-    """Run one aggregation cycle."""
-    since = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
-    mentions = await repo.fetch_mentions_since(since)
-    aggregator = MentionsAggregator(repo)
-    aggregator.extend(mentions)
-    buckets = await aggregator.flush()
-    print(f"[{datetime.now(timezone.utc).isoformat()}] Aggregated {buckets} minute buckets from {len(mentions)} mentions")
+async def aggregate_once(aggregator: IncrementalAggregator) -> int:
+    """Run one aggregation cycle: rebuild and upsert the minute buckets whose mentions changed."""
+    rows = await aggregator.run_once()
+    watermark = aggregator.watermark.isoformat() if aggregator.watermark else "-"
+    print(
+        f"[{datetime.now(UTC).isoformat()}] Rebuilt {aggregator.buckets_rebuilt} buckets "
+        f"from {rows} mentions (updated_at watermark {watermark})"
+    )
+    return rows
+
+
+async def rollup_once(
+    repo: AggregationRepository, rollups: RollupStage, window_minutes: int
+) -> int:
+    """Run one push-down cycle: Postgres recomputes every bucket in the window."""
+    since = datetime.now(UTC) - timedelta(minutes=window_minutes)
+    buckets = await repo.rollup_since(since)
+    coarse = await rollups.rollup_since(since)
+    print(
+        f"[{datetime.now(UTC).isoformat()}] Rolled up {buckets} minute buckets "
+        f"and {coarse} 5m/1h/1d buckets in Postgres"
+    )
     return buckets
 
 
-async def main(window_minutes: int, poll_seconds: int) -> None:
+async def main(window_minutes: int, poll_seconds: int, lag_seconds: int, mode: str) -> None:
     """Main loop that continuously aggregates mentions."""
     settings = get_settings()
     db = PostgresClient(dsn=str(settings.postgres.dsn))
     await db.connect()
     try:
         repo = AggregationRepository(db)
+        rollups = RollupStage(db)
+        aggregator = IncrementalAggregator(
+            repo,
+            window=timedelta(minutes=window_minutes),
+            lag=timedelta(seconds=lag_seconds),
+            rollups=rollups,
+        )
         while True:
             try:
-                await aggregate_once(repo, window_minutes)
+                if mode == "sql":
+                    await rollup_once(repo, rollups, window_minutes)
+                else:
+                    await aggregate_once(aggregator)
             except Exception as e:
                 print(f"Error during aggregation: {e}")
             await asyncio.sleep(poll_seconds)
@@ -42,5 +67,21 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run mention aggregator continuously")
     parser.add_argument("--window", type=int, default=5, help="Window in minutes to look back")
     parser.add_argument("--poll-seconds", type=int, default=60, help="Polling interval in seconds")
+    parser.add_argument(
+        "--lag-seconds",
+        type=int,
+        default=30,
+        help=(
+            "How far behind the newest mention_events.updated_at each cycle re-checks. Rows are "
+            "stamped when their write transaction starts, so one that commits more than this "
+            "later is missed until it is next updated"
+        ),
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["incremental", "sql"],
+        default="incremental",
+        help="incremental rebuilds changed minutes in Python; sql re-rolls the window in Postgres",
+    )
     args = parser.parse_args()
-    asyncio.run(main(args.window, args.poll_seconds))
+    asyncio.run(main(args.window, args.poll_seconds, args.lag_seconds, args.mode))
@@ -3,43 +3,206 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import csv
+import time
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 from common.config import get_settings
 from common.db import PostgresClient
-from ingestor.repository import MentionRepository
+from ingestor.neardup import NearDuplicateDetector, NearDuplicateIndex
+from ingestor.ratelimit import RequestBudget
 from ingestor.reddit_client import RedditClient
+from ingestor.replay import ReplayRedditClient
+from ingestor.repository import MentionRepository, MentionWriter
 from ingestor.service import RedditStreamIngestor
+from ingestor.spool import DiskSpool, SpoolingMentionWriter
+from ingestor.universe import CsvUniverseSource, TickerMasterSource, UniverseManager, UniverseSource
+from nlp.cache import SpanCache
 from nlp.pipeline import MentionExtractor, SentimentAnnotator
+from nlp.scoring import load_scorer
 
 STOPLIST = {"A", "IT", "ON", "ALL", "ARE", "FOR", "GO", "BE"}
 
 
-def load_tickers(path: Path) -> list[str]:
-    with path.open("r", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        return [row["symbol"].upper() for row in reader]
+async def report_stats(
+    ingestor: RedditStreamIngestor,
+    interval: float,
+    budget: RequestBudget | None,
+    spool_writer: SpoolingMentionWriter | None,
+    span_cache: SpanCache | None,
+    universe: UniverseManager,
+) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        print(f"Ingest pipeline stats: {ingestor.stats.snapshot()}")
+        print(f"Thread cache: {ingestor.threads.snapshot()}")
+        print(f"Ticker universe: {universe.snapshot()}")
+        if ingestor.near_dups is not None:
+            print(f"Near-duplicate filter: {ingestor.near_dups.snapshot()}")
+        if budget is not None:
+            print(
+                f"Reddit request budget: remaining={budget.remaining:.1f} "
+                f"throttled={budget.throttled}"
+            )
+        if spool_writer is not None:
+            print(f"Ingest spool: {spool_writer.snapshot()}")
+        if span_cache is not None:
+            print(f"Sentiment span cache: {span_cache.snapshot()}")
 
 
-async def main(ticker_file: Path) -> None:
+async def main(args: argparse.Namespace) -> None:
     settings = get_settings()
-    tickers = load_tickers(ticker_file)
     db = PostgresClient(dsn=str(settings.postgres.dsn))
     await db.connect()
     repo = MentionRepository(db)
-    extractor = MentionExtractor(tickers, STOPLIST)
-    annotator = SentimentAnnotator()
-    reddit_client = RedditClient(settings.reddit)
-    ingestor = RedditStreamIngestor(extractor, annotator, repo, reddit_client=reddit_client, settings=settings.reddit)
+    writer: MentionWriter = repo
+    spool_writer: SpoolingMentionWriter | None = None
+    if args.spool_dir:
+        spool_dir = Path(args.spool_dir)
+        spool_writer = SpoolingMentionWriter(
+            repo, DiskSpool(spool_dir), spool_dir / "dead-letter.ndjson"
+        )
+        writer = spool_writer
+    # The universe manager compiles and installs the real matcher before the pipeline starts.
+    extractor = MentionExtractor((), STOPLIST)
+    scorer = None
+    if args.sentiment_weights or args.sentiment_lexicon:
+        scorer = load_scorer(
+            args.sentiment_weights, args.sentiment_lexicon, args.sentiment_linear_weight
+        )
+    span_cache = None
+    if args.sentiment_cache_mb > 0:
+        span_cache = SpanCache(max_bytes=int(args.sentiment_cache_mb * 1024 * 1024))
+    annotator = SentimentAnnotator(scorer=scorer, cache=span_cache)
+    budget: RequestBudget | None = None
+    if args.replay:
+        reddit_client = ReplayRedditClient(args.replay, speed=args.replay_speed)
+    else:
+        reddit_client = RedditClient(settings.reddit)
+        budget = reddit_client.budget
+    near_dups = None
+    if args.near_dup != "off":
+        near_dups = NearDuplicateDetector(
+            NearDuplicateIndex(window_seconds=args.near_dup_window), action=args.near_dup
+        )
+    ingestor = RedditStreamIngestor(
+        extractor,
+        annotator,
+        writer,
+        reddit_client=reddit_client,
+        settings=settings.reddit,
+        process_workers=args.process_workers,
+        near_dups=near_dups,
+    )
+    source: UniverseSource = CsvUniverseSource(args.tickers)
+    if args.universe_source == "db":
+        source = TickerMasterSource(db)
+    universe = UniverseManager(
+        source, extractor, poll_interval=args.universe_poll, on_swap=ingestor.recycle_pool
+    )
+    await universe.refresh()
+    since = datetime.now(UTC) - timedelta(hours=24)
+    warmed = ingestor.threads.warm(await repo.fetch_recent_threads(since))
+    print(f"Warmed thread cache with {warmed} recent posts")
+    reporter = asyncio.create_task(
+        report_stats(ingestor, args.stats_interval, budget, spool_writer, span_cache, universe)
+    )
+    watcher = asyncio.create_task(universe.run()) if args.universe_poll > 0 else None
+    started = time.monotonic()
     try:
-        await ingestor.run()
+        await ingestor.run(once=bool(args.replay))
     finally:
+        reporter.cancel()
+        if watcher is not None:
+            watcher.cancel()
+        await reddit_client.close()
         await db.close()
+    if args.replay:
+        elapsed = time.monotonic() - started
+        stats = ingestor.stats.snapshot()
+        print(
+            f"Replayed {stats['items_persisted']} items / {stats['mentions_persisted']} mentions "
+            f"in {elapsed:.1f}s ({stats['items_persisted'] / max(elapsed, 1e-9):,.0f} items/s)"
+        )
+        print(f"Ingest pipeline stats: {stats}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run the Reddit ingestion worker")
     parser.add_argument("--tickers", type=Path, default=Path("data/tickers.csv"))
+    parser.add_argument(
+        "--universe-source",
+        choices=("csv", "db"),
+        default="csv",
+        help="Load the ticker universe from --tickers or from active ticker_master rows",
+    )
+    parser.add_argument(
+        "--universe-poll",
+        type=float,
+        default=30.0,
+        help="Seconds between ticker universe reload checks (0 = load once at startup)",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between pipeline stats reports",
+    )
+    parser.add_argument(
+        "--process-workers",
+        type=int,
+        default=0,
+        help="Run extraction/sentiment in a process pool of this size (0 = on the event loop)",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        nargs="+",
+        help=(
+            "Replay recorded comments.json pages / NDJSON dumps (.gz ok) "
+            "instead of polling Reddit"
+        ),
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=0.0,
+        help="Replay pacing: 0 = as fast as possible, 1 = real time, N = N times real time",
+    )
+    parser.add_argument(
+        "--spool-dir",
+        default="var/spool",
+        help="Spool failed writes here and replay them when Postgres recovers ('' disables)",
+    )
+    parser.add_argument(
+        "--sentiment-weights",
+        type=Path,
+        help="Hashed linear sentiment model (.npz) blended with the VADER-style lexicon",
+    )
+    parser.add_argument(
+        "--sentiment-lexicon", type=Path, help="Extra token<TAB>valence lexicon entries"
+    )
+    parser.add_argument(
+        "--near-dup",
+        choices=("off", "mark", "drop"),
+        default="off",
+        help=(
+            "Copypasta handling (off by default): store near-duplicates without mentions, "
+            "or drop them"
+        ),
+    )
+    parser.add_argument(
+        "--near-dup-window",
+        type=float,
+        default=3600.0,
+        help="Seconds of history to compare against",
+    )
+    parser.add_argument("--sentiment-linear-weight", type=float, default=0.5)
+    parser.add_argument(
+        "--sentiment-cache-mb",
+        type=float,
+        default=32.0,
+        help="Memory cap for memoized span sentiment (0 disables the cache)",
+    )
     args = parser.parse_args()
-    asyncio.run(main(args.tickers))
+    asyncio.run(main(args))
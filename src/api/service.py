@@ -1,11 +1,14 @@
 """Application-facing services powering FastAPI handlers."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime, timedelta
 from math import log1p
-from typing import Any, Callable, Dict, List, Mapping
+from typing import Any
 
 from common.db import PostgresClient
+from trend.hll import HyperLogLog
+from trend.rollup import RESOLUTIONS, floor_to
 
 _WINDOW_DEFAULTS = {
     "5m": timedelta(minutes=5),
@@ -18,28 +21,41 @@ _WINDOW_DEFAULTS = {
     "30d": timedelta(days=30),
 }
 
+# A window is served from the coarsest rollup that still splits it into this many buckets,
+# so aligning its start to a bucket boundary widens it by under 1/12.
+_MIN_BUCKETS = 12
+
+_ROLLUP_COLUMNS = """
+                   SUM(agg.mentions) AS mentions,
+                   SUM(agg.unique_authors) AS unique_authors,
+                   SUM(agg.sentiment_sum) / NULLIF(SUM(agg.mentions), 0) AS avg_sentiment,
+                   MAX(agg.max_zscore) AS zscore,"""
+_MINUTE_COLUMNS = """
+                   SUM(agg.mentions) AS mentions,
+                   SUM(agg.unique_authors) AS unique_authors,
+                   SUM(agg.avg_sentiment * agg.mentions) / NULLIF(SUM(agg.mentions), 0)
+                       AS avg_sentiment,
+                   MAX(agg.zscore) AS zscore,"""
+
 
 class TrendService:
     """Queries mentions aggregates and formats trending payloads."""
 
     def __init__(self, db: PostgresClient, now_fn: Callable[[], datetime] | None = None) -> None:
         self._db = db
-        self._now_fn = now_fn or (lambda: datetime.now(timezone.utc))
+        self._now_fn = now_fn or (lambda: datetime.now(UTC))
 
-    async def top_trending(self, window: str = "5m", limit: int = 10) -> List[Dict[str, Any]]:
+    async def top_trending(self, window: str = "5m", limit: int = 10) -> list[dict[str, Any]]:
         interval = self._parse_window(window)
         now = self._now()
-        since = now - interval
+        table, since = self._plan(now - interval, interval)
+        columns = _MINUTE_COLUMNS if table == "mentions_1m" else _ROLLUP_COLUMNS
         rows = await self._db.fetch(
-            """
-            SELECT agg.ticker,
-                   SUM(agg.mentions) AS mentions,
-                   SUM(agg.unique_authors) AS unique_authors,
-                   AVG(agg.avg_sentiment) AS avg_sentiment,
-                   MAX(agg.zscore) AS zscore,
+            f"""
+            SELECT agg.ticker,{columns}
                    MIN(agg.ts_utc) AS first_seen,
                    p.close AS last_price
-            FROM mentions_1m agg
+            FROM {table} agg
             LEFT JOIN LATERAL (
               SELECT close
               FROM minute_bars
@@ -51,11 +67,55 @@ class TrendService:
             GROUP BY agg.ticker, p.close
             ORDER BY mentions DESC
             LIMIT $2
-            """,
+            """,  # noqa: S608 - table/columns come from _plan, not user input
             since,
             limit,
         )
-        return [self._format_row(row, window) for row in rows]
+        authors = await self._distinct_authors(table, [row["ticker"] for row in rows], since)
+        return [self._format_row(row, window, authors.get(row["ticker"])) for row in rows]
+
+    @staticmethod
+    def _plan(since: datetime, interval: timedelta) -> tuple[str, datetime]:
+        """Pick the coarsest table for the window; returns it with the bucket-aligned start."""
+
+        for resolution in reversed(RESOLUTIONS):
+            if interval >= resolution.step * _MIN_BUCKETS:
+                return resolution.table, floor_to(since, resolution.step)
+        return "mentions_1m", since
+
+    async def _distinct_authors(
+        self, table: str, tickers: list[str], since: datetime
+    ) -> dict[str, int]:
+        """Merge each ticker's per-minute author sketches into one window-wide estimate.
+
+        `SUM(unique_authors)` counts someone posting every minute once per bucket; the merged
+        HyperLogLog counts them once. Buckets without a sketch (rolled up in SQL) add their
+        own count instead.
+        """
+
+        if not tickers:
+            return {}
+        rows = await self._db.fetch(
+            f"""
+            SELECT ticker, authors_hll, unique_authors
+            FROM {table}
+            WHERE ts_utc >= $1 AND ticker = ANY($2::text[])
+            """,  # noqa: S608 - table comes from _plan, not user input
+            since,
+            tickers,
+        )
+        sketches: dict[str, list[bytes]] = {}
+        unsketched: dict[str, int] = {}
+        for row in rows:
+            ticker = row["ticker"]
+            if row.get("authors_hll") is not None:
+                sketches.setdefault(ticker, []).append(bytes(row["authors_hll"]))
+            else:
+                unsketched[ticker] = unsketched.get(ticker, 0) + (row["unique_authors"] or 0)
+        return {
+            ticker: len(HyperLogLog.merge_all(payloads)) + unsketched.get(ticker, 0)
+            for ticker, payloads in sketches.items()
+        }
 
     def _parse_window(self, window: str) -> timedelta:
         if window in _WINDOW_DEFAULTS:
@@ -68,9 +128,14 @@ class TrendService:
             return timedelta(days=int(window[:-1]))
         return _WINDOW_DEFAULTS["5m"]
 
-    def _format_row(self, row: Mapping[str, Any], window: str) -> Dict[str, Any]:
+    def _format_row(
+        self, row: Mapping[str, Any], window: str, distinct_authors: int | None = None
+    ) -> dict[str, Any]:
         mentions = row["mentions"] or 0
-        unique_authors = row["unique_authors"] or 0
+        if distinct_authors is None:
+            unique_authors = row["unique_authors"] or 0
+        else:
+            unique_authors = distinct_authors
         avg_sentiment = float(row["avg_sentiment"] or 0.0)
         zscore = float(row["zscore"] or 0.0)
         hype = zscore * log1p(unique_authors) * (1 + max(min(avg_sentiment, 0.25), -0.25))
@@ -90,5 +155,5 @@ class TrendService:
     def _now(self) -> datetime:
         value = self._now_fn()
         if value.tzinfo is None:
-            return value.replace(tzinfo=timezone.utc)
+            return value.replace(tzinfo=UTC)
         return value
@@ -36,7 +36,39 @@ class RedditSettings(BaseSettings):
     password: str
     user_agent: str = Field(default="wsb-hype-radar/0.1")
     subreddit: str = Field(default="wallstreetbets")
+    subreddits: list[str] = Field(
+        default_factory=list, description="Satellite subs polled alongside `subreddit`"
+    )
     poll_interval_seconds: float = Field(default=2.0)
+    min_poll_interval_seconds: float = Field(default=1.0)
+    max_poll_interval_seconds: float = Field(default=30.0)
+    requests_per_minute: int = Field(
+        default=60, description="Global request budget shared by all feeds"
+    )
+    poll_submissions: bool = Field(default=True, description="Also poll /new.json for submissions")
+    submission_interval_seconds: float = Field(default=15.0)
+    priority_reserve: int = Field(
+        default=10, description="Below this many remaining requests only the main feed polls"
+    )
+    max_catchup_pages: int = Field(
+        default=5, description="Extra listing pages followed per poll to close gaps"
+    )
+    seen_capacity: int = Field(default=100_000, description="Recent ids remembered for dedup")
+    seen_bloom_bits: int = Field(default=0, description="Optional Bloom filter size; 0 disables it")
+    seen_snapshot_path: str | None = Field(
+        default=None, description="File the dedup index is saved to"
+    )
+    seen_snapshot_interval_seconds: float = Field(default=60.0)
+
+    @property
+    def feeds(self) -> list[str]:
+        """Main subreddit first, followed by de-duplicated satellite subs."""
+
+        feeds = [self.subreddit]
+        for name in self.subreddits:
+            if name not in feeds:
+                feeds.append(name)
+        return feeds
 
 
 class PriceFeedSettings(BaseSettings):
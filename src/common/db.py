@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Iterable, Sequence
+from collections.abc import AsyncGenerator, AsyncIterator, Iterable, Sequence
+from contextlib import asynccontextmanager
+from typing import Any
 
 import asyncpg
 
@@ -52,6 +54,38 @@ class PostgresClient:
             rows = await conn.fetch(query, *args)
         return list(rows)
 
+    async def stream(
+        self, query: str, *args: Any, prefetch: int = 1000
+    ) -> AsyncGenerator[list[asyncpg.Record], None]:
+        """Yield the result in chunks of up to `prefetch` rows from a server-side cursor.
+
+        Only one chunk is held client-side at a time; the cursor's connection stays checked out
+        (inside a transaction, as cursors require) until the generator is exhausted or closed,
+        so callers that may stop early should wrap it in `contextlib.aclosing`.
+        """
+
+        if prefetch < 1:
+            msg = "prefetch must be positive"
+            raise ValueError(msg)
+        async with self.transaction() as conn:
+            cursor = await conn.cursor(query, *args)
+            while True:
+                rows = await cursor.fetch(prefetch)
+                if not rows:
+                    return
+                yield rows
+                if len(rows) < prefetch:
+                    return
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[asyncpg.Connection]:
+        """Hold one pooled connection inside a transaction for multi-statement writes."""
+
+        pool = await self._ensure_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                yield conn
+
     async def _ensure_pool(self) -> asyncpg.Pool:
         if not self._pool:
             await self.connect()
@@ -0,0 +1,33 @@
+"""In-process metric primitives shared by the workers."""
+from __future__ import annotations
+
+from collections import deque
+
+
+class LatencyWindow:
+    """Keeps the most recent latency samples for cheap percentile reads."""
+
+    def __init__(self, size: int = 1024) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, pct: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        idx = min(round(pct / 100.0 * (len(ordered) - 1)), len(ordered) - 1)
+        return ordered[idx]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
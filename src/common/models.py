@@ -1,6 +1,7 @@
 """Typed domain models shared across services."""
 from __future__ import annotations
 
+from dataclasses import dataclass, fields
 from datetime import datetime
 from typing import Literal, Sequence
 
@@ -23,6 +24,8 @@ class RedditItem(BaseModel):
     permalink: str
     parent_id: str | None = None
     link_id: str | None = None
+    title: str | None = None
+    flair: str | None = None
 
 
 class MentionEvent(BaseModel):
@@ -43,6 +46,51 @@ class MentionEvent(BaseModel):
     sentiment_conf: float = Field(default=0.0, ge=0.0, le=1.0)
     has_options_intent: bool = False
     option_side: SentimentLabel = 0
+    universe_version: int | None = None
+
+
+@dataclass(slots=True)
+class MentionRecord:
+    """Unvalidated `MentionEvent` twin for the ingest hot path.
+
+    The extractor and annotator build and mutate these (a slots object is several times
+    cheaper than a pydantic model to create and to assign to); `to_event` validates once at the
+    boundaries: the database writers, the spool and the API.
+    """
+
+    ts_utc: datetime
+    subreddit: str
+    reddit_id: str
+    author: str
+    ticker: str
+    confidence: float
+    thread_id: str | None = None
+    upvotes: int = 0
+    span_text: str | None = None
+    price_at_mention: float | None = None
+    sentiment_label: SentimentLabel = 0
+    sentiment_score: float = 0.0
+    sentiment_conf: float = 0.0
+    has_options_intent: bool = False
+    option_side: SentimentLabel = 0
+    universe_version: int | None = None
+
+    def to_event(self) -> MentionEvent:
+        return MentionEvent.model_validate(self, from_attributes=True)
+
+    @classmethod
+    def from_event(cls, event: MentionEvent) -> MentionRecord:
+        return cls(**{field.name: getattr(event, field.name) for field in fields(cls)})
+
+
+# Writers and the annotator accept either form; both expose the same attributes.
+Mention = MentionEvent | MentionRecord
+
+
+def as_event(mention: Mention) -> MentionEvent:
+    """Validate a hot-path record; events pass through unchanged."""
+
+    return mention.to_event() if isinstance(mention, MentionRecord) else mention
 
 
 class MinuteAggregation(BaseModel):
@@ -57,6 +105,8 @@ class MinuteAggregation(BaseModel):
     zscore: float | None = None
     ears_flag: bool | None = None
     cusum_stat: float | None = None
+    # Serialized `trend.hll.HyperLogLog` of the bucket's authors, mergeable across minutes.
+    authors_hll: bytes | None = None
 
 
 class AlertEvent(BaseModel):
@@ -0,0 +1,169 @@
+"""Fast decode path for Reddit listing JSON.
+
+Listing children carry ~60 fields of which we store nine. With `msgspec` installed, pages are
+decoded straight into compact `CommentRecord` structs and every other field is skipped inside
+the C decoder; otherwise `orjson` (or the stdlib) decodes the page and records are built from
+the dicts. Either way `RedditItem`s are only constructed for comments the caller keeps.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from common.models import RedditItem
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional speedup
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def loads(raw: bytes | str) -> Any:
+    """Decode JSON with orjson when installed, falling back to the stdlib."""
+
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class _ToItem:
+    __slots__ = ()
+
+    id: str
+    subreddit: str | None
+    author: str | None
+    body: str | None
+    created_utc: float
+    score: int
+    permalink: str | None
+    parent_id: str | None
+    link_id: str | None
+
+    def to_item(self, default_subreddit: str) -> RedditItem:
+        return RedditItem(
+            id=self.id,
+            kind="comment",
+            subreddit=self.subreddit or default_subreddit,
+            author=self.author or "[deleted]",
+            body=self.body or "",
+            created_utc=datetime.fromtimestamp(self.created_utc, tz=UTC),
+            score=self.score,
+            permalink=self.permalink or "",
+            parent_id=self.parent_id or "",
+            link_id=self.link_id or "",
+        )
+
+
+if msgspec is not None:
+
+    class CommentRecord(msgspec.Struct, _ToItem):
+        """Compact view of the comment fields we store; unknown fields are skipped on decode."""
+
+        id: str = ""
+        subreddit: str | None = None
+        author: str | None = None
+        body: str | None = None
+        created_utc: float = 0.0
+        score: int = 0
+        permalink: str | None = None
+        parent_id: str | None = None
+        link_id: str | None = None
+
+    class _Child(msgspec.Struct):
+        data: CommentRecord = msgspec.field(default_factory=CommentRecord)
+
+    class _ListingData(msgspec.Struct):
+        children: list[_Child] = msgspec.field(default_factory=list)
+        after: str | None = None
+
+    class _Listing(msgspec.Struct):
+        data: _ListingData = msgspec.field(default_factory=_ListingData)
+
+    _listing_decoder = msgspec.json.Decoder(_Listing)
+
+    def record_from_json(data: Mapping[str, Any]) -> CommentRecord:
+        return msgspec.convert(data, CommentRecord)
+
+    def decode_listing(raw: bytes | str) -> tuple[list[CommentRecord], str | None]:
+        """Decode a `comments.json` page into newest-first records plus the `after` cursor."""
+
+        listing = _listing_decoder.decode(raw)
+        return [child.data for child in listing.data.children], listing.data.after
+
+else:  # pragma: no cover - exercised only without msgspec
+
+    @dataclass(slots=True)
+    class CommentRecord(_ToItem):  # type: ignore[no-redef]
+        """Compact view of the comment fields we store."""
+
+        id: str = ""
+        subreddit: str | None = None
+        author: str | None = None
+        body: str | None = None
+        created_utc: float = 0.0
+        score: int = 0
+        permalink: str | None = None
+        parent_id: str | None = None
+        link_id: str | None = None
+
+    def record_from_json(data: Mapping[str, Any]) -> CommentRecord:
+        get = data.get
+        return CommentRecord(
+            get("id") or "",
+            get("subreddit"),
+            get("author"),
+            get("body"),
+            get("created_utc") or 0.0,
+            get("score") or 0,
+            get("permalink"),
+            get("parent_id"),
+            get("link_id"),
+        )
+
+    def decode_listing(raw: bytes | str) -> tuple[list[CommentRecord], str | None]:
+        """Decode a `comments.json` page into newest-first records plus the `after` cursor."""
+
+        data = loads(raw).get("data") or {}
+        children = data.get("children") or ()
+        records = [record_from_json(child.get("data") or {}) for child in children]
+        return records, data.get("after")
+
+
+def decode_posts(raw: bytes | str) -> list[Mapping[str, Any]]:
+    """Decode a `new.json` page into newest-first submission dicts (low volume, no struct)."""
+
+    data = loads(raw).get("data") or {}
+    return [child.get("data") or {} for child in data.get("children") or ()]
+
+
+def post_to_item(post: Mapping[str, Any], default_subreddit: str) -> RedditItem:
+    """Store a submission with title + selftext as the body, keyed by its `t3_` fullname.
+
+    Post and comment ids are separate base36 sequences that share the `reddit_items` key, so
+    posts use the fullname (which is also their `link_id`) and cannot collide with a comment.
+    """
+
+    title = post.get("title") or ""
+    selftext = post.get("selftext") or ""
+    fullname = f"t3_{post.get('id') or ''}"
+    return RedditItem(
+        id=fullname,
+        kind="post",
+        subreddit=post.get("subreddit") or default_subreddit,
+        author=post.get("author") or "[deleted]",
+        body=f"{title}\n\n{selftext}" if selftext else title,
+        created_utc=datetime.fromtimestamp(post.get("created_utc") or 0, tz=UTC),
+        score=post.get("score") or 0,
+        permalink=post.get("permalink") or "",
+        link_id=fullname,
+        title=title,
+        flair=post.get("link_flair_text"),
+    )
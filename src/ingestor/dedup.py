@@ -0,0 +1,130 @@
+"""Bounded, insertion-ordered dedup index for Reddit ids."""
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Container, Iterable, Iterator
+from pathlib import Path
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over a blake2b digest."""
+
+    def __init__(self, num_bits: int, num_hashes: int = 4) -> None:
+        if num_bits <= 0:
+            msg = "num_bits must be > 0"
+            raise ValueError(msg)
+        self._num_bits = num_bits
+        self._num_hashes = num_hashes
+        self._bits = bytearray((num_bits + 7) // 8)
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self._num_hashes):
+            yield (h1 + i * h2) % self._num_bits
+
+
+class SeenIndex:
+    """Remembers the most recent `capacity` ids and evicts strictly oldest-first.
+
+    A ring buffer holds ids in insertion order and a dict maps id -> slot for O(1) membership.
+    An optional pair of Bloom filters keeps probabilistic memory of ids that already fell out
+    of the ring: each takes `capacity` inserts before the older one is discarded, so neither
+    saturates and memory reaches back between one and two ring-lengths. The ring can be
+    snapshotted to disk so a restart resumes without re-ingesting the last page of comments;
+    the Bloom filters are rebuilt from the snapshot on load.
+    """
+
+    def __init__(self, capacity: int = 100_000, bloom_bits: int = 0) -> None:
+        if capacity <= 0:
+            msg = "capacity must be > 0"
+            raise ValueError(msg)
+        self._capacity = capacity
+        self._ring: list[str | None] = [None] * capacity
+        self._slots: dict[str, int] = {}
+        self._head = 0
+        self._bloom_bits = bloom_bits
+        self._bloom = BloomFilter(bloom_bits) if bloom_bits else None
+        self._previous_bloom: BloomFilter | None = None
+        self._bloom_inserts = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._slots:
+            return True
+        if self._bloom is None or not isinstance(key, str):
+            return False
+        return key in self._bloom or (
+            self._previous_bloom is not None and key in self._previous_bloom
+        )
+
+    def add(self, key: str) -> bool:
+        """Insert `key`; return False if it was already present."""
+
+        if key in self:
+            return False
+        evicted = self._ring[self._head]
+        if evicted is not None:
+            del self._slots[evicted]
+        self._ring[self._head] = key
+        self._slots[key] = self._head
+        self._head = (self._head + 1) % self._capacity
+        if self._bloom is not None:
+            self._bloom.add(key)
+            self._bloom_inserts += 1
+            if self._bloom_inserts >= self._capacity:
+                self._previous_bloom = self._bloom
+                self._bloom = BloomFilter(self._bloom_bits)
+                self._bloom_inserts = 0
+        return True
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield ids oldest first."""
+
+        for offset in range(self._capacity):
+            key = self._ring[(self._head + offset) % self._capacity]
+            if key is not None:
+                yield key
+
+    def save(self, path: Path, exclude: Container[str] = ()) -> None:
+        """Atomically write the ids (oldest first) to `path`, leaving out `exclude`."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            for key in self:
+                if key in exclude:
+                    continue
+                handle.write(key)
+                handle.write("\n")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, capacity: int = 100_000, bloom_bits: int = 0) -> SeenIndex:
+        """Restore an index from `path`; a missing file yields an empty index."""
+
+        index = cls(capacity=capacity, bloom_bits=bloom_bits)
+        if path.exists():
+            with path.open("r", encoding="utf-8") as handle:
+                index.update(line.rstrip("\n") for line in handle if line.strip())
+        return index
@@ -0,0 +1,159 @@
+"""SimHash near-duplicate detection for copypasta and bot spam."""
+from __future__ import annotations
+
+import hashlib
+import heapq
+from collections.abc import Sequence
+from itertools import count, pairwise
+from typing import Literal
+
+import numpy as np
+
+from common.models import RedditItem
+from nlp.matcher import tokenize
+
+NearDupAction = Literal["drop", "mark"]
+
+_SHINGLE_MULT = np.uint64(0x9E3779B97F4A7C15)
+
+
+class _TokenIds(dict[str, int]):
+    """Token -> uniformly random 64-bit id, hashed once per distinct token."""
+
+    def __missing__(self, token: str) -> int:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = self[token] = int.from_bytes(digest, "little")
+        return value
+
+
+class SimHasher:
+    """64-bit SimHash over token bigram shingles, with the bit voting done in NumPy."""
+
+    def __init__(self, cache_size: int = 200_000) -> None:
+        self._ids = _TokenIds()
+        self._cache_size = cache_size
+
+    def fingerprint(self, tokens: Sequence[str]) -> int:
+        if not tokens:
+            return 0
+        if len(self._ids) > self._cache_size:
+            self._ids.clear()
+        ids = np.fromiter(map(self._ids.__getitem__, tokens), dtype=np.uint64, count=len(tokens))
+        # Ids are uniform 64-bit values, so a multiply-add already gives well-spread shingles.
+        features = ids[:-1] * _SHINGLE_MULT + ids[1:] if len(ids) > 1 else ids
+        # Row i of `bits` holds the 64 bits of feature i (byte order is fixed per platform).
+        bits = np.unpackbits(features.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+        votes = np.count_nonzero(bits, axis=0) * 2 > len(features)
+        return int.from_bytes(np.packbits(votes, bitorder="little").tobytes(), "little")
+
+
+class NearDuplicateIndex:
+    """Sliding window of recent fingerprints with Hamming-distance lookup.
+
+    Fingerprints are split into `max_distance + 1` blocks; by pigeonhole, two fingerprints
+    within `max_distance` bits agree exactly on at least one block, so only fingerprints
+    sharing a block value are compared. The window is bounded by `capacity` entries and by
+    `window_seconds` before the newest item time seen. Items arrive out of order (catch-up
+    pages come newest first), so entries are kept in a heap by item time and the oldest is
+    always the one evicted.
+    """
+
+    def __init__(
+        self, capacity: int = 50_000, max_distance: int = 3, window_seconds: float = 3600.0
+    ) -> None:
+        if capacity <= 0:
+            msg = "capacity must be > 0"
+            raise ValueError(msg)
+        self._capacity = capacity
+        self._max_distance = max_distance
+        self._window_seconds = window_seconds
+        blocks = max_distance + 1
+        edges = [round(64 * idx / blocks) for idx in range(blocks + 1)]
+        self._blocks = [(start, (1 << (end - start)) - 1) for start, end in pairwise(edges)]
+        self._buckets: list[dict[int, dict[int, int]]] = [{} for _ in self._blocks]
+        self._window: list[tuple[float, int, int]] = []
+        self._order = count()
+        self._newest = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    def find(self, fingerprint: int) -> int | None:
+        """Return a windowed fingerprint within `max_distance` bits, if any."""
+
+        for (shift, mask), buckets in zip(self._blocks, self._buckets, strict=True):
+            bucket = buckets.get((fingerprint >> shift) & mask)
+            if not bucket:
+                continue
+            for other in bucket:
+                if (fingerprint ^ other).bit_count() <= self._max_distance:
+                    return other
+        return None
+
+    def add(self, fingerprint: int, ts: float) -> None:
+        self._newest = max(self._newest, ts)
+        horizon = self._newest - self._window_seconds
+        if ts < horizon:
+            return
+        heapq.heappush(self._window, (ts, next(self._order), fingerprint))
+        for (shift, mask), buckets in zip(self._blocks, self._buckets, strict=True):
+            bucket = buckets.setdefault((fingerprint >> shift) & mask, {})
+            bucket[fingerprint] = bucket.get(fingerprint, 0) + 1
+        while self._window and (len(self._window) > self._capacity or self._window[0][0] < horizon):
+            self._evict()
+
+    def _evict(self) -> None:
+        _, _, fingerprint = heapq.heappop(self._window)
+        for (shift, mask), buckets in zip(self._blocks, self._buckets, strict=True):
+            key = (fingerprint >> shift) & mask
+            bucket = buckets[key]
+            if bucket[fingerprint] > 1:
+                bucket[fingerprint] -= 1
+                continue
+            del bucket[fingerprint]
+            if not bucket:
+                del buckets[key]
+
+
+class NearDuplicateDetector:
+    """Flags items whose text nearly matches one seen in the recent window.
+
+    Bodies shorter than `min_tokens` are never flagged: many users independently writing
+    "GME to the moon" is signal, not spam. `action` tells the ingestor whether flagged items
+    are dropped outright or kept (stored in `reddit_items`) without extracting mentions.
+    """
+
+    def __init__(
+        self,
+        index: NearDuplicateIndex | None = None,
+        min_tokens: int = 8,
+        action: NearDupAction = "drop",
+    ) -> None:
+        self._index = index or NearDuplicateIndex()
+        self._hasher = SimHasher()
+        self._min_tokens = min_tokens
+        self.action = action
+        self.checked = 0
+        self.suppressed = 0
+        self.too_short = 0
+
+    def is_duplicate(self, item: RedditItem) -> bool:
+        _, lowered = tokenize(item.body)
+        if len(lowered) < self._min_tokens:
+            self.too_short += 1
+            return False
+        self.checked += 1
+        fingerprint = self._hasher.fingerprint(lowered)
+        duplicate = self._index.find(fingerprint) is not None
+        self._index.add(fingerprint, item.created_utc.timestamp())
+        if duplicate:
+            self.suppressed += 1
+        return duplicate
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "near_dup_checked": self.checked,
+            "near_dup_suppressed": self.suppressed,
+            "near_dup_too_short": self.too_short,
+            "near_dup_window": len(self._index),
+        }
@@ -0,0 +1,144 @@
+"""Request budgeting shared by every Reddit feed poller."""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Callable, Mapping
+
+
+class RequestBudget:
+    """Token bucket limiting the total request rate across concurrent feeds.
+
+    The local bucket is reconciled with Reddit's `X-Ratelimit-Remaining`/`X-Ratelimit-Reset`
+    headers: while the server reports a window, requests are spread evenly over what is left
+    of it, and nothing is sent once it is exhausted until the reset. `backoff` handles 429s
+    (honouring `Retry-After`) and other failures with exponential backoff plus jitter; the
+    delay keeps doubling until the caller reports a `record_success`. When the budget is tight
+    (`reserve` requests or fewer left), only `priority` callers, i.e. the main feed, are let
+    through.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        burst: int | None = None,
+        reserve: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ) -> None:
+        if requests_per_minute <= 0:
+            msg = "requests_per_minute must be > 0"
+            raise ValueError(msg)
+        self._nominal_rate = requests_per_minute / 60.0
+        self._rate = self._nominal_rate
+        self._capacity = float(burst or max(1, requests_per_minute // 10))
+        self._tokens = self._capacity
+        self._reserve = reserve
+        self._clock = clock
+        self._rng = rng or random.Random()  # noqa: S311 - backoff jitter, not security
+        self._updated = clock()
+        self._server_remaining: float | None = None
+        self._server_reset_at = 0.0
+        self._blocked_until = 0.0
+        self._failures = 0
+        self.throttled = 0
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    @property
+    def remaining(self) -> float:
+        """Requests left before we expect to be throttled (exported as a metric)."""
+
+        self._refill()
+        if self._server_remaining is None:
+            return self._tokens
+        return min(self._tokens, self._server_remaining)
+
+    async def acquire(self, priority: bool = False) -> None:
+        """Wait until a request may be sent and consume one token."""
+
+        while True:
+            delay = self._delay(priority)
+            if delay <= 0:
+                self._tokens -= 1.0
+                if self._server_remaining is not None:
+                    self._server_remaining -= 1
+                return
+            await asyncio.sleep(delay)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Reconcile the bucket with Reddit's rate limit headers after a response."""
+
+        remaining = _parse_float(headers.get("x-ratelimit-remaining"))
+        reset = _parse_float(headers.get("x-ratelimit-reset"))
+        if remaining is None or reset is None:
+            return
+        self._refill()
+        now = self._clock()
+        self._server_remaining = remaining
+        self._server_reset_at = now + reset
+        spread = max(remaining, 0.0) / reset if reset > 0 else self._nominal_rate
+        self._rate = min(max(spread, self._nominal_rate / 10), self._nominal_rate)
+        self._tokens = min(self._tokens, max(remaining, 0.0))
+
+    def record_success(self) -> None:
+        """Reset the failure streak so the next `backoff` starts again from `base`."""
+
+        self._failures = 0
+
+    def backoff(
+        self, retry_after: float | None = None, base: float = 2.0, cap: float = 300.0
+    ) -> float:
+        """Block all requests after a 429/failure; return the chosen delay in seconds."""
+
+        self._failures += 1
+        if retry_after is not None:
+            self.throttled += 1
+            delay = retry_after
+        else:
+            delay = min(base * 2 ** (self._failures - 1), cap)
+        delay += self._rng.uniform(0, delay * 0.25)
+        self._blocked_until = max(self._blocked_until, self._clock() + delay)
+        return delay
+
+    def throttled_response(self, headers: Mapping[str, str], default_wait: float = 60.0) -> float:
+        """Back off after a 429, honouring `Retry-After` when present."""
+
+        retry_after = _parse_float(headers.get("retry-after"))
+        return self.backoff(retry_after if retry_after is not None else default_wait)
+
+    def _delay(self, priority: bool) -> float:
+        self._refill()
+        now = self._clock()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._server_remaining is not None and now < self._server_reset_at:
+            if self._server_remaining < 1:
+                return self._server_reset_at - now
+            if not priority and self._server_remaining <= self._reserve:
+                return min(self._server_reset_at - now, 1.0)
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self._rate
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if self._server_remaining is not None and now >= self._server_reset_at:
+            self._server_remaining = None
+            self._rate = self._nominal_rate
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+
+
+def _parse_float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
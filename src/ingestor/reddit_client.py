@@ -2,82 +2,278 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
-from typing import AsyncIterator
+import time
+from collections.abc import AsyncIterator, Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
 
 import httpx
 
 from common.config import RedditSettings
 from common.models import RedditItem
+from ingestor.decoding import CommentRecord, decode_listing, decode_posts, post_to_item
+from ingestor.dedup import SeenIndex
+from ingestor.ratelimit import RequestBudget
+
+
+@dataclass
+class FeedState:
+    """Adaptive polling state for a single subreddit comment feed."""
+
+    subreddit: str
+    interval: float
+    kind: Literal["comment", "post"] = "comment"
+    polls: int = 0
+    last_new: int = 0
+    items_total: int = 0
+    newest_id: str | None = None
+    last_recovered: int = 0
+    recovered_total: int = 0
+    catchup_capped: int = 0
 
 
 class RedditClient:
     """Client for fetching subreddit comments using Reddit's public JSON API."""
 
-    def __init__(self, settings: RedditSettings) -> None:
+    _PAGE_LIMIT = 100
+    _QUEUE_SIZE = 1000
+
+    def __init__(
+        self,
+        settings: RedditSettings,
+        http_client: httpx.AsyncClient | None = None,
+        budget: RequestBudget | None = None,
+    ) -> None:
         self._settings = settings
-        self._client = httpx.AsyncClient(
+        self._client = http_client or httpx.AsyncClient(
             headers={
                 "User-Agent": settings.user_agent,
             },
             timeout=30.0,
         )
-        self._seen_ids: set[str] = set()
+        self._budget = budget or RequestBudget(
+            settings.requests_per_minute, reserve=settings.priority_reserve
+        )
+        self._feeds = {
+            name: FeedState(subreddit=name, interval=settings.poll_interval_seconds)
+            for name in settings.feeds
+        }
+        self._post_feeds = {
+            name: FeedState(
+                subreddit=name, interval=settings.submission_interval_seconds, kind="post"
+            )
+            for name in (settings.feeds if settings.poll_submissions else ())
+        }
+        snapshot = settings.seen_snapshot_path
+        self._snapshot_path = Path(snapshot) if snapshot else None
+        if self._snapshot_path:
+            self._seen_ids = SeenIndex.load(
+                self._snapshot_path,
+                capacity=settings.seen_capacity,
+                bloom_bits=settings.seen_bloom_bits,
+            )
+        else:
+            self._seen_ids = SeenIndex(
+                capacity=settings.seen_capacity, bloom_bits=settings.seen_bloom_bits
+            )
+        # Ids handed to the pipeline but not yet written; the snapshot leaves them out so a
+        # crash re-fetches them instead of treating them as seen.
+        self._unwritten: set[str] = set()
+        self._last_snapshot = time.monotonic()
+
+    @property
+    def feeds(self) -> Mapping[str, FeedState]:
+        return self._feeds
+
+    @property
+    def post_feeds(self) -> Mapping[str, FeedState]:
+        return self._post_feeds
+
+    @property
+    def budget(self) -> RequestBudget:
+        return self._budget
 
     async def stream_comments(self) -> AsyncIterator[RedditItem]:
-        """Stream new comments from the subreddit by polling the JSON API."""
-        url = f"https://www.reddit.com/r/{self._settings.subreddit}/comments.json"
+        """Stream new comments (and submissions) from every configured feed, polled concurrently."""
+
+        queue: asyncio.Queue[RedditItem] = asyncio.Queue(maxsize=self._QUEUE_SIZE)
+        states = [*self._feeds.values(), *self._post_feeds.values()]
+        tasks = [asyncio.create_task(self._poll_feed(state, queue)) for state in states]
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def poll_once(self, subreddit: str) -> list[RedditItem]:
+        """Fetch unseen comments for `subreddit`, oldest first.
+
+        When the newest comment from the previous poll is not on the first page, more than a
+        page landed in between; follow the `after` cursor (at most `max_catchup_pages` extra
+        pages) until it is reached so bursts are not silently dropped.
+        """
 
+        state = self._feeds.setdefault(
+            subreddit, FeedState(subreddit=subreddit, interval=self._settings.poll_interval_seconds)
+        )
+        watermark = self._id_value(state.newest_id) if state.newest_id else None
+
+        pages: list[list[CommentRecord]] = []
+        after: str | None = None
         while True:
-            try:
-                response = await self._client.get(url, params={"limit": 100})
-                response.raise_for_status()
-                data = response.json()
+            records, after = await self._fetch_page(subreddit, after)
+            pages.append(records)
+            if watermark is None or after is None:
+                break
+            if any(self._id_value(record.id) <= watermark for record in records):
+                break
+            if len(pages) > self._settings.max_catchup_pages:
+                state.catchup_capped += 1
+                break
 
-                # Extract comments from JSON response
-                comments = data.get("data", {}).get("children", [])
+        # Process comments in reverse order (oldest first); only unseen ones become RedditItems
+        items: list[RedditItem] = []
+        recovered = 0
+        for page_no in range(len(pages) - 1, -1, -1):
+            for record in reversed(pages[page_no]):
+                # Skip anything at or below the previous poll's newest id
+                if watermark is not None and self._id_value(record.id) <= watermark:
+                    continue
 
-                # Process comments in reverse order (oldest first)
-                for comment_data in reversed(comments):
-                    comment = comment_data.get("data", {})
-                    comment_id = comment.get("id")
+                # Skip if we've already seen this comment; the index evicts oldest-first
+                if not record.id or not self._seen_ids.add(record.id):
+                    continue
 
-                    # Skip if we've already seen this comment
-                    if comment_id in self._seen_ids:
-                        continue
+                if page_no > 0:
+                    recovered += 1
+                items.append(record.to_item(subreddit))
 
-                    self._seen_ids.add(comment_id)
+        if items:
+            state.newest_id = items[-1].id
+        state.last_recovered = recovered
+        state.recovered_total += recovered
+        return items
 
-                    # Keep set size manageable (last 10k comments)
-                    if len(self._seen_ids) > 10000:
-                        self._seen_ids.pop()
+    async def poll_posts(self, subreddit: str) -> list[RedditItem]:
+        """Fetch unseen submissions from `/new.json`, oldest first."""
 
-                    yield self._to_item(comment)
+        records = decode_posts(await self._get_listing(subreddit, "new", None))
+        items: list[RedditItem] = []
+        for record in reversed(records):
+            if not record.get("id"):
+                continue
+            item = post_to_item(record, subreddit)
+            # Dedup on the stored key: the `t3_` fullname, which comment ids never collide with.
+            if self._seen_ids.add(item.id):
+                items.append(item)
+        return items
 
-                # Wait before polling again (Reddit rate limit: ~60 requests/min)
-                await asyncio.sleep(2)
+    async def _fetch_page(
+        self, subreddit: str, after: str | None
+    ) -> tuple[list[CommentRecord], str | None]:
+        return decode_listing(await self._get_listing(subreddit, "comments", after))
 
+    async def _get_listing(self, subreddit: str, listing: str, after: str | None) -> bytes:
+        await self._budget.acquire(priority=subreddit == self._settings.subreddit)
+        url = f"https://www.reddit.com/r/{subreddit}/{listing}.json"
+        params: dict[str, str | int] = {"limit": self._PAGE_LIMIT}
+        if after:
+            params["after"] = after
+        response = await self._client.get(url, params=params)
+        self._budget.update_from_headers(response.headers)
+        if response.status_code == 429:
+            self._budget.throttled_response(response.headers)
+        response.raise_for_status()
+        self._budget.record_success()
+        return response.content
+
+    async def _poll_feed(self, state: FeedState, queue: asyncio.Queue[RedditItem]) -> None:
+        while True:
+            try:
+                if state.kind == "post":
+                    items = await self.poll_posts(state.subreddit)
+                else:
+                    items = await self.poll_once(state.subreddit)
             except Exception as e:
-                print(f"Error fetching comments: {e}")
-                await asyncio.sleep(10)
-
-    def _to_item(self, comment: dict) -> RedditItem:
-        """Convert Reddit JSON comment to RedditItem."""
-        return RedditItem(
-            id=comment.get("id", ""),
-            kind="comment",
-            subreddit=comment.get("subreddit", self._settings.subreddit),
-            author=comment.get("author", "[deleted]"),
-            body=comment.get("body", ""),
-            created_utc=datetime.fromtimestamp(
-                comment.get("created_utc", 0), tz=timezone.utc
-            ),
-            score=comment.get("score", 0),
-            permalink=comment.get("permalink", ""),
-            parent_id=comment.get("parent_id", ""),
-            link_id=comment.get("link_id", ""),
+                print(f"Error fetching r/{state.subreddit} {state.kind}s: {e}")
+                if self._is_upstream_failure(e):
+                    # The shared budget holds every feed back until the backoff expires.
+                    self._budget.backoff()
+                elif not (isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 429):
+                    # A bad page or a 4xx is specific to this feed; slow only this feed down.
+                    state.interval = min(
+                        state.interval * 2, self._settings.max_poll_interval_seconds
+                    )
+                    await asyncio.sleep(state.interval)
+                continue
+
+            self._adapt_interval(state, len(items))
+            if state.last_recovered:
+                print(
+                    f"Recovered {state.last_recovered} r/{state.subreddit} comments "
+                    "via catch-up paging"
+                )
+            for item in items:
+                self._unwritten.add(item.id)
+                await queue.put(item)
+            self._maybe_snapshot()
+            await asyncio.sleep(state.interval)
+
+    def mark_done(self, ids: Iterable[str]) -> None:
+        """Record ids the pipeline has written (or deliberately dropped) so they get snapshotted."""
+
+        self._unwritten.difference_update(ids)
+
+    def _maybe_snapshot(self, force: bool = False) -> None:
+        if self._snapshot_path is None:
+            return
+        now = time.monotonic()
+        if force or now - self._last_snapshot >= self._settings.seen_snapshot_interval_seconds:
+            self._seen_ids.save(self._snapshot_path, exclude=self._unwritten)
+            self._last_snapshot = now
+
+    @staticmethod
+    def _is_upstream_failure(error: Exception) -> bool:
+        """Transport errors and 5xx responses mean Reddit itself is struggling."""
+
+        if isinstance(error, httpx.TransportError):
+            return True
+        return isinstance(error, httpx.HTTPStatusError) and error.response.status_code >= 500
+
+    def _adapt_interval(self, state: FeedState, new_items: int) -> None:
+        """Poll busy feeds faster and back quiet feeds off, within configured bounds."""
+
+        state.polls += 1
+        state.last_new = new_items
+        state.items_total += new_items
+
+        fill_ratio = new_items / self._PAGE_LIMIT
+        if fill_ratio >= 0.5:
+            interval = state.interval * 0.5
+        elif new_items == 0:
+            interval = state.interval * 1.5
+        elif fill_ratio < 0.1:
+            interval = state.interval * 1.2
+        else:
+            interval = state.interval
+        state.interval = min(
+            max(interval, self._settings.min_poll_interval_seconds),
+            self._settings.max_poll_interval_seconds,
         )
 
+    @staticmethod
+    def _id_value(comment_id: str | None) -> int:
+        """Reddit ids are base36 counters, so numeric order matches creation order."""
+
+        try:
+            return int(comment_id or "", 36)
+        except ValueError:
+            return -1
+
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Persist the dedup index and close the HTTP client."""
+        self._maybe_snapshot(force=True)
         await self._client.aclose()
@@ -0,0 +1,120 @@
+"""Offline replay of recorded Reddit comment dumps."""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import mmap
+import time
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from pathlib import Path
+from typing import Any
+
+from common.models import RedditItem
+from ingestor.decoding import loads, record_from_json
+
+
+class ReplayRedditClient:
+    """Replays recorded dumps through the same `stream_comments` interface as RedditClient.
+
+    Accepted inputs, optionally gzipped (`.gz`):
+      * NDJSON where each line is a raw comment object, a listing child (`{"kind", "data"}`)
+        or a whole `comments.json` listing page;
+      * a single `comments.json` listing page (`.json`).
+    Uncompressed files are memory-mapped. Listing pages are newest-first, so their children
+    are replayed in reverse.
+
+    `speed` controls pacing by `created_utc`: 0 replays as fast as possible, 1 in real time,
+    N at N times real time.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[Path],
+        speed: float = 0.0,
+        default_subreddit: str = "wallstreetbets",
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        if speed < 0:
+            msg = "speed must be >= 0"
+            raise ValueError(msg)
+        self._paths = list(paths)
+        self._speed = speed
+        self._default_subreddit = default_subreddit
+        self._sleep = sleep
+        self.items_replayed = 0
+        self.elapsed_seconds = 0.0
+
+    async def stream_comments(self) -> AsyncIterator[RedditItem]:
+        started = time.monotonic()
+        first_ts: float | None = None
+        for comment in self._iter_comments():
+            if self._speed:
+                created = float(comment.get("created_utc", 0))
+                if first_ts is None:
+                    first_ts = created
+                delay = (created - first_ts) / self._speed - (time.monotonic() - started)
+                if delay > 0:
+                    await self._sleep(delay)
+            self.items_replayed += 1
+            yield record_from_json(comment).to_item(self._default_subreddit)
+        self.elapsed_seconds = time.monotonic() - started
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items_replayed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def mark_done(self, ids: Iterable[str]) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    def _iter_comments(self) -> Iterator[Mapping[str, Any]]:
+        for path in self._paths:
+            base = path.with_suffix("") if path.suffix == ".gz" else path
+            if base.suffix == ".json":
+                yield from self._unpack(loads(self._read_all(path)))
+                continue
+            for line in self._iter_lines(path):
+                if line.strip():
+                    yield from self._unpack(loads(line))
+
+    @staticmethod
+    def _unpack(document: Mapping[str, Any]) -> Iterator[Mapping[str, Any]]:
+        children = document.get("data", {}).get("children") if "data" in document else None
+        if children is not None:
+            for child in reversed(children):
+                yield child.get("data", {})
+        elif "data" in document:
+            yield document["data"]
+        else:
+            yield document
+
+    @staticmethod
+    def _read_all(path: Path) -> bytes:
+        if path.suffix == ".gz":
+            with gzip.open(path, "rb") as handle:
+                return handle.read()
+        return path.read_bytes()
+
+    @staticmethod
+    def _iter_lines(path: Path) -> Iterator[bytes]:
+        if path.suffix == ".gz":
+            with gzip.open(path, "rb") as handle:
+                yield from handle
+            return
+        if path.stat().st_size == 0:
+            return
+        with (
+            path.open("rb") as handle,
+            mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            yield from iter(mapped.readline, b"")
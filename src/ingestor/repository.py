@@ -1,12 +1,46 @@
 """Persistence layer for Reddit items and mention events."""
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping, Sequence
+from contextlib import AbstractAsyncContextManager
 from datetime import datetime
-from typing import Protocol, Sequence
+from typing import Any, Protocol
 
-from common.models import MentionEvent, RedditItem
+from common.models import Mention, RedditItem, as_event
 from price.service import PriceService
 
+ItemWithMentions = tuple[RedditItem, Sequence[Mention]]
+
+_REDDIT_ITEM_COLUMNS = (
+    "id",
+    "kind",
+    "parent_id",
+    "link_id",
+    "author",
+    "body",
+    "created_utc",
+    "score",
+    "permalink",
+)
+_MENTION_COLUMNS = (
+    "ts_utc",
+    "subreddit",
+    "reddit_id",
+    "author",
+    "ticker",
+    "confidence",
+    "upvotes",
+    "span_text",
+    "price_at_mention",
+    "sentiment_label",
+    "sentiment_score",
+    "sentiment_conf",
+    "has_options_intent",
+    "option_side",
+    "universe_version",
+    "thread_id",
+)
+
 
 class DatabaseClient(Protocol):
     async def execute(self, query: str, *args) -> object:  # pragma: no cover - interface
@@ -18,13 +52,31 @@ class DatabaseClient(Protocol):
     async def fetch(self, query: str, *args) -> list[dict]:  # pragma: no cover - interface
         ...
 
+    def transaction(self) -> AbstractAsyncContextManager[Any]:  # pragma: no cover - interface
+        ...
+
 
 class MentionWriter:
     """Publishes mention events into durable storage."""
 
-    async def persist(self, item: RedditItem, mentions: Sequence[MentionEvent]) -> int:  # pragma: no cover - interface
+    async def persist(  # pragma: no cover - interface
+        self, item: RedditItem, mentions: Sequence[Mention]
+    ) -> int:
         raise NotImplementedError
 
+    async def persist_batch(self, batch: Sequence[ItemWithMentions]) -> int:
+        """Persist many items at once; writers without a bulk path fall back to `persist`."""
+
+        count = 0
+        for item, mentions in batch:
+            count += await self.persist(item, mentions)
+        return count
+
+    async def ping(self) -> None:
+        """Raise if storage is unreachable; writers without a cheap probe write an empty batch."""
+
+        await self.persist_batch([])
+
 
 class MentionRepository(MentionWriter):
     """Stores Reddit metadata and mention events in Postgres."""
@@ -33,12 +85,129 @@ class MentionRepository(MentionWriter):
         self._db = db
         self._price_service = price_service
 
-    async def persist(self, item: RedditItem, mentions: Sequence[MentionEvent]) -> int:
+    async def persist(self, item: RedditItem, mentions: Sequence[Mention]) -> int:
         await self._upsert_reddit_item(item)
         if mentions:
             await self._insert_mentions(mentions)
         return len(mentions)
 
+    async def persist_batch(self, batch: Sequence[ItemWithMentions]) -> int:
+        """Upsert a batch of items and mentions in one transaction via COPY into staging tables.
+
+        Rows are de-duplicated by primary/unique key first (last write wins) because a single
+        `INSERT ... ON CONFLICT DO UPDATE` cannot touch the same row twice.
+        """
+
+        items: dict[str, RedditItem] = {}
+        mentions: dict[tuple[str, str], Mention] = {}
+        for item, item_mentions in batch:
+            items[item.id] = item
+            for mention in item_mentions:
+                mentions[(mention.reddit_id, mention.ticker)] = mention
+        if not items:
+            return 0
+        await self._stamp_prices(mentions.values())
+        mention_rows = [self._mention_row(mention) for mention in mentions.values()]
+
+        async with self._db.transaction() as conn:
+            await conn.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS _stage_reddit_items
+                ON COMMIT DELETE ROWS AS
+                SELECT id, kind, parent_id, link_id, author, body, created_utc, score, permalink
+                FROM reddit_items WITH NO DATA
+                """
+            )
+            await conn.copy_records_to_table(
+                "_stage_reddit_items",
+                records=[self._item_row(item) for item in items.values()],
+                columns=_REDDIT_ITEM_COLUMNS,
+            )
+            await conn.execute(
+                """
+                INSERT INTO reddit_items (
+                    id, kind, parent_id, link_id, author, body, created_utc, score, permalink
+                )
+                SELECT id, kind, parent_id, link_id, author, body, created_utc, score, permalink
+                FROM _stage_reddit_items
+                ON CONFLICT (id) DO UPDATE
+                  SET score = EXCLUDED.score,
+                      body = EXCLUDED.body,
+                      author = EXCLUDED.author
+                """
+            )
+            if mentions:
+                await conn.execute(
+                    """
+                    CREATE TEMP TABLE IF NOT EXISTS _stage_mention_events
+                    ON COMMIT DELETE ROWS AS
+                    SELECT ts_utc, subreddit, reddit_id, author, ticker, confidence, upvotes,
+                           span_text, price_at_mention, sentiment_label, sentiment_score,
+                           sentiment_conf, has_options_intent, option_side, universe_version,
+                           thread_id
+                    FROM mention_events WITH NO DATA
+                    """
+                )
+                await conn.copy_records_to_table(
+                    "_stage_mention_events",
+                    records=mention_rows,
+                    columns=_MENTION_COLUMNS,
+                )
+                await conn.execute(
+                    """
+                    INSERT INTO mention_events (
+                        ts_utc, subreddit, reddit_id, author, ticker, confidence, upvotes,
+                        span_text, price_at_mention, sentiment_label, sentiment_score,
+                        sentiment_conf, has_options_intent, option_side, universe_version,
+                        thread_id
+                    )
+                    SELECT ts_utc, subreddit, reddit_id, author, ticker, confidence, upvotes,
+                           span_text, price_at_mention, sentiment_label, sentiment_score,
+                           sentiment_conf, has_options_intent, option_side, universe_version,
+                           thread_id
+                    FROM _stage_mention_events
+                    ON CONFLICT (reddit_id, ticker) DO UPDATE SET
+                        sentiment_label = EXCLUDED.sentiment_label,
+                        sentiment_score = EXCLUDED.sentiment_score,
+                        sentiment_conf = EXCLUDED.sentiment_conf,
+                        confidence = EXCLUDED.confidence,
+                        upvotes = EXCLUDED.upvotes,
+                        span_text = EXCLUDED.span_text,
+                        price_at_mention = EXCLUDED.price_at_mention,
+                        has_options_intent = EXCLUDED.has_options_intent,
+                        option_side = EXCLUDED.option_side,
+                        universe_version = EXCLUDED.universe_version,
+                        thread_id = EXCLUDED.thread_id,
+                        updated_at = now()
+                    """
+                )
+        return len(mentions)
+
+    async def ping(self) -> None:
+        await self._db.execute("SELECT 1")
+
+    async def fetch_recent_threads(self, since: datetime) -> list[Mapping[str, Any]]:
+        """Posts persisted since `since`, used to warm the ingestor's thread cache.
+
+        `reddit_items` has no subreddit column; it is read from the `/r/<sub>/` permalink segment.
+        """
+
+        rows = await self._db.fetch(
+            """
+            SELECT id,
+                   link_id,
+                   author,
+                   body,
+                   created_utc,
+                   NULLIF(split_part(split_part(permalink, '/r/', 2), '/', 1), '') AS subreddit
+            FROM reddit_items
+            WHERE kind = 'post' AND created_utc >= $1
+            ORDER BY created_utc ASC
+            """,
+            since,
+        )
+        return list(rows)
+
     async def _upsert_reddit_item(self, item: RedditItem) -> None:
         query = """
         INSERT INTO reddit_items (id, kind, parent_id, link_id, author, body, created_utc, score, permalink)
@@ -48,20 +217,9 @@ class MentionRepository(MentionWriter):
               body = EXCLUDED.body,
               author = EXCLUDED.author
         """
-        await self._db.execute(
-            query,
-            item.id,
-            item.kind,
-            item.parent_id,
-            item.link_id,
-            item.author,
-            item.body,
-            item.created_utc,
-            item.score,
-            item.permalink,
-        )
+        await self._db.execute(query, *self._item_row(item))
 
-    async def _insert_mentions(self, mentions: Sequence[MentionEvent]) -> None:
+    async def _insert_mentions(self, mentions: Sequence[Mention]) -> None:
         query = """
         INSERT INTO mention_events (
             ts_utc,
@@ -77,9 +235,11 @@ class MentionRepository(MentionWriter):
             sentiment_score,
             sentiment_conf,
             has_options_intent,
-            option_side
+            option_side,
+            universe_version,
+            thread_id
         ) VALUES (
-            $1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12,$13,$14
+            $1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12,$13,$14,$15,$16
         )
         ON CONFLICT (reddit_id, ticker) DO UPDATE SET
             sentiment_label = EXCLUDED.sentiment_label,
@@ -90,35 +250,60 @@ class MentionRepository(MentionWriter):
             span_text = EXCLUDED.span_text,
             price_at_mention = EXCLUDED.price_at_mention,
             has_options_intent = EXCLUDED.has_options_intent,
-            option_side = EXCLUDED.option_side
+            option_side = EXCLUDED.option_side,
+            universe_version = EXCLUDED.universe_version,
+            thread_id = EXCLUDED.thread_id,
+            updated_at = now()
         """
+        await self._stamp_prices(mentions)
+        await self._db.executemany(query, [self._mention_row(mention) for mention in mentions])
+
+    async def _stamp_prices(self, mentions: Iterable[Mention]) -> None:
         price_cache: dict[tuple[str, datetime], float | None] = {}
-        rows = []
         for mention in mentions:
             if mention.price_at_mention is None:
                 key = (mention.ticker, self._minute_bucket(mention.ts_utc))
                 if key not in price_cache:
                     price_cache[key] = await self._get_price(*key)
                 mention.price_at_mention = price_cache[key]
-            rows.append(
-                (
-                    mention.ts_utc,
-                    mention.subreddit,
-                    mention.reddit_id,
-                    mention.author,
-                    mention.ticker,
-                    mention.confidence,
-                    mention.upvotes,
-                    mention.span_text,
-                    mention.price_at_mention,
-                    mention.sentiment_label,
-                    mention.sentiment_score,
-                    mention.sentiment_conf,
-                    mention.has_options_intent,
-                    mention.option_side,
-                )
-            )
-        await self._db.executemany(query, rows)
+
+    @staticmethod
+    def _item_row(item: RedditItem) -> tuple[Any, ...]:
+        return (
+            item.id,
+            item.kind,
+            item.parent_id,
+            item.link_id,
+            item.author,
+            item.body,
+            item.created_utc,
+            item.score,
+            item.permalink,
+        )
+
+    @staticmethod
+    def _mention_row(mention: Mention) -> tuple[Any, ...]:
+        """Validate (hot-path records are only checked here) and flatten one mention."""
+
+        event = as_event(mention)
+        return (
+            event.ts_utc,
+            event.subreddit,
+            event.reddit_id,
+            event.author,
+            event.ticker,
+            event.confidence,
+            event.upvotes,
+            event.span_text,
+            event.price_at_mention,
+            event.sentiment_label,
+            event.sentiment_score,
+            event.sentiment_conf,
+            event.has_options_intent,
+            event.option_side,
+            event.universe_version,
+            event.thread_id,
+        )
 
     async def _get_price(self, ticker: str, ts: datetime) -> float | None:
         price_row = await self._db.fetch(
@@ -2,18 +2,106 @@
 from __future__ import annotations
 
 import asyncio
-from typing import AsyncIterator
+import time
+from collections.abc import AsyncIterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 
 from common.config import RedditSettings, get_settings
-from common.models import RedditItem
+from common.metrics import LatencyWindow
+from common.models import Mention, RedditItem
+from ingestor.neardup import NearDuplicateDetector
 from ingestor.reddit_client import RedditClient
 from ingestor.repository import MentionWriter
+from ingestor.threads import ThreadCache, ThreadInfo
 from nlp.pipeline import MentionExtractor, SentimentAnnotator
 
 
+@dataclass
+class PipelineStats:
+    """Per-stage latency windows for the fetch -> extract -> write pipeline."""
+
+    fetch_queue: asyncio.Queue | None = None
+    write_queue: asyncio.Queue | None = None
+    extract: LatencyWindow = field(default_factory=LatencyWindow)
+    write: LatencyWindow = field(default_factory=LatencyWindow)
+    fetch_wait: LatencyWindow = field(default_factory=LatencyWindow)
+    write_wait: LatencyWindow = field(default_factory=LatencyWindow)
+    ingest_to_persist: LatencyWindow = field(default_factory=LatencyWindow)
+    items_persisted: int = 0
+    mentions_persisted: int = 0
+    items_suppressed: int = 0
+
+    def snapshot(self) -> dict[str, float]:
+        """Flatten queue depths and p95 latencies (seconds) for logging."""
+
+        return {
+            "fetch_queue_depth": self.fetch_queue.qsize() if self.fetch_queue else 0,
+            "write_queue_depth": self.write_queue.qsize() if self.write_queue else 0,
+            "fetch_wait_p95": self.fetch_wait.p95,
+            "extract_p95": self.extract.p95,
+            "write_wait_p95": self.write_wait.p95,
+            "write_batch_p95": self.write.p95,
+            "ingest_to_persist_p95": self.ingest_to_persist.p95,
+            "items_persisted": self.items_persisted,
+            "mentions_persisted": self.mentions_persisted,
+            "items_suppressed": self.items_suppressed,
+        }
+
+
+_worker_extractor: MentionExtractor | None = None
+_worker_annotator: SentimentAnnotator | None = None
+
+
+def _init_worker(extractor: MentionExtractor, annotator: SentimentAnnotator) -> None:
+    """Process-pool initializer: keep one pre-built extractor/annotator per worker process."""
+
+    global _worker_extractor, _worker_annotator
+    _worker_extractor = extractor
+    _worker_annotator = annotator
+
+
+def _analyze_batch(items: Sequence[RedditItem]) -> list[Sequence[Mention]]:
+    assert _worker_extractor is not None and _worker_annotator is not None
+    return [
+        _worker_annotator.annotate(list(extraction.mentions), extraction.token_spans)
+        for extraction in _worker_extractor.extract_batch(items)
+    ]
+
+
+def _attribute(mentions: Sequence[Mention], thread: ThreadInfo | None) -> Sequence[Mention]:
+    """Point every mention at the thread the cache resolved for its item."""
+
+    if thread is not None:
+        for mention in mentions:
+            mention.thread_id = thread.link_id
+    return mentions
+
+
+@dataclass
+class _Pending:
+    item: RedditItem
+    fetched_at: float
+    thread: ThreadInfo | None = None
+    mentions: Sequence[Mention] = ()
+    queued_at: float = 0.0
+
 
 class RedditStreamIngestor:
-    """Polls Reddit, runs extraction/sentiment, and publishes mention events."""
+    """Polls Reddit, runs extraction/sentiment, and publishes mention events.
+
+    `run` decouples the stages with bounded queues: one fetcher feeds `extract_workers`
+    extraction tasks, which feed a single writer that flushes in batches of `batch_size`
+    or every `flush_interval` seconds. A full queue blocks the upstream stage (backpressure)
+    instead of buffering without bound.
+
+    With `process_workers > 0`, extraction tasks ship batches of up to `extract_batch_size`
+    items to a process pool whose workers each hold a copy of the extractor and annotator,
+    so regex/token work runs on other cores instead of the event loop thread.
+
+    An optional `near_dups` detector runs in the fetch stage, ahead of extraction, so
+    copypasta never reaches the extractor or inflates mention counts.
+    """
 
     def __init__(
         self,
@@ -22,28 +110,179 @@ class RedditStreamIngestor:
         writer: MentionWriter,
         reddit_client: RedditClient | None = None,
         settings: RedditSettings | None = None,
+        extract_workers: int = 2,
+        queue_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        process_workers: int = 0,
+        extract_batch_size: int = 32,
+        thread_cache: ThreadCache | None = None,
+        near_dups: NearDuplicateDetector | None = None,
     ) -> None:
         self._settings = settings or get_settings().reddit
         self._extractor = extractor
         self._annotator = annotator
         self._writer = writer
         self._client = reddit_client or RedditClient(self._settings)
+        self._extract_workers = max(1, extract_workers)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._process_workers = max(0, process_workers)
+        self._extract_batch_size = max(1, extract_batch_size)
+        self._pool: ProcessPoolExecutor | None = None
+        self.threads = thread_cache or ThreadCache()
+        self.near_dups = near_dups
+        self._fetch_queue: asyncio.Queue[_Pending] = asyncio.Queue(maxsize=queue_size)
+        self._write_queue: asyncio.Queue[_Pending] = asyncio.Queue(maxsize=queue_size)
+        self.stats = PipelineStats(fetch_queue=self._fetch_queue, write_queue=self._write_queue)
 
     async def fetch_items(self) -> AsyncIterator[RedditItem]:
         async for item in self._client.stream_comments():
             yield item
 
-    async def run(self) -> None:
-        """Continuously read Reddit and push into message queue."""
+    async def run(self, once: bool = False) -> None:
+        """Continuously read Reddit and push mentions through the staged pipeline.
 
-        while True:
-            async for item in self.fetch_items():
-                await self.handle_item(item)
-            await asyncio.sleep(self._settings.poll_interval_seconds)
+        With `once`, stop after a single pass over the client stream (e.g. a replay dump)
+        once every queued item has been written.
+        """
+
+        extract_workers = self._extract_workers
+        if self._process_workers:
+            self._pool = self._new_pool()
+            # One in-flight batch per process keeps every core busy.
+            extract_workers = max(extract_workers, self._process_workers)
+
+        fetcher = asyncio.create_task(self._fetch_stage(once))
+        tasks = [fetcher]
+        tasks.extend(asyncio.create_task(self._extract_stage()) for _ in range(extract_workers))
+        tasks.append(asyncio.create_task(self._write_stage()))
+        try:
+            if once:
+                await fetcher
+                drained = asyncio.create_task(self._drain())
+                tasks.append(drained)
+                # A failing stage would leave the queues undrained, so surface it instead.
+                done, _ = await asyncio.wait(tasks[1:], return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            else:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def recycle_pool(self, *_: object) -> None:
+        """Start fresh process workers from the current extractor (e.g. after a universe swap).
+
+        Batches already running in the old pool finish there; new batches go to the new one.
+        """
+
+        if self._pool is None:
+            return
+        old, self._pool = self._pool, self._new_pool()
+        old.shutdown(wait=False)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self._process_workers,
+            initializer=_init_worker,
+            initargs=(self._extractor, self._annotator),
+        )
 
     async def handle_item(self, item: RedditItem) -> int:
         """Run NLP over a Reddit item and publish resulting mentions."""
 
+        thread = self.threads.observe(item)
+        return await self._writer.persist(item, _attribute(self._analyze(item), thread))
+
+    def _analyze(self, item: RedditItem) -> Sequence[Mention]:
         extraction = self._extractor.extract(item)
-        annotated = self._annotator.annotate(list(extraction.mentions))
-        return await self._writer.persist(item, annotated)
+        return self._annotator.annotate(list(extraction.mentions), extraction.token_spans)
+
+    async def _fetch_stage(self, once: bool = False) -> None:
+        while True:
+            async for item in self.fetch_items():
+                thread = self.threads.observe(item)
+                fetched_at = time.monotonic()
+                if self.near_dups is not None and self.near_dups.is_duplicate(item):
+                    self.stats.items_suppressed += 1
+                    if self.near_dups.action == "mark":
+                        # Keep the raw item but skip extraction, so it adds no mentions.
+                        pending = _Pending(item, fetched_at, thread, queued_at=fetched_at)
+                        await self._write_queue.put(pending)
+                    else:
+                        self._client.mark_done([item.id])
+                    continue
+                await self._fetch_queue.put(_Pending(item, fetched_at, thread))
+            if once:
+                return
+            await asyncio.sleep(self._settings.poll_interval_seconds)
+
+    async def _drain(self) -> None:
+        await self._fetch_queue.join()
+        await self._write_queue.join()
+
+    async def _extract_stage(self) -> None:
+        while True:
+            batch = [await self._fetch_queue.get()]
+            if self._pool is not None:
+                while len(batch) < self._extract_batch_size and not self._fetch_queue.empty():
+                    batch.append(self._fetch_queue.get_nowait())
+            started = time.monotonic()
+            for pending in batch:
+                self.stats.fetch_wait.observe(started - pending.fetched_at)
+            try:
+                if self._pool is not None:
+                    loop = asyncio.get_running_loop()
+                    results = await loop.run_in_executor(
+                        self._pool, _analyze_batch, [pending.item for pending in batch]
+                    )
+                else:
+                    results = [self._analyze(pending.item) for pending in batch]
+            finally:
+                for _ in batch:
+                    self._fetch_queue.task_done()
+            queued_at = time.monotonic()
+            for pending, mentions in zip(batch, results, strict=True):
+                pending.mentions = _attribute(mentions, pending.thread)
+                pending.queued_at = queued_at
+                self.stats.extract.observe((queued_at - started) / len(batch))
+                await self._write_queue.put(pending)
+
+    async def _write_stage(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._write_queue.get()]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._write_queue.get(), timeout))
+                except TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    async def _flush(self, batch: Sequence[_Pending]) -> None:
+        started = time.monotonic()
+        for pending in batch:
+            self.stats.write_wait.observe(started - pending.queued_at)
+        self.stats.mentions_persisted += await self._writer.persist_batch(
+            [(pending.item, pending.mentions) for pending in batch]
+        )
+        self._client.mark_done([pending.item.id for pending in batch])
+        finished = time.monotonic()
+        self.stats.write.observe(finished - started)
+        self.stats.items_persisted += len(batch)
+        for pending in batch:
+            self.stats.ingest_to_persist.observe(finished - pending.fetched_at)
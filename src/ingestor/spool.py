@@ -0,0 +1,278 @@
+"""Durable on-disk spool and dead-letter queue for mention writes."""
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from common.models import Mention, MentionEvent, RedditItem, as_event
+from ingestor.repository import ItemWithMentions, MentionWriter
+
+
+@dataclass
+class SpoolRecord:
+    item: RedditItem
+    mentions: Sequence[Mention]
+    attempts: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "item": self.item.model_dump(mode="json"),
+                "mentions": [
+                    as_event(mention).model_dump(mode="json") for mention in self.mentions
+                ],
+                "attempts": self.attempts,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> SpoolRecord:
+        payload = json.loads(line)
+        return cls(
+            item=RedditItem.model_validate(payload["item"]),
+            mentions=[MentionEvent.model_validate(mention) for mention in payload["mentions"]],
+            attempts=payload.get("attempts", 0),
+        )
+
+
+def _write_synced(handle: IO[str], records: Sequence[SpoolRecord]) -> None:
+    """Write `records` as NDJSON and fsync, so they survive a crash once this returns."""
+
+    for record in records:
+        handle.write(record.to_json())
+        handle.write("\n")
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+class DiskSpool:
+    """Append-only NDJSON spool split into size-rotated segment files.
+
+    Segments are named `spool-<seq>.ndjson`; the highest sequence is the active one. Readers
+    `seal` the active segment first so new appends never race a replay in progress.
+    """
+
+    def __init__(self, directory: Path, segment_max_bytes: int = 8 * 1024 * 1024) -> None:
+        self._dir = directory
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._segment_max_bytes = segment_max_bytes
+        existing = self.segments()
+        self._seq = int(existing[-1].stem.split("-")[1]) if existing else 0
+        self.depth = sum(self._count_lines(path) for path in existing)
+
+    def segments(self) -> list[Path]:
+        return sorted(self._dir.glob("spool-*.ndjson"))
+
+    def append(self, records: Sequence[SpoolRecord]) -> None:
+        if not records:
+            return
+        path = self._active_path()
+        if path.exists() and path.stat().st_size >= self._segment_max_bytes:
+            self.seal()
+            path = self._active_path()
+        with path.open("a", encoding="utf-8") as handle:
+            _write_synced(handle, records)
+        self.depth += len(records)
+
+    def seal(self) -> None:
+        """Start a new active segment; everything before it is safe to replay."""
+
+        self._seq += 1
+
+    def read(self, path: Path) -> Iterator[SpoolRecord]:
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield SpoolRecord.from_json(line)
+
+    def rewrite(self, path: Path, records: Sequence[SpoolRecord]) -> None:
+        """Replace a segment with the records that still need replaying (atomically)."""
+
+        removed = self._count_lines(path)
+        if records:
+            tmp_path = path.with_suffix(".tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                _write_synced(handle, records)
+            os.replace(tmp_path, path)
+        else:
+            path.unlink()
+        self.depth -= removed - len(records)
+
+    def _active_path(self) -> Path:
+        return self._dir / f"spool-{self._seq:012d}.ndjson"
+
+    @staticmethod
+    def _count_lines(path: Path) -> int:
+        with path.open("rb") as handle:
+            return sum(1 for line in handle if line.strip())
+
+
+@dataclass
+class SpoolStats:
+    spooled: int = 0
+    replayed: int = 0
+    dead_lettered: int = 0
+    last_replay_rate: float = 0.0
+
+
+class SpoolingMentionWriter(MentionWriter):
+    """Wraps a writer so failed batches land in a local spool instead of being lost.
+
+    While the spool holds data, new batches are appended behind it until `retry_interval`
+    has passed since the last failure. The next write then replays the spool first, in chunks
+    of `replay_batch_size`, and is itself spooled behind whatever is left, so an older spooled
+    row never overwrites a newer one through `ON CONFLICT DO UPDATE`. A chunk that fails is
+    retried record by record. Failures only count towards `max_attempts` (after which a record
+    is treated as poison and moved to the dead-letter file) while the inner writer still
+    answers `ping`; otherwise the database is presumed down and replay stops untouched.
+    """
+
+    def __init__(
+        self,
+        inner: MentionWriter,
+        spool: DiskSpool,
+        dlq_path: Path,
+        retry_interval: float = 5.0,
+        replay_batch_size: int = 500,
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._inner = inner
+        self._spool = spool
+        self._dlq_path = dlq_path
+        self._retry_interval = retry_interval
+        self._replay_batch_size = replay_batch_size
+        self._max_attempts = max_attempts
+        self._clock = clock
+        self._last_failure: float | None = None
+        self.stats = SpoolStats()
+
+    @property
+    def spool_depth(self) -> int:
+        return self._spool.depth
+
+    async def persist(self, item: RedditItem, mentions: Sequence[Mention]) -> int:
+        return await self.persist_batch([(item, mentions)])
+
+    async def persist_batch(self, batch: Sequence[ItemWithMentions]) -> int:
+        if self._backing_off():
+            self._spool_batch(batch)
+            return 0
+        if self._spool.depth:
+            await self.replay()
+            if self._spool.depth:
+                self._spool_batch(batch)
+                return 0
+        try:
+            count = await self._inner.persist_batch(batch)
+        except Exception as e:
+            print(f"Spooling {len(batch)} items after write failure: {e}")
+            self._last_failure = self._clock()
+            self._spool_batch(batch)
+            return 0
+        return count
+
+    async def replay(self) -> int:
+        """Replay sealed spool segments oldest first; stop at the first sign the DB is down."""
+
+        started = self._clock()
+        replayed = 0
+        self._spool.seal()
+        for path in self._spool.segments():
+            records = list(self._spool.read(path))
+            kept: list[SpoolRecord] = []
+            for offset in range(0, len(records), self._replay_batch_size):
+                chunk = records[offset : offset + self._replay_batch_size]
+                ok, failed, down = await self._replay_chunk(chunk)
+                replayed += ok
+                if down:
+                    self._spool.rewrite(path, kept + failed + records[offset + len(chunk) :])
+                    self._last_failure = self._clock()
+                    self._record_rate(replayed, started)
+                    return replayed
+                kept.extend(failed)
+            self._spool.rewrite(path, kept)
+        self._last_failure = None
+        self._record_rate(replayed, started)
+        return replayed
+
+    async def _replay_chunk(
+        self, chunk: Sequence[SpoolRecord]
+    ) -> tuple[int, list[SpoolRecord], bool]:
+        """Return (records written, records to keep spooled, database down).
+
+        Attempts are only charged, and poison records dead-lettered, once `ping` confirms the
+        failures were per-record errors rather than an outage.
+        """
+
+        try:
+            await self._inner.persist_batch([(record.item, record.mentions) for record in chunk])
+            return len(chunk), [], False
+        except Exception as e:
+            print(f"Replaying {len(chunk)} spooled items failed, retrying one by one: {e}")
+        if not await self._reachable():
+            return 0, list(chunk), True
+
+        ok = 0
+        failed: list[SpoolRecord] = []
+        for record in chunk:
+            try:
+                await self._inner.persist_batch([(record.item, record.mentions)])
+                ok += 1
+            except Exception:
+                failed.append(record)
+        if failed and not await self._reachable():
+            return ok, failed, True
+
+        kept: list[SpoolRecord] = []
+        poison: list[SpoolRecord] = []
+        for record in failed:
+            record.attempts += 1
+            (poison if record.attempts >= self._max_attempts else kept).append(record)
+        self._dead_letter(poison)
+        return ok, kept, False
+
+    async def _reachable(self) -> bool:
+        try:
+            await self._inner.ping()
+        except Exception:
+            return False
+        return True
+
+    def _dead_letter(self, records: Sequence[SpoolRecord]) -> None:
+        if not records:
+            return
+        self._dlq_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._dlq_path.open("a", encoding="utf-8") as handle:
+            _write_synced(handle, records)
+        self.stats.dead_lettered += len(records)
+
+    def _spool_batch(self, batch: Sequence[ItemWithMentions]) -> None:
+        self._spool.append(
+            [SpoolRecord(item=item, mentions=list(mentions)) for item, mentions in batch]
+        )
+        self.stats.spooled += len(batch)
+
+    def _backing_off(self) -> bool:
+        if self._last_failure is None:
+            return False
+        return self._clock() - self._last_failure < self._retry_interval
+
+    def _record_rate(self, replayed: int, started: float) -> None:
+        self.stats.replayed += replayed
+        elapsed = self._clock() - started
+        self.stats.last_replay_rate = replayed / elapsed if elapsed > 0 else float(replayed)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "spool_depth": self._spool.depth,
+            "spooled": self.stats.spooled,
+            "replayed": self.stats.replayed,
+            "dead_lettered": self.stats.dead_lettered,
+            "replay_rate": self.stats.last_replay_rate,
+        }
@@ -0,0 +1,127 @@
+"""In-memory thread metadata cache keyed by link_id."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from common.models import RedditItem
+
+_DD_FLAIRS = {"dd", "due diligence"}
+
+
+@dataclass
+class ThreadInfo:
+    """What we know about a submission that comments attach to."""
+
+    link_id: str
+    subreddit: str
+    author: str | None = None
+    title: str | None = None
+    flair: str | None = None
+    created_utc: datetime | None = None
+    comments_seen: int = 0
+
+    @property
+    def is_dd(self) -> bool:
+        if self.flair and self.flair.strip().lower() in _DD_FLAIRS:
+            return True
+        return bool(self.title) and self.title.lstrip().upper().startswith(("DD", "[DD]", "(DD)"))
+
+
+class ThreadCache:
+    """LRU of ThreadInfo so comments resolve their thread without a DB lookup each.
+
+    Submissions populate the cache as they are polled; on startup `warm` reloads recent
+    `reddit_items` posts. The ingestor takes each mention's `thread_id` from the entry
+    `observe` returns. A comment whose thread is unknown creates a stub entry so later
+    comments in the same thread hit.
+    """
+
+    def __init__(self, capacity: int = 50_000) -> None:
+        self._capacity = capacity
+        self._threads: OrderedDict[str, ThreadInfo] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.dd_posts = 0
+
+    def __len__(self) -> int:
+        return len(self._threads)
+
+    def get(self, link_id: str) -> ThreadInfo | None:
+        info = self._threads.get(link_id)
+        if info is not None:
+            self._threads.move_to_end(link_id)
+        return info
+
+    def observe(self, item: RedditItem) -> ThreadInfo | None:
+        """Record a post, or attribute a comment to its (cached) thread."""
+
+        if item.kind == "post":
+            link_id = item.link_id or item.id
+            info = self._threads.get(link_id)
+            if info is None:
+                info = ThreadInfo(link_id=link_id, subreddit=item.subreddit)
+                self._put(link_id, info)
+            info.author = item.author
+            info.title = item.title
+            info.flair = item.flair
+            info.created_utc = item.created_utc
+            if info.is_dd:
+                self.dd_posts += 1
+            return info
+
+        # Top-level comments in dumps without `link_id` still name the thread as their parent.
+        link_id = item.link_id
+        if not link_id and item.parent_id and item.parent_id.startswith("t3_"):
+            link_id = item.parent_id
+        if not link_id:
+            return None
+        info = self.get(link_id)
+        if info is None:
+            self.misses += 1
+            info = ThreadInfo(link_id=link_id, subreddit=item.subreddit)
+            self._put(link_id, info)
+        else:
+            self.hits += 1
+        info.comments_seen += 1
+        return info
+
+    def warm(self, rows: Iterable[Mapping[str, Any]]) -> int:
+        """Load `fetch_recent_threads` rows (id, link_id, author, body, created_utc, subreddit)."""
+
+        count = 0
+        for row in rows:
+            link_id = row.get("link_id") or row["id"]
+            body = row.get("body") or ""
+            self._put(
+                link_id,
+                ThreadInfo(
+                    link_id=link_id,
+                    subreddit=row.get("subreddit") or "",
+                    author=row.get("author"),
+                    title=body.split("\n", 1)[0],
+                    created_utc=row.get("created_utc"),
+                ),
+            )
+            count += 1
+        return count
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "threads_cached": len(self._threads),
+            "thread_hits": self.hits,
+            "thread_misses": self.misses,
+            "thread_evictions": self.evictions,
+            "dd_posts": self.dd_posts,
+        }
+
+    def _put(self, link_id: str, info: ThreadInfo) -> None:
+        self._threads[link_id] = info
+        self._threads.move_to_end(link_id)
+        while len(self._threads) > self._capacity:
+            self._threads.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,156 @@
+"""Hot-reloadable ticker universe: watch a source, recompile the matcher, swap it in."""
+from __future__ import annotations
+
+import asyncio
+import csv
+import hashlib
+import os
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from ingestor.repository import DatabaseClient
+from nlp.matcher import TickerMatcher
+from nlp.pipeline import MentionExtractor
+
+
+@dataclass(frozen=True)
+class UniverseSnapshot:
+    """Symbols plus alias -> symbol map, as loaded from a source."""
+
+    tickers: frozenset[str]
+    aliases: Mapping[str, str] = field(default_factory=dict)
+
+    def fingerprint(self) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for ticker in sorted(self.tickers):
+            digest.update(ticker.encode())
+            digest.update(b"\0")
+        digest.update(b"\1")
+        for alias, symbol in sorted(self.aliases.items()):
+            digest.update(f"{alias}\0{symbol}\0".encode())
+        return digest.hexdigest()
+
+
+class UniverseSource(Protocol):
+    async def load(self) -> UniverseSnapshot:  # pragma: no cover - interface
+        ...
+
+
+class CsvUniverseSource:
+    """`data/tickers.csv` style file; an optional `aliases` column holds `|`-separated names.
+
+    The file is only re-parsed when its mtime or size changes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._stat: tuple[int, int] | None = None
+        self._snapshot: UniverseSnapshot | None = None
+
+    async def load(self) -> UniverseSnapshot:
+        stat = os.stat(self._path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._snapshot is None or key != self._stat:
+            self._snapshot = await asyncio.to_thread(self._read)
+            self._stat = key
+        return self._snapshot
+
+    def _read(self) -> UniverseSnapshot:
+        tickers: set[str] = set()
+        aliases: dict[str, str] = {}
+        with self._path.open("r", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                symbol = (row.get("symbol") or "").strip().upper()
+                if not symbol:
+                    continue
+                tickers.add(symbol)
+                for alias in (row.get("aliases") or "").split("|"):
+                    if alias.strip():
+                        aliases[alias.strip().lower()] = symbol
+        return UniverseSnapshot(frozenset(tickers), aliases)
+
+
+class TickerMasterSource:
+    """Active symbols from `ticker_master`, plus an optional static alias map."""
+
+    def __init__(self, db: DatabaseClient, aliases: Mapping[str, str] | None = None) -> None:
+        self._db = db
+        self._aliases = dict(aliases or {})
+
+    async def load(self) -> UniverseSnapshot:
+        rows = await self._db.fetch("SELECT symbol FROM ticker_master WHERE is_active")
+        return UniverseSnapshot(frozenset(row["symbol"].upper() for row in rows), self._aliases)
+
+
+class UniverseManager:
+    """Polls a `UniverseSource` and swaps a recompiled matcher into the extractor.
+
+    Compilation runs in a worker thread so the event loop keeps extracting with the old
+    matcher; the swap is a single attribute assignment between items. Versions are epoch
+    seconds of the build (strictly increasing), so they stay meaningful across restarts
+    and every mention records the universe that matched it.
+    """
+
+    def __init__(
+        self,
+        source: UniverseSource,
+        extractor: MentionExtractor,
+        poll_interval: float = 30.0,
+        on_swap: Callable[[int], Any] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._source = source
+        self._extractor = extractor
+        self._poll_interval = poll_interval
+        self._on_swap = on_swap
+        self._clock = clock
+        self._fingerprint: str | None = None
+        self.version = 0
+        self.rebuilds = 0
+        self.symbols = 0
+        self.aliases = 0
+        self.last_rebuild_seconds = 0.0
+
+    async def refresh(self) -> bool:
+        """Reload the source; recompile and swap if it changed. Returns True on a swap."""
+
+        snapshot = await self._source.load()
+        fingerprint = snapshot.fingerprint()
+        if fingerprint == self._fingerprint:
+            return False
+        started = time.perf_counter()
+        matcher = await asyncio.to_thread(TickerMatcher, snapshot.tickers, snapshot.aliases)
+        self.last_rebuild_seconds = time.perf_counter() - started
+        self.version = max(self.version + 1, int(self._clock()))
+        self._extractor.swap_matcher(matcher, self.version)
+        self._fingerprint = fingerprint
+        self.rebuilds += 1
+        self.symbols = len(matcher.tickers)
+        self.aliases = matcher.alias_count
+        print(
+            f"Ticker universe v{self.version}: {self.symbols} symbols, {self.aliases} aliases "
+            f"(compiled in {self.last_rebuild_seconds * 1000:.0f} ms)"
+        )
+        if self._on_swap is not None:
+            self._on_swap(self.version)
+        return True
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Ticker universe reload failed, keeping v{self.version}: {e}")
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "universe_version": self.version,
+            "universe_symbols": self.symbols,
+            "universe_aliases": self.aliases,
+            "universe_rebuilds": self.rebuilds,
+            "universe_rebuild_seconds": self.last_rebuild_seconds,
+        }
@@ -0,0 +1,76 @@
+"""Bounded memo cache for per-span sentiment results."""
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+# Rough per-entry cost on top of the key string: OrderedDict slot + link node + value tuple.
+_ENTRY_OVERHEAD = 160
+
+
+def span_key(tokens: Sequence[str]) -> str:
+    """Normalised span: its lower-cased tokens joined by single spaces.
+
+    Emoji, punctuation and repeated whitespace are already dropped by tokenization, so
+    copypasta variants that score identically share one key.
+    """
+
+    return " ".join(tokens)
+
+
+class SpanCache(Generic[V]):
+    """LRU keyed by the normalised span text, bounded by entry count and approximate bytes.
+
+    Keys are the span strings themselves (the dict stores their hash), so a hit can never
+    return another span's result.
+    """
+
+    def __init__(self, max_entries: int = 100_000, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[V, int]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: str, value: V) -> None:
+        size = sys.getsizeof(key) + _ENTRY_OVERHEAD
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous[1]
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while self._entries and (
+            len(self._entries) > self._max_entries or self.bytes > self._max_bytes
+        ):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def snapshot(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "spans_cached": len(self._entries),
+            "span_cache_bytes": self.bytes,
+            "span_hits": self.hits,
+            "span_misses": self.misses,
+            "span_evictions": self.evictions,
+            "span_hit_rate": self.hits / lookups if lookups else 0.0,
+        }
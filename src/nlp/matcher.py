@@ -0,0 +1,127 @@
+"""Compiled ticker matcher: cashtags, bare symbols and multi-word aliases in one pass."""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Literal
+
+MatchKind = Literal["alias", "cashtag", "symbol"]
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z$][A-Za-z0-9$']*")
+
+
+@dataclass(frozen=True, slots=True)
+class TickerMatch:
+    ticker: str
+    start: int
+    end: int
+    confidence: float
+    kind: MatchKind
+
+
+@dataclass(slots=True)
+class _Node:
+    children: dict[str, _Node] = field(default_factory=dict)
+    alias: str | None = None
+    cashtag: str | None = None
+    symbol: str | None = None
+
+
+def tokenize(text: str) -> tuple[list[str], list[str]]:
+    """Split `text` into tokens plus their lower-cased twins.
+
+    Tokens are ASCII and never contain spaces, so folding them all with one join/lower/split
+    is exact and avoids a `.lower()` call per token.
+    """
+
+    tokens = TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return tokens, []
+    return tokens, " ".join(tokens).lower().split(" ")
+
+
+class TickerMatcher:
+    """Token trie over lower-cased tokens that resolves every ticker form in one pass.
+
+    Root nodes are keyed by the lower-cased token and record what that token can start: a
+    multi-word alias, a `$cashtag`, or a bare symbol (which must also be written in caps).
+    `scan` does one dict probe per token and only walks deeper for alias prefixes; the longest
+    alias wins ("advanced micro devices" over "advanced") and its tokens are consumed.
+    Precedence matches the old token loop: alias, then cashtag, then bare symbol. Stoplist and
+    context rules are left to the caller, which sees `kind == "symbol"`.
+    """
+
+    ALIAS_CONFIDENCE = 0.65
+    CASHTAG_CONFIDENCE = 0.95
+    SYMBOL_CONFIDENCE = 0.75
+
+    def __init__(self, tickers: Iterable[str], alias_map: Mapping[str, str] | None = None) -> None:
+        self._tickers = frozenset(ticker.upper() for ticker in tickers)
+        self._roots: dict[str, _Node] = {}
+        for ticker in self._tickers:
+            lowered = ticker.lower()
+            self._root(f"${lowered}").cashtag = ticker
+            if ticker.isalpha() and len(ticker) <= 5:
+                self._root(lowered).symbol = ticker
+        self.alias_count = 0
+        for alias, symbol in (alias_map or {}).items():
+            symbol = symbol.upper()
+            if symbol not in self._tickers:
+                continue
+            first, *rest = TOKEN_PATTERN.findall(alias.lower()) or [""]
+            if not first:
+                continue
+            node = self._root(first)
+            for part in rest:
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = _Node()
+                node = child
+            node.alias = symbol
+            self.alias_count += 1
+
+    @property
+    def tickers(self) -> frozenset[str]:
+        return self._tickers
+
+    def _root(self, token: str) -> _Node:
+        node = self._roots.get(token)
+        if node is None:
+            node = self._roots[token] = _Node()
+        return node
+
+    def scan(self, tokens: Sequence[str], lowered: Sequence[str]) -> Iterator[TickerMatch]:
+        roots = self._roots
+        if roots.keys().isdisjoint(lowered):
+            return
+        n = len(lowered)
+        resume = 0
+        for idx, node in enumerate(map(roots.get, lowered)):
+            if node is None or idx < resume:
+                continue
+
+            alias_symbol = node.alias
+            children = node.children
+            if children:
+                alias_end = idx + 1
+                cursor = idx + 1
+                while children and cursor < n:
+                    child = children.get(lowered[cursor])
+                    if child is None:
+                        break
+                    cursor += 1
+                    if child.alias is not None:
+                        alias_symbol = child.alias
+                        alias_end = cursor
+                    children = child.children
+                if alias_symbol is not None:
+                    yield TickerMatch(alias_symbol, idx, alias_end, self.ALIAS_CONFIDENCE, "alias")
+                    resume = alias_end
+                    continue
+            if alias_symbol is not None:
+                yield TickerMatch(alias_symbol, idx, idx + 1, self.ALIAS_CONFIDENCE, "alias")
+            elif node.cashtag is not None:
+                yield TickerMatch(node.cashtag, idx, idx + 1, self.CASHTAG_CONFIDENCE, "cashtag")
+            elif node.symbol is not None and tokens[idx] == node.symbol:
+                yield TickerMatch(node.symbol, idx, idx + 1, self.SYMBOL_CONFIDENCE, "symbol")
@@ -2,10 +2,17 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
-from typing import Iterable, Mapping, Sequence
+from itertools import accumulate
+from typing import TYPE_CHECKING
 
-from common.models import MentionEvent, RedditItem
+from common.models import Mention, MentionRecord, RedditItem
+from nlp.cache import SpanCache, span_key
+from nlp.matcher import TOKEN_PATTERN, TickerMatcher, tokenize
+
+if TYPE_CHECKING:
+    from nlp.scoring import SentimentScorer
 
 
 @dataclass
@@ -13,13 +20,15 @@ class ExtractionResult:
     """Container for mentions extracted from a single Reddit item."""
 
     reddit_item: RedditItem
-    mentions: Sequence[MentionEvent]
+    mentions: Sequence[MentionRecord]
+    # Lower-cased span tokens per mention, so the annotator can skip re-tokenizing span_text.
+    token_spans: Sequence[Sequence[str]] = ()
 
 
 class MentionExtractor:
     """Applies regex/alias rules to identify tickers inside reddit text."""
 
-    _TOKEN_PATTERN = re.compile(r"[A-Za-z$][A-Za-z0-9$']*")
+    _TOKEN_PATTERN = TOKEN_PATTERN
 
     def __init__(
         self,
@@ -30,9 +39,10 @@ class MentionExtractor:
         context_window: int = 3,
         span_window: int = 12,
     ) -> None:
-        self._tickers = {ticker.upper() for ticker in tickers}
+        # (matcher, universe version) swap together as one attribute, so a batch item always
+        # sees a consistent pair even while `swap_matcher` runs between items.
+        self._active: tuple[TickerMatcher, int | None] = (TickerMatcher(tickers, alias_map), None)
         self._stoplist = {word.upper() for word in stoplist}
-        self._alias_map = {alias.lower(): symbol.upper() for alias, symbol in (alias_map or {}).items()}
         default_finance = {
             "calls",
             "call",
@@ -55,75 +65,85 @@ class MentionExtractor:
         self._context_window = context_window
         self._span_window = span_window
 
+    @property
+    def matcher(self) -> TickerMatcher:
+        return self._active[0]
+
+    @property
+    def universe_version(self) -> int | None:
+        return self._active[1]
+
+    def swap_matcher(self, matcher: TickerMatcher, version: int | None) -> None:
+        """Install a freshly compiled matcher; items already being extracted keep the old one."""
+
+        self._active = (matcher, version)
+
     def extract(self, item: RedditItem) -> ExtractionResult:
         """Return mention events with placeholder confidence/sentiment."""
 
-        tokens = list(self._TOKEN_PATTERN.findall(item.body))
-        mentions: list[MentionEvent] = []
-        seen: set[str] = set()
+        return self.extract_batch([item])[0]
 
-        for idx, token in enumerate(tokens):
-            alias_symbol = self._alias_map.get(token.lower())
-            if alias_symbol and alias_symbol in self._tickers and alias_symbol not in seen:
-                mentions.append(
-                    self._build_mention(
-                        item=item,
-                        ticker=alias_symbol,
-                        tokens=tokens,
-                        idx=idx,
-                        confidence=0.65,
-                    )
-                )
-                seen.add(alias_symbol)
-                continue
-
-            if not token:
-                continue
-
-            if token.startswith("$"):
-                symbol = token[1:].upper()
-                if self._is_valid_symbol(symbol, seen):
-                    mentions.append(
-                        self._build_mention(
-                            item=item,
-                            ticker=symbol,
-                            tokens=tokens,
-                            idx=idx,
-                            confidence=0.95,
-                        )
-                    )
-                    seen.add(symbol)
-                continue
+    def extract_batch(self, items: Sequence[RedditItem]) -> list[ExtractionResult]:
+        """Extract mentions for many items in one call.
 
-            if token.isalpha() and token.isupper() and 1 <= len(token) <= 5:
-                symbol = token.upper()
-                if not self._is_valid_symbol(symbol, seen):
-                    continue
-                if symbol in self._stoplist and not self._has_finance_context(tokens, idx):
+        Each body is tokenized once. The finance-term prefix sum behind stoplist context checks
+        is only built for items that actually contain a stoplisted symbol.
+        """
+
+        stoplist = self._stoplist
+        results: list[ExtractionResult] = []
+        for item in items:
+            matcher, version = self._active
+            tokens, lowered = tokenize(item.body)
+            mentions: list[MentionRecord] = []
+            token_spans: list[Sequence[str]] = []
+            seen: set[str] = set()
+            finance_index: Sequence[int] | None = None
+
+            for match in matcher.scan(tokens, lowered):
+                symbol = match.ticker
+                if symbol in seen:
                     continue
+                if match.kind == "symbol" and symbol in stoplist:
+                    if finance_index is None:
+                        finance_index = self._finance_index(lowered)
+                    if not self._has_finance_context(finance_index, match.start):
+                        continue
                 mentions.append(
                     self._build_mention(
                         item=item,
                         ticker=symbol,
                         tokens=tokens,
-                        idx=idx,
-                        confidence=0.75,
+                        idx=match.start,
+                        confidence=match.confidence,
+                        universe_version=version,
                     )
                 )
+                start, end = self._span_bounds(match.start, len(tokens))
+                token_spans.append(lowered[start:end])
                 seen.add(symbol)
 
-        return ExtractionResult(reddit_item=item, mentions=mentions)
+            results.append(
+                ExtractionResult(reddit_item=item, mentions=mentions, token_spans=token_spans)
+            )
+        return results
+
+    def _finance_index(self, lowered: Sequence[str]) -> Sequence[int]:
+        """Prefix sums of finance-term hits: tokens [i, j) hold index[j] - index[i] of them.
 
-    def _is_valid_symbol(self, symbol: str, seen: set[str]) -> bool:
-        return symbol in self._tickers and symbol not in seen
+        Empty when the item has no finance terms at all, which is the common case.
+        """
 
-    def _has_finance_context(self, tokens: Sequence[str], idx: int) -> bool:
+        if self._finance_terms.isdisjoint(lowered):
+            return ()
+        return list(accumulate(map(self._finance_terms.__contains__, lowered), initial=0))
+
+    def _has_finance_context(self, finance_index: Sequence[int], idx: int) -> bool:
+        if not finance_index:
+            return False
         start = max(idx - self._context_window, 0)
-        end = min(idx + self._context_window + 1, len(tokens))
-        for neighbor in tokens[start:end]:
-            if neighbor.lower() in self._finance_terms:
-                return True
-        return False
+        end = min(idx + self._context_window + 1, len(finance_index) - 1)
+        return finance_index[end] > finance_index[start]
 
     def _build_mention(
         self,
@@ -132,22 +152,27 @@ class MentionExtractor:
         tokens: Sequence[str],
         idx: int,
         confidence: float,
-    ) -> MentionEvent:
+        universe_version: int | None = None,
+    ) -> MentionRecord:
         span = self._span(tokens, idx)
-        return MentionEvent(
+        return MentionRecord(
             ts_utc=item.created_utc,
             subreddit=item.subreddit,
             reddit_id=item.id,
             author=item.author,
+            thread_id=item.link_id or None,
             ticker=ticker,
             confidence=confidence,
             upvotes=item.score,
             span_text=span,
+            universe_version=universe_version,
         )
 
+    def _span_bounds(self, idx: int, length: int) -> tuple[int, int]:
+        return max(idx - self._span_window, 0), min(idx + self._span_window + 1, length)
+
     def _span(self, tokens: Sequence[str], idx: int) -> str:
-        start = max(idx - self._span_window, 0)
-        end = min(idx + self._span_window + 1, len(tokens))
+        start, end = self._span_bounds(idx, len(tokens))
         return " ".join(tokens[start:end])
 
 
@@ -183,39 +208,126 @@ class SentimentAnnotator:
     _OPTIONS_BULL = {"call", "calls", "long", "c"}
     _OPTIONS_BEAR = {"put", "puts", "short", "p"}
 
-    def __init__(self, neutral_threshold: float = 0.15) -> None:
+    _BULL_SIDE = 1
+    _BEAR_SIDE = 2
+
+    def __init__(
+        self,
+        neutral_threshold: float = 0.15,
+        scorer: SentimentScorer | None = None,
+        cache: SpanCache[tuple[float, int]] | None = None,
+    ) -> None:
         self._neutral_threshold = neutral_threshold
+        self._scorer = scorer
+        self.cache = cache
+        # One lookup per token yields both the lexicon weight and the options side bits.
+        self._lexicon: dict[str, tuple[float, int]] = {}
+        for words, weight in ((self._POSITIVE, 0.2), (self._NEGATIVE, -0.2)):
+            for word in words:
+                self._lexicon[word] = (weight, 0)
+        for words, side in (
+            (self._OPTIONS_BULL, self._BULL_SIDE),
+            (self._OPTIONS_BEAR, self._BEAR_SIDE),
+        ):
+            for word in words:
+                weight, sides = self._lexicon.get(word, (0.0, 0))
+                self._lexicon[word] = (weight, sides | side)
+
+    def annotate(
+        self,
+        mentions: Sequence[Mention],
+        token_spans: Sequence[Sequence[str]] | None = None,
+    ) -> Sequence[Mention]:
+        """Attach sentiment_score/label/confidence to mentions.
 
-    def annotate(self, mentions: Sequence[MentionEvent]) -> Sequence[MentionEvent]:
-        """Attach sentiment_score/label/confidence to mentions."""
-
-        for mention in mentions:
-            tokens = [token.lower() for token in self._TOKEN_PATTERN.findall(mention.span_text or "")]
-            score = 0.0
-            for token in tokens:
-                if token in self._POSITIVE:
-                    score += 0.2
-                elif token in self._NEGATIVE:
-                    score -= 0.2
-
-            options_bias = 0
-            if any(token in self._OPTIONS_BULL for token in tokens):
-                mention.has_options_intent = True
-                mention.option_side = 1
-                options_bias += 0.1
-            if any(token in self._OPTIONS_BEAR for token in tokens):
-                mention.has_options_intent = True
-                mention.option_side = -1
-                options_bias -= 0.1
-
-            score = max(min(score + options_bias, 0.9), -0.9)
-            mention.sentiment_score = score
-            if score >= self._neutral_threshold:
-                mention.sentiment_label = 1
-            elif score <= -self._neutral_threshold:
-                mention.sentiment_label = -1
-            else:
-                mention.sentiment_label = 0
-            mention.sentiment_conf = min(abs(score) / 0.3, 1.0)
+        `token_spans` (from `ExtractionResult`) supplies each mention's lower-cased span tokens,
+        re-split on `$` and digits so they score exactly like `span_text`; without it
+        `span_text` is tokenized here. With a `scorer`, the batch is scored in one call and its
+        score replaces the built-in lexicon sum; options intent still comes from the lexicon
+        pass. With a `cache`, spans seen before skip scoring entirely.
+        """
 
+        if token_spans is None:
+            token_spans = [
+                [token.lower() for token in self._TOKEN_PATTERN.findall(mention.span_text or "")]
+                for mention in mentions
+            ]
+        else:
+            token_spans = [self._lexicon_tokens(tokens) for tokens in token_spans]
+        cache = self.cache
+        results: list[tuple[float, int] | None] = [None] * len(mentions)
+        keys: list[str] = []
+        pending: list[int] = []
+        repeats: list[tuple[int, int]] = []
+        first_pending: dict[str, int] = {}
+        for idx, tokens in enumerate(token_spans):
+            if cache is not None:
+                key = span_key(tokens)
+                keys.append(key)
+                if key in first_pending:
+                    # Copypasta within one batch: score the first copy only.
+                    repeats.append((idx, first_pending[key]))
+                    continue
+                results[idx] = cache.get(key)
+                if results[idx] is None:
+                    first_pending[key] = idx
+            if results[idx] is None:
+                pending.append(idx)
+
+        if pending:
+            scores = None
+            if self._scorer is not None:
+                scores = self._scorer.score_batch([token_spans[idx] for idx in pending]).tolist()
+            for offset, idx in enumerate(pending):
+                score, sides = self._lexicon_pass(token_spans[idx])
+                result = (score if scores is None else scores[offset], sides)
+                results[idx] = result
+                if cache is not None:
+                    cache.put(keys[idx], result)
+        for idx, source in repeats:
+            results[idx] = results[source]
+
+        for mention, result in zip(mentions, results, strict=True):
+            assert result is not None
+            self._apply(mention, *result)
         return mentions
+
+    def _lexicon_tokens(self, tokens: Sequence[str]) -> Sequence[str]:
+        """Re-split extractor tokens (`$calls`, `x2calls`) into this annotator's word tokens."""
+
+        if all(token.isalpha() for token in tokens):
+            return tokens
+        split = self._TOKEN_PATTERN.findall
+        return [word for token in tokens for word in split(token)]
+
+    def _lexicon_pass(self, tokens: Iterable[str]) -> tuple[float, int]:
+        lookup = self._lexicon.get
+        score = 0.0
+        sides = 0
+        for token in tokens:
+            entry = lookup(token)
+            if entry is not None:
+                score += entry[0]
+                sides |= entry[1]
+        return score, sides
+
+    def _apply(self, mention: Mention, score: float, sides: int) -> None:
+        options_bias = 0
+        if sides & self._BULL_SIDE:
+            mention.has_options_intent = True
+            mention.option_side = 1
+            options_bias += 0.1
+        if sides & self._BEAR_SIDE:
+            mention.has_options_intent = True
+            mention.option_side = -1
+            options_bias -= 0.1
+
+        score = max(min(score + options_bias, 0.9), -0.9)
+        mention.sentiment_score = score
+        if score >= self._neutral_threshold:
+            mention.sentiment_label = 1
+        elif score <= -self._neutral_threshold:
+            mention.sentiment_label = -1
+        else:
+            mention.sentiment_label = 0
+        mention.sentiment_conf = min(abs(score) / 0.3, 1.0)
@@ -0,0 +1,217 @@
+"""Pluggable batch sentiment scorers: VADER-style lexicon and hashed-feature linear model."""
+from __future__ import annotations
+
+import math
+import zlib
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import chain
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+_BIGRAM_SALT = 0x9E3779B1
+
+
+class SentimentScorer(Protocol):
+    """Scores lower-cased token spans in [-1, 1]; one call per batch of mentions."""
+
+    def score_batch(  # pragma: no cover - interface
+        self, spans: Sequence[Sequence[str]]
+    ) -> np.ndarray:
+        ...
+
+
+class LexiconScorer:
+    """VADER-style valence lexicon with negation flips, boosters and VADER's normalisation.
+
+    Valences are on VADER's -4..4 scale. A negator within the three preceding tokens flips a
+    word's valence (scaled by 0.74), a booster right before it adds 0.293 in its direction, and
+    the summed valence s becomes s / sqrt(s^2 + 15).
+    """
+
+    DEFAULT_VALENCE: Mapping[str, float] = {
+        "bull": 1.9,
+        "bullish": 2.3,
+        "green": 1.2,
+        "moon": 2.4,
+        "mooning": 2.6,
+        "rocket": 2.0,
+        "tendies": 2.0,
+        "squeeze": 1.5,
+        "printing": 1.8,
+        "undervalued": 1.6,
+        "buy": 1.0,
+        "long": 0.8,
+        "calls": 1.0,
+        "call": 0.8,
+        "hold": 0.6,
+        "bear": -1.9,
+        "bearish": -2.3,
+        "red": -1.2,
+        "bag": -1.6,
+        "bags": -1.6,
+        "bagholder": -2.2,
+        "dump": -2.1,
+        "dumping": -2.3,
+        "crash": -2.6,
+        "rug": -2.2,
+        "overvalued": -1.6,
+        "sell": -1.0,
+        "short": -0.8,
+        "shorting": -1.2,
+        "puts": -1.0,
+        "put": -0.8,
+        "drilling": -2.0,
+        "loss": -1.6,
+    }
+    NEGATIONS = frozenset(
+        {"not", "no", "never", "don't", "dont", "isn't", "isnt", "won't", "wont", "aint", "ain't"}
+    )
+    BOOSTERS = frozenset({"very", "so", "super", "extremely", "really", "fucking", "hella", "mega"})
+    _NEGATION_SCALE = -0.74
+    _BOOSTER_INCREMENT = 0.293
+    _ALPHA = 15.0
+
+    def __init__(self, valence: Mapping[str, float] | None = None) -> None:
+        self._valence = dict(self.DEFAULT_VALENCE if valence is None else valence)
+
+    @classmethod
+    def from_file(cls, path: Path, extend_defaults: bool = True) -> LexiconScorer:
+        """Load a `vader_lexicon.txt`-style file: token<TAB>mean valence[<TAB>...] per line."""
+
+        valence = dict(cls.DEFAULT_VALENCE) if extend_defaults else {}
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) >= 2 and parts[0] and not line.startswith("#"):
+                    valence[parts[0].lower()] = float(parts[1])
+        return cls(valence)
+
+    def score_batch(self, spans: Sequence[Sequence[str]]) -> np.ndarray:
+        return np.fromiter(
+            (self.score(tokens) for tokens in spans), dtype=np.float64, count=len(spans)
+        )
+
+    def score(self, tokens: Sequence[str]) -> float:
+        lookup = self._valence.get
+        total = 0.0
+        for idx, token in enumerate(tokens):
+            valence = lookup(token)
+            if valence is None:
+                continue
+            if idx and tokens[idx - 1] in self.BOOSTERS:
+                valence += math.copysign(self._BOOSTER_INCREMENT, valence)
+            if not self.NEGATIONS.isdisjoint(tokens[max(idx - 3, 0) : idx]):
+                valence *= self._NEGATION_SCALE
+            total += valence
+        if not total:
+            return 0.0
+        return total / math.sqrt(total * total + self._ALPHA)
+
+
+class _FeatureIds(dict[str, int]):
+    """Token -> stable 32-bit hash, computed once per distinct token."""
+
+    def __missing__(self, token: str) -> int:
+        value = self[token] = zlib.crc32(token.encode("utf-8"))
+        return value
+
+
+class HashedLinearScorer:
+    """Linear model over hashed unigram + bigram features, scored a batch at a time.
+
+    A batch is flattened into one token array; feature ids come from CRC32 (stable across
+    processes, unlike `hash`) modulo `len(weights)`. The sparse matrix-vector product is a
+    `np.bincount` of feature weights by row, and scores are squashed with tanh.
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: float = 0.0,
+        bigrams: bool = True,
+        cache_size: int = 200_000,
+    ) -> None:
+        self._weights = np.ascontiguousarray(weights, dtype=np.float32)
+        if self._weights.ndim != 1 or not len(self._weights):
+            msg = "weights must be a non-empty 1-D array"
+            raise ValueError(msg)
+        self._bias = float(bias)
+        self._bigrams = bigrams
+        self._cache_size = cache_size
+        self._ids = _FeatureIds()
+
+    @property
+    def num_features(self) -> int:
+        return len(self._weights)
+
+    @classmethod
+    def load(cls, path: Path) -> HashedLinearScorer:
+        """Load weights saved by `save` (an `.npz` with `weights`, `bias` and `bigrams`)."""
+
+        with np.load(path) as data:
+            return cls(data["weights"], float(data["bias"]), bool(data["bigrams"]))
+
+    def save(self, path: Path) -> None:
+        with path.open("wb") as handle:
+            np.savez(
+                handle,
+                weights=self._weights,
+                bias=np.float64(self._bias),
+                bigrams=np.bool_(self._bigrams),
+            )
+
+    def feature_ids(self, spans: Sequence[Sequence[str]]) -> tuple[np.ndarray, np.ndarray]:
+        """Return (row, feature) index arrays: the COO form of the batch's feature matrix."""
+
+        if len(self._ids) > self._cache_size:
+            self._ids.clear()
+        lengths = np.fromiter(map(len, spans), dtype=np.int64, count=len(spans))
+        hashes = np.fromiter(map(self._ids.__getitem__, chain.from_iterable(spans)), dtype=np.int64)
+        rows = np.repeat(np.arange(len(spans), dtype=np.int64), lengths)
+        features = hashes
+        if self._bigrams and len(hashes) > 1:
+            # Bigram i pairs tokens i and i + 1, unless token i ends its span.
+            keep = np.ones(len(hashes) - 1, dtype=bool)
+            ends = np.cumsum(lengths)[:-1]
+            keep[ends[(ends > 0) & (ends < len(hashes))] - 1] = False
+            pairs = (hashes[:-1] * 31 + hashes[1:]) ^ _BIGRAM_SALT
+            features = np.concatenate([hashes, pairs[keep]])
+            rows = np.concatenate([rows, rows[:-1][keep]])
+        return rows, features % len(self._weights)
+
+    def score_batch(self, spans: Sequence[Sequence[str]]) -> np.ndarray:
+        if not spans:
+            return np.zeros(0)
+        rows, features = self.feature_ids(spans)
+        raw = np.bincount(rows, weights=self._weights[features], minlength=len(spans))
+        return np.tanh(raw + self._bias)
+
+
+class BlendedScorer:
+    """Weighted sum of scorers, clipped to [-1, 1] (e.g. 0.5 lexicon + 0.5 linear)."""
+
+    def __init__(self, components: Iterable[tuple[SentimentScorer, float]]) -> None:
+        self._components = list(components)
+        if not self._components:
+            msg = "BlendedScorer needs at least one component"
+            raise ValueError(msg)
+
+    def score_batch(self, spans: Sequence[Sequence[str]]) -> np.ndarray:
+        total = np.zeros(len(spans))
+        for scorer, weight in self._components:
+            total += weight * scorer.score_batch(spans)
+        return np.clip(total, -1.0, 1.0)
+
+
+def load_scorer(
+    weights_path: Path | None, lexicon_path: Path | None = None, linear_weight: float = 0.5
+) -> BlendedScorer:
+    """Blend the lexicon with the linear model from `weights_path` (lexicon only when None)."""
+
+    lexicon = LexiconScorer.from_file(lexicon_path) if lexicon_path else LexiconScorer()
+    if weights_path is None:
+        return BlendedScorer([(lexicon, 1.0)])
+    linear = HashedLinearScorer.load(weights_path)
+    return BlendedScorer([(lexicon, 1.0 - linear_weight), (linear, linear_weight)])
@@ -1,13 +1,32 @@
 """Mention aggregation helpers."""
 from __future__ import annotations
 
+import time
 from collections import defaultdict
+from collections.abc import AsyncGenerator, Callable, Iterable, Mapping, Sequence
+from contextlib import aclosing
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import Iterable, Mapping, Protocol, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any, Protocol
 
 from common.db import PostgresClient
-from common.models import MentionEvent, MinuteAggregation
+from common.models import Mention, MentionEvent, MentionRecord, MinuteAggregation
+from trend.hll import HyperLogLog
+from trend.rollup import RollupStage
+
+BucketKey = tuple[str, datetime]
+
+# The mention_events columns a minute bucket reads, aliased `me` joined to `ri` (reddit_items).
+# `thread_id` is the thread the ingestor resolved; rows written before it was stored fall back
+# to the item's `link_id`.
+_BUCKET_COLUMNS = """me.ts_utc,
+               me.subreddit,
+               me.reddit_id,
+               me.author,
+               me.ticker,
+               me.confidence,
+               me.sentiment_score,
+               COALESCE(me.thread_id, NULLIF(ri.link_id, '')) AS thread_id"""
 
 
 class MinuteAggregationWriter(Protocol):
@@ -15,6 +34,13 @@ class MinuteAggregationWriter(Protocol):
         ...
 
 
+class MentionRowSource(MinuteAggregationWriter, Protocol):
+    async def fetch_changed_minutes(
+        self, changed_since: datetime, since: datetime
+    ) -> Sequence[tuple[datetime, MentionRecord]]:  # pragma: no cover - interface
+        ...
+
+
 @dataclass
 class _Bucket:
     mentions: int = 0
@@ -24,50 +50,130 @@ class _Bucket:
 
 
 class MentionsAggregator:
-    """Accumulates mention events into 1-minute aggregations."""
+    """Accumulates mention events into 1-minute aggregations.
+
+    With `rollups`, every flush also folds the written minutes into the 5m/1h/1d tables.
+    """
 
-    def __init__(self, writer: MinuteAggregationWriter) -> None:
+    def __init__(self, writer: MinuteAggregationWriter, rollups: RollupStage | None = None) -> None:
         self._writer = writer
-        self._buckets: dict[tuple[str, datetime], _Bucket] = defaultdict(_Bucket)
+        self._rollups = rollups
+        self._buckets: dict[BucketKey, _Bucket] = defaultdict(_Bucket)
 
-    def add(self, mention: MentionEvent) -> None:
-        key = (mention.ticker, self._minute_bucket(mention.ts_utc))
-        bucket = self._buckets[key]
-        bucket.mentions += 1
-        bucket.authors.add(mention.author)
-        bucket.threads.add(mention.thread_id or mention.reddit_id)
-        bucket.sentiment_sum += mention.sentiment_score
+    def add(self, mention: Mention) -> None:
+        self._fold(self._buckets[(mention.ticker, self._minute_bucket(mention.ts_utc))], mention)
 
-    def extend(self, mentions: Iterable[MentionEvent]) -> None:
+    def extend(self, mentions: Iterable[Mention]) -> None:
         for mention in mentions:
             self.add(mention)
 
+    async def extend_chunks(self, chunks: AsyncGenerator[Iterable[Mention], None]) -> int:
+        """Fold streamed chunks (see `iter_mentions_since`) one at a time; returns mentions read.
+
+        The stream is closed on the way out, so stopping early or raising releases its cursor
+        connection right away instead of at garbage collection.
+        """
+
+        count = 0
+        async with aclosing(chunks) as stream:
+            async for chunk in stream:
+                for mention in chunk:
+                    self.add(mention)
+                    count += 1
+        return count
+
     async def flush(self) -> int:
-        aggs: list[MinuteAggregation] = []
-        for (ticker, ts), bucket in self._buckets.items():
-            avg_sent = bucket.sentiment_sum / bucket.mentions if bucket.mentions else 0.0
-            aggs.append(
-                MinuteAggregation(
-                    ts_utc=ts,
-                    ticker=ticker,
-                    mentions=bucket.mentions,
-                    unique_authors=len(bucket.authors),
-                    threads_touched=len(bucket.threads),
-                    avg_sentiment=avg_sent,
-                )
-            )
-        if aggs:
-            await self._writer.upsert(aggs)
+        aggs = [self._aggregation(key, bucket) for key, bucket in self._buckets.items()]
+        await self._publish(aggs)
         count = len(aggs)
         self._buckets.clear()
         return count
 
+    async def _publish(self, aggs: Sequence[MinuteAggregation]) -> None:
+        if not aggs:
+            return
+        await self._writer.upsert(aggs)
+        if self._rollups is not None:
+            await self._rollups.apply(aggs)
+
+    @staticmethod
+    def _fold(bucket: _Bucket, mention: Mention) -> None:
+        bucket.mentions += 1
+        bucket.authors.add(mention.author)
+        bucket.threads.add(mention.thread_id or mention.reddit_id)
+        bucket.sentiment_sum += mention.sentiment_score
+
+    @staticmethod
+    def _aggregation(key: BucketKey, bucket: _Bucket) -> MinuteAggregation:
+        ticker, ts = key
+        return MinuteAggregation(
+            ts_utc=ts,
+            ticker=ticker,
+            mentions=bucket.mentions,
+            unique_authors=len(bucket.authors),
+            threads_touched=len(bucket.threads),
+            avg_sentiment=bucket.sentiment_sum / bucket.mentions if bucket.mentions else 0.0,
+            authors_hll=HyperLogLog.from_items(bucket.authors).to_bytes(),
+        )
+
     @staticmethod
     def _minute_bucket(ts: datetime) -> datetime:
-        tz = ts.tzinfo or timezone.utc
+        tz = ts.tzinfo or UTC
         return ts.replace(second=0, microsecond=0, tzinfo=tz)
 
 
+class IncrementalAggregator(MentionsAggregator):
+    """Long-lived aggregator that recomputes only the minutes whose mentions changed.
+
+    `mention_events.updated_at` is stamped on insert and on every `ON CONFLICT DO UPDATE`
+    (re-scores, edits), so each `run_once` asks for the `(ticker, minute)` buckets holding a
+    row updated since the watermark and rebuilds them whole from the database. Rebuilding makes
+    re-reads harmless, so the watermark trails the newest `updated_at` seen by `lag`: a row is
+    stamped when its transaction starts, and one that commits up to `lag` later is still
+    caught. Longer write transactions can be missed until the row is next updated. Minutes
+    older than `window` are never revisited.
+    """
+
+    def __init__(
+        self,
+        source: MentionRowSource,
+        window: timedelta = timedelta(minutes=5),
+        lag: timedelta = timedelta(seconds=30),
+        clock: Callable[[], float] = time.time,
+        rollups: RollupStage | None = None,
+    ) -> None:
+        super().__init__(source, rollups)
+        self._source = source
+        self._window = window
+        self._lag = lag
+        self._clock = clock
+        self.watermark: datetime | None = None
+        self.rows_folded = 0
+        self.buckets_rebuilt = 0
+
+    async def run_once(self) -> int:
+        """Rebuild and upsert the buckets changed since the last cycle; returns rows read."""
+
+        now = datetime.fromtimestamp(self._clock(), UTC)
+        horizon = self._minute_bucket(now - self._window)
+        changed_since = horizon if self.watermark is None else self.watermark - self._lag
+        rows = await self._source.fetch_changed_minutes(changed_since, horizon)
+        for updated_at, mention in rows:
+            self.add(mention)
+            if self.watermark is None or updated_at > self.watermark:
+                self.watermark = updated_at
+        self.rows_folded += len(rows)
+        self.buckets_rebuilt = await self.flush()
+        return len(rows)
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "aggregator_watermark": self.watermark.timestamp() if self.watermark else 0.0,
+            "aggregator_rows_folded": self.rows_folded,
+            "aggregator_buckets": self.buckets_rebuilt,
+        }
+
+
 class AggregationRepository(MinuteAggregationWriter):
     """DB interactions for mention aggregations."""
 
@@ -85,9 +191,10 @@ class AggregationRepository(MinuteAggregationWriter):
             avg_sentiment,
             zscore,
             ears_flag,
-            cusum_stat
+            cusum_stat,
+            authors_hll
         ) VALUES (
-            $1,$2,$3,$4,$5,$6,$7,$8,$9
+            $1,$2,$3,$4,$5,$6,$7,$8,$9,$10
         )
         ON CONFLICT (ticker, ts_utc) DO UPDATE SET
             mentions = EXCLUDED.mentions,
@@ -96,7 +203,8 @@ class AggregationRepository(MinuteAggregationWriter):
             avg_sentiment = EXCLUDED.avg_sentiment,
             zscore = EXCLUDED.zscore,
             ears_flag = EXCLUDED.ears_flag,
-            cusum_stat = EXCLUDED.cusum_stat
+            cusum_stat = EXCLUDED.cusum_stat,
+            authors_hll = EXCLUDED.authors_hll
         """
         rows = [
             (
@@ -109,11 +217,54 @@ class AggregationRepository(MinuteAggregationWriter):
                 agg.zscore,
                 agg.ears_flag,
                 agg.cusum_stat,
+                agg.authors_hll,
             )
             for agg in aggregations
         ]
         await self._db.executemany(query, rows)
 
+    async def rollup_since(self, since: datetime) -> int:
+        """Compute the 1-minute rollup inside Postgres and upsert it; returns buckets written.
+
+        Same numbers as `MentionsAggregator` (a mention without a thread counts its item as the
+        thread, NULL sentiment counts as 0) without shipping a single mention row to Python.
+        `since` is floored to the minute so the oldest bucket is never upserted half-counted.
+        Postgres cannot build `authors_hll` sketches: a bucket whose counts come out unchanged
+        keeps the one already stored, any other is cleared and readers fall back to its exact
+        `unique_authors`.
+        """
+
+        query = """
+        INSERT INTO mentions_1m
+            (ts_utc, ticker, mentions, unique_authors, threads_touched, avg_sentiment)
+        SELECT date_trunc('minute', me.ts_utc),
+               me.ticker,
+               count(*),
+               count(DISTINCT me.author),
+               count(DISTINCT COALESCE(me.thread_id, NULLIF(ri.link_id, ''), me.reddit_id)),
+               avg(COALESCE(me.sentiment_score, 0))
+        FROM mention_events me
+        JOIN reddit_items ri ON ri.id = me.reddit_id
+        WHERE me.ts_utc >= $1
+        GROUP BY 1, 2
+        ON CONFLICT (ticker, ts_utc) DO UPDATE SET
+            mentions = EXCLUDED.mentions,
+            unique_authors = EXCLUDED.unique_authors,
+            threads_touched = EXCLUDED.threads_touched,
+            avg_sentiment = EXCLUDED.avg_sentiment,
+            zscore = EXCLUDED.zscore,
+            ears_flag = EXCLUDED.ears_flag,
+            cusum_stat = EXCLUDED.cusum_stat,
+            authors_hll = CASE
+                WHEN mentions_1m.mentions = EXCLUDED.mentions
+                 AND mentions_1m.unique_authors = EXCLUDED.unique_authors
+                THEN mentions_1m.authors_hll
+            END
+        """
+        status = await self._db.execute(query, MentionsAggregator._minute_bucket(since))
+        # asyncpg returns the command tag, e.g. "INSERT 0 42".
+        return int(status.rsplit(" ", 1)[-1])
+
     async def fetch_mentions_since(self, since: datetime) -> list[MentionEvent]:
         query = """
         SELECT me.ts_utc,
@@ -129,7 +280,7 @@ class AggregationRepository(MinuteAggregationWriter):
                me.sentiment_conf,
                me.has_options_intent,
                me.option_side,
-               ri.link_id AS thread_id
+               COALESCE(me.thread_id, NULLIF(ri.link_id, '')) AS thread_id
         FROM mention_events me
         JOIN reddit_items ri ON ri.id = me.reddit_id
         WHERE me.ts_utc >= $1
@@ -157,3 +308,62 @@ class AggregationRepository(MinuteAggregationWriter):
                 )
             )
         return mentions
+
+    async def iter_mentions_since(
+        self, since: datetime, prefetch: int = 5000
+    ) -> AsyncGenerator[list[MentionRecord], None]:
+        """Stream mentions with ts_utc >= `since` in chunks of up to `prefetch` records.
+
+        Unlike `fetch_mentions_since`, the window is read through a server-side cursor, so
+        client memory is bounded by `prefetch` rather than by the window length. Only the
+        columns the minute buckets need are read.
+        """
+
+        query = f"""
+        SELECT {_BUCKET_COLUMNS}
+        FROM mention_events me
+        JOIN reddit_items ri ON ri.id = me.reddit_id
+        WHERE me.ts_utc >= $1
+        """  # noqa: S608 - _BUCKET_COLUMNS is a constant
+        async with aclosing(self._db.stream(query, since, prefetch=prefetch)) as stream:
+            async for rows in stream:
+                yield [self._record(row) for row in rows]
+
+    async def fetch_changed_minutes(
+        self, changed_since: datetime, since: datetime
+    ) -> list[tuple[datetime, MentionRecord]]:
+        """Every `(updated_at, mention)` row of the minute buckets at or after `since` that hold
+        a row updated at or after `changed_since`.
+
+        Only the columns the minute buckets need are read; the rest keep record defaults.
+        """
+
+        query = f"""
+        WITH changed AS (
+            SELECT DISTINCT ticker, date_trunc('minute', ts_utc) AS minute
+            FROM mention_events
+            WHERE updated_at >= $1 AND ts_utc >= $2
+        )
+        SELECT me.updated_at, {_BUCKET_COLUMNS}
+        FROM changed c
+        JOIN mention_events me
+          ON me.ticker = c.ticker
+         AND me.ts_utc >= c.minute
+         AND me.ts_utc < c.minute + INTERVAL '1 minute'
+        JOIN reddit_items ri ON ri.id = me.reddit_id
+        """  # noqa: S608 - _BUCKET_COLUMNS is a constant
+        rows = await self._db.fetch(query, changed_since, since)
+        return [(row["updated_at"], self._record(row)) for row in rows]
+
+    @staticmethod
+    def _record(row: Mapping[str, Any]) -> MentionRecord:
+        return MentionRecord(
+            ts_utc=row["ts_utc"],
+            subreddit=row["subreddit"],
+            reddit_id=row["reddit_id"],
+            author=row["author"],
+            thread_id=row["thread_id"],
+            ticker=row["ticker"],
+            confidence=row["confidence"],
+            sentiment_score=row["sentiment_score"] or 0.0,
+        )
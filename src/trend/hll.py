@@ -0,0 +1,159 @@
+"""Mergeable HyperLogLog sketches for distinct-author counts across rollup windows."""
+from __future__ import annotations
+
+import hashlib
+import math
+from collections.abc import Iterable
+
+import numpy as np
+
+_SPARSE = 0
+_DENSE = 1
+_SPARSE_ENTRY = np.dtype([("index", ">u2"), ("rank", "u1")])
+
+
+def _hash64(item: str) -> int:
+    return int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _sigma(x: float) -> float:
+    if x == 1.0:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x in (0.0, 1.0):
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class HyperLogLog:
+    """HyperLogLog with `2**precision` one-byte registers over a 64-bit blake2b hash.
+
+    Merging is a register-wise max, so per-minute sketches combine into any window without
+    revisiting authors. Estimates use Ertl's improved estimator ("New cardinality estimation
+    algorithms for HyperLogLog sketches", 2017): near exact for small sets and without the
+    classic mid-range bias; the standard error is about 1.04 / sqrt(2**precision), 1.6% at 12.
+    Serialized sketches are sparse `(index, rank)` triples until that stops being smaller
+    than the dense register array, so a quiet minute costs a few bytes.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            msg = "precision must be between 4 and 16"
+            raise ValueError(msg)
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], precision: int = 12) -> HyperLogLog:
+        sketch = cls(precision)
+        sketch.update(items)
+        return sketch
+
+    def add(self, item: str) -> None:
+        value = _hash64(item)
+        width = 64 - self.precision
+        idx = value >> width
+        rank = width - (value & ((1 << width) - 1)).bit_length() + 1
+        if rank > self._registers[idx]:
+            self._registers[idx] = rank
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: HyperLogLog) -> None:
+        if other.precision != self.precision:
+            msg = "cannot merge sketches with different precision"
+            raise ValueError(msg)
+        merged = np.maximum(self._array(), other._array())
+        self._registers[:] = merged.tobytes()
+
+    def estimate(self) -> float:
+        """Ertl's improved estimator, unbiased across small and large ranges without tables."""
+
+        m = len(self._registers)
+        q = 64 - self.precision
+        counts = np.bincount(self._array(), minlength=q + 2).tolist()
+        if counts[0] == m:
+            return 0.0
+        z = m * _tau(1 - counts[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + counts[k])
+        z += m * _sigma(counts[0] / m)
+        return m * m / (2 * math.log(2) * z)
+
+    def __len__(self) -> int:
+        return round(self.estimate())
+
+    def to_bytes(self) -> bytes:
+        registers = self._array()
+        nonzero = np.flatnonzero(registers)
+        if len(nonzero) * _SPARSE_ENTRY.itemsize < len(registers):
+            entries = np.empty(len(nonzero), dtype=_SPARSE_ENTRY)
+            entries["index"] = nonzero
+            entries["rank"] = registers[nonzero]
+            return bytes((_SPARSE, self.precision)) + entries.tobytes()
+        return bytes((_DENSE, self.precision)) + bytes(self._registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> HyperLogLog:
+        return cls.merge_all([data])
+
+    @classmethod
+    def merge_all(cls, sketches: Iterable[bytes], precision: int | None = None) -> HyperLogLog:
+        """Union many serialized sketches in one pass (e.g. every minute of a 30d window).
+
+        Sparse payloads are scattered with one `np.maximum.at` over their concatenated
+        entries; dense ones are folded into a single register array with `np.maximum`.
+        """
+
+        result: HyperLogLog | None = cls(precision) if precision is not None else None
+        dense: np.ndarray | None = None
+        sparse: list[np.ndarray] = []
+        for data in sketches:
+            kind, bits = data[0], data[1]
+            if result is None:
+                result = cls(bits)
+            elif bits != result.precision:
+                msg = "cannot merge sketches with different precision"
+                raise ValueError(msg)
+            payload = memoryview(data)[2:]
+            if kind == _SPARSE:
+                sparse.append(np.frombuffer(payload, dtype=_SPARSE_ENTRY))
+            elif kind == _DENSE:
+                registers = np.frombuffer(payload, dtype=np.uint8)
+                if dense is None:
+                    dense = registers.copy()
+                else:
+                    np.maximum(dense, registers, out=dense)
+            else:
+                msg = f"unknown sketch encoding {kind}"
+                raise ValueError(msg)
+        if result is None:
+            return cls()
+        merged = dense if dense is not None else np.zeros(1 << result.precision, dtype=np.uint8)
+        if sparse:
+            entries = np.concatenate(sparse)
+            np.maximum.at(merged, entries["index"].astype(np.intp), entries["rank"])
+        result._registers[:] = merged.tobytes()
+        return result
+
+    def _array(self) -> np.ndarray:
+        return np.frombuffer(self._registers, dtype=np.uint8)
@@ -0,0 +1,174 @@
+"""Multi-resolution rollups (5m/1h/1d) kept in step with mentions_1m."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from common.db import PostgresClient
+from common.models import MinuteAggregation
+from trend.hll import HyperLogLog
+
+# Buckets are aligned to this origin, which is also the `date_bin` origin used in SQL.
+_ORIGIN = datetime(2000, 1, 1, tzinfo=UTC)
+
+
+@dataclass(frozen=True)
+class Resolution:
+    name: str
+    table: str
+    step: timedelta
+    source: str
+
+    @property
+    def source_columns(self) -> tuple[str, str]:
+        """(sentiment sum, zscore) expressions over the finer `source` table aliased `f`."""
+
+        if self.source == "mentions_1m":
+            return "f.avg_sentiment * f.mentions", "f.zscore"
+        return "f.sentiment_sum", "f.max_zscore"
+
+
+# Finest first: each level is rebuilt from the one before it.
+RESOLUTIONS = (
+    Resolution("5m", "mentions_5m", timedelta(minutes=5), "mentions_1m"),
+    Resolution("1h", "mentions_1h", timedelta(hours=1), "mentions_5m"),
+    Resolution("1d", "mentions_1d", timedelta(days=1), "mentions_1h"),
+)
+
+
+def floor_to(ts: datetime, step: timedelta) -> datetime:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return ts - (ts - _ORIGIN) % step
+
+
+class RollupStage:
+    """Folds flushed minute aggregations into the 5m/1h/1d tables.
+
+    Sums (mentions, sentiment, max zscore) of each touched coarse bucket are recomputed in
+    Postgres from the next finer table, so a 1d bucket reads at most 24 hourly rows and
+    re-emitting a minute never double counts. Author sketches cannot be merged in SQL, so the
+    minute sketches are unioned into the stored coarse sketch here; a register-wise max is
+    idempotent, and minute sketches only grow.
+    """
+
+    def __init__(self, db: PostgresClient, resolutions: Sequence[Resolution] = RESOLUTIONS) -> None:
+        self._db = db
+        self._resolutions = resolutions
+
+    async def apply(self, aggregations: Sequence[MinuteAggregation]) -> int:
+        """Update every coarse bucket the minute `aggregations` fall into; returns rows written."""
+
+        if not aggregations:
+            return 0
+        written = 0
+        for resolution in self._resolutions:
+            sketches: dict[tuple[str, datetime], list[bytes]] = {}
+            for agg in aggregations:
+                key = (agg.ticker, floor_to(agg.ts_utc, resolution.step))
+                payloads = sketches.setdefault(key, [])
+                if agg.authors_hll is not None:
+                    payloads.append(agg.authors_hll)
+            stored = await self._db.fetch(
+                f"""
+                SELECT ticker, ts_utc, authors_hll
+                FROM {resolution.table}
+                WHERE ticker = ANY($1::text[]) AND ts_utc = ANY($2::timestamptz[])
+                  AND authors_hll IS NOT NULL
+                """,  # noqa: S608 - identifiers come from the fixed resolutions
+                sorted({ticker for ticker, _ in sketches}),
+                sorted({start for _, start in sketches}),
+            )
+            for row in stored:
+                payloads = sketches.get((row["ticker"], row["ts_utc"]))
+                if payloads is not None:
+                    payloads.append(bytes(row["authors_hll"]))
+
+            rows = []
+            for (ticker, start), payloads in sketches.items():
+                merged = HyperLogLog.merge_all(payloads) if payloads else None
+                rows.append(
+                    (
+                        start,
+                        ticker,
+                        merged.to_bytes() if merged else None,
+                        len(merged) if merged else None,
+                        resolution.step,
+                    )
+                )
+            await self._db.executemany(self._upsert_query(resolution), rows)
+            written += len(rows)
+        return written
+
+    async def rollup_since(self, since: datetime) -> int:
+        """Rebuild every coarse bucket from `since` entirely in SQL (the push-down mode).
+
+        As in `AggregationRepository.rollup_since`, a bucket whose `mentions` come out unchanged
+        keeps its stored sketch (and the `unique_authors` estimated from it); any other loses the
+        sketch and `unique_authors` becomes the sum of the finer buckets' counts.
+        """
+
+        written = 0
+        for resolution in self._resolutions:
+            sentiment, zscore = resolution.source_columns
+            status = await self._db.execute(
+                f"""
+                INSERT INTO {resolution.table}
+                    (ts_utc, ticker, mentions, unique_authors, sentiment_sum, max_zscore,
+                     authors_hll)
+                SELECT date_bin($2::interval, f.ts_utc, TIMESTAMPTZ '2000-01-01 00:00:00+00'),
+                       f.ticker,
+                       SUM(f.mentions),
+                       SUM(f.unique_authors),
+                       COALESCE(SUM({sentiment}), 0),
+                       MAX({zscore}),
+                       NULL
+                FROM {resolution.source} f
+                WHERE f.ts_utc >= $1
+                GROUP BY 1, 2
+                ON CONFLICT (ticker, ts_utc) DO UPDATE SET
+                    mentions = EXCLUDED.mentions,
+                    unique_authors = CASE
+                        WHEN {resolution.table}.mentions = EXCLUDED.mentions
+                         AND {resolution.table}.authors_hll IS NOT NULL
+                        THEN {resolution.table}.unique_authors
+                        ELSE EXCLUDED.unique_authors
+                    END,
+                    sentiment_sum = EXCLUDED.sentiment_sum,
+                    max_zscore = EXCLUDED.max_zscore,
+                    authors_hll = CASE
+                        WHEN {resolution.table}.mentions = EXCLUDED.mentions
+                        THEN {resolution.table}.authors_hll
+                    END
+                """,  # noqa: S608 - identifiers come from the fixed resolutions
+                floor_to(since, resolution.step),
+                resolution.step,
+            )
+            written += int(status.rsplit(" ", 1)[-1])
+        return written
+
+    @staticmethod
+    def _upsert_query(resolution: Resolution) -> str:
+        sentiment, zscore = resolution.source_columns
+        return f"""
+        INSERT INTO {resolution.table}
+            (ts_utc, ticker, mentions, unique_authors, sentiment_sum, max_zscore, authors_hll)
+        SELECT $1::timestamptz,
+               $2::text,
+               COALESCE(SUM(f.mentions), 0),
+               COALESCE($4::integer, SUM(f.unique_authors), 0),
+               COALESCE(SUM({sentiment}), 0),
+               MAX({zscore}),
+               $3::bytea
+        FROM {resolution.source} f
+        WHERE f.ticker = $2::text
+          AND f.ts_utc >= $1::timestamptz
+          AND f.ts_utc < $1::timestamptz + $5::interval
+        ON CONFLICT (ticker, ts_utc) DO UPDATE SET
+            mentions = EXCLUDED.mentions,
+            unique_authors = EXCLUDED.unique_authors,
+            sentiment_sum = EXCLUDED.sentiment_sum,
+            max_zscore = EXCLUDED.max_zscore,
+            authors_hll = EXCLUDED.authors_hll
+        """  # noqa: S608 - identifiers come from the fixed resolutions
@@ -5,3 +5,7 @@ ROOT = Path(__file__).resolve().parents[1]
 src_path = ROOT / "src"
 if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
+# The seeded benchmark corpus doubles as a fixture for parity tests.
+benchmarks_path = ROOT / "benchmarks"
+if str(benchmarks_path) not in sys.path:
+    sys.path.append(str(benchmarks_path))
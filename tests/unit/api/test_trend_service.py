@@ -1,8 +1,9 @@
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 
 import pytest
 
 from api.service import TrendService
+from trend.hll import HyperLogLog
 
 
 class FakeDB:
@@ -21,7 +22,7 @@ class FakeDB:
 @pytest.mark.asyncio
 async def test_trend_service_formats_rows() -> None:
     db = FakeDB()
-    now = datetime(2024, 1, 1, 0, 10, tzinfo=timezone.utc)
+    now = datetime(2024, 1, 1, 0, 10, tzinfo=UTC)
     db.seed(
         [
             {
@@ -30,7 +31,7 @@ async def test_trend_service_formats_rows() -> None:
                 "unique_authors": 10,
                 "avg_sentiment": 0.2,
                 "zscore": 3.0,
-                "first_seen": datetime(2024, 1, 1, 0, 5, tzinfo=timezone.utc),
+                "first_seen": datetime(2024, 1, 1, 0, 5, tzinfo=UTC),
                 "last_price": 14.5,
             }
         ]
@@ -43,3 +44,60 @@ async def test_trend_service_formats_rows() -> None:
     assert result[0]["mentions"] == 20
     assert result[0]["last_price"] == 14.5
     assert db.queries[0][1][1] == 5
+
+
+@pytest.mark.asyncio
+async def test_trend_service_merges_author_sketches_across_minutes() -> None:
+    class SketchDB(FakeDB):
+        async def fetch(self, query, *args):
+            self.queries.append((query.strip(), args))
+            if "authors_hll" not in query:
+                return self._rows
+            minutes = [
+                HyperLogLog.from_items(["u1", "u2", f"u{minute + 3}"]).to_bytes()
+                for minute in range(5)
+            ]
+            rows = [
+                {"ticker": "PLTR", "authors_hll": sketch, "unique_authors": 3} for sketch in minutes
+            ]
+            return [*rows, {"ticker": "PLTR", "authors_hll": None, "unique_authors": 2}]
+
+    db = SketchDB()
+    db.seed(
+        [
+            {
+                "ticker": "PLTR",
+                "mentions": 17,
+                "unique_authors": 17,
+                "avg_sentiment": 0.1,
+                "zscore": 2.0,
+                "first_seen": None,
+            }
+        ]
+    )
+    now = datetime(2024, 1, 1, 0, 10, tzinfo=UTC)
+    service = TrendService(db, now_fn=lambda: now)  # type: ignore[arg-type]
+
+    result = await service.top_trending(window="5m")
+
+    # u1/u2 post every minute: 7 distinct across the sketches, plus 2 from an unsketched minute.
+    assert result[0]["unique_authors"] == 9
+    assert db.queries[1][1][1] == ["PLTR"]
+
+
+@pytest.mark.asyncio
+async def test_trend_service_plans_long_windows_onto_rollups() -> None:
+    db = FakeDB()
+    now = datetime(2024, 1, 1, 12, 34, 56, tzinfo=UTC)
+    service = TrendService(db, now_fn=lambda: now)  # type: ignore[arg-type]
+
+    await service.top_trending(window="5m")
+    await service.top_trending(window="24h")
+
+    assert "FROM mentions_1m agg" in db.queries[0][0]
+    assert db.queries[0][1][0] == datetime(2024, 1, 1, 12, 29, 56, tzinfo=UTC)
+    assert "FROM mentions_1h agg" in db.queries[1][0]
+    assert db.queries[1][1][0] == datetime(2023, 12, 31, 12, 0, tzinfo=UTC)
+    # Both plans weight sentiment by mentions, so it does not jump at the table boundary.
+    assert "/ NULLIF(SUM(agg.mentions), 0)" in db.queries[0][0]
+    assert "AVG(" not in db.queries[0][0]
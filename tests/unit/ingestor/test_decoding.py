@@ -0,0 +1,49 @@
+import json
+from datetime import UTC, datetime
+
+from ingestor.decoding import decode_listing, record_from_json
+
+
+def test_decode_listing_keeps_stored_fields_and_cursor() -> None:
+    raw = json.dumps(
+        {
+            "data": {
+                "after": "t1_b",
+                "children": [
+                    {
+                        "kind": "t1",
+                        "data": {
+                            "id": "b",
+                            "author": None,
+                            "body": "$PLTR",
+                            "created_utc": 1704067200.0,
+                            "score": 3,
+                            "link_id": "t3_x",
+                            "all_awardings": [],
+                            "gildings": {},
+                        },
+                    },
+                    {"kind": "t1", "data": {"id": "a", "subreddit": "stocks"}},
+                ],
+            }
+        }
+    ).encode()
+
+    records, after = decode_listing(raw)
+
+    assert after == "t1_b"
+    assert [record.id for record in records] == ["b", "a"]
+    item = records[0].to_item("wallstreetbets")
+    assert item.author == "[deleted]"
+    assert item.subreddit == "wallstreetbets"
+    assert item.created_utc == datetime(2024, 1, 1, tzinfo=UTC)
+    assert item.link_id == "t3_x"
+    assert records[1].to_item("wallstreetbets").subreddit == "stocks"
+
+
+def test_record_from_json_matches_listing_decode() -> None:
+    record = record_from_json({"id": "c", "body": "hi", "created_utc": 5, "edited": False})
+
+    item = record.to_item("stocks")
+
+    assert (item.id, item.body, item.subreddit, item.score) == ("c", "hi", "stocks", 0)
@@ -0,0 +1,48 @@
+from ingestor.dedup import SeenIndex
+
+
+def test_seen_index_evicts_oldest_first() -> None:
+    index = SeenIndex(capacity=3)
+    for key in ("a", "b", "c", "d"):
+        assert index.add(key) is True
+
+    assert index.add("d") is False
+    assert "a" not in index
+    assert list(index) == ["b", "c", "d"]
+
+
+def test_bloom_filter_remembers_evicted_ids() -> None:
+    index = SeenIndex(capacity=2, bloom_bits=1024)
+    index.update(["a", "b", "c"])
+
+    assert len(index) == 2
+    assert "a" in index
+
+
+def test_snapshot_round_trip_preserves_order(tmp_path) -> None:
+    path = tmp_path / "seen.txt"
+    index = SeenIndex(capacity=5)
+    index.update(["x1", "x2", "x3"])
+    index.save(path)
+
+    restored = SeenIndex.load(path, capacity=2)
+
+    assert list(restored) == ["x2", "x3"]
+    assert SeenIndex.load(tmp_path / "missing.txt").add("x1") is True
+
+
+def test_bloom_filters_rotate_instead_of_saturating() -> None:
+    index = SeenIndex(capacity=2, bloom_bits=1024)
+    index.update(f"old{i}" for i in range(5_000))
+
+    assert "old4998" in index
+    assert not any(f"new{i}" in index for i in range(100))
+
+
+def test_snapshot_leaves_out_excluded_ids(tmp_path) -> None:
+    path = tmp_path / "seen.txt"
+    index = SeenIndex(capacity=5)
+    index.update(["x1", "x2", "x3"])
+    index.save(path, exclude={"x2"})
+
+    assert list(SeenIndex.load(path)) == ["x1", "x3"]
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+from common.models import RedditItem
+from ingestor.neardup import NearDuplicateDetector, NearDuplicateIndex, SimHasher
+
+PASTA = (
+    "What you guys are failing to understand is that GME is not a stock it is a movement "
+    "and we are not selling until the hedgies are bankrupt"
+)
+
+
+def make_item(body: str, minutes: int = 0) -> RedditItem:
+    return RedditItem(
+        id=str(minutes),
+        kind="comment",
+        subreddit="wallstreetbets",
+        author="u/test",
+        body=body,
+        created_utc=datetime(2024, 1, 1) + timedelta(minutes=minutes),
+        score=1,
+        permalink="",
+    )
+
+
+def test_simhash_keeps_near_duplicates_close() -> None:
+    hasher = SimHasher()
+    base = hasher.fingerprint(PASTA.lower().split())
+    edited = hasher.fingerprint((PASTA + " 🚀🚀 lol").lower().split()[:-1])
+    other = hasher.fingerprint(
+        "earnings call tomorrow, iv crush will eat both calls and puts alive".split()
+    )
+    assert (base ^ edited).bit_count() < (base ^ other).bit_count()
+    assert (base ^ other).bit_count() > 10
+
+
+def test_detector_flags_copypasta_but_not_short_or_distinct_text() -> None:
+    detector = NearDuplicateDetector(min_tokens=8)
+    assert not detector.is_duplicate(make_item(PASTA))
+    assert detector.is_duplicate(make_item(PASTA.upper() + "!!!", minutes=1))
+    assert not detector.is_duplicate(make_item("GME to the moon", minutes=2))
+    assert not detector.is_duplicate(make_item("GME to the moon", minutes=3))
+    distinct = make_item("bought the dip on AMC and it kept dipping, send help", minutes=4)
+    assert not detector.is_duplicate(distinct)
+    assert detector.snapshot() == {
+        "near_dup_checked": 3,
+        "near_dup_suppressed": 1,
+        "near_dup_too_short": 2,
+        "near_dup_window": 3,
+    }
+
+
+def test_index_window_evicts_by_capacity_and_age() -> None:
+    a, b, c, d = (0xFFFF << shift for shift in (0, 16, 32, 48))
+    index = NearDuplicateIndex(capacity=2, max_distance=3, window_seconds=60)
+    index.add(a, 0)
+    assert index.find(a ^ 0b101) == a
+    index.add(b, 10)
+    index.add(c, 20)
+    assert index.find(a) is None
+    index.add(d, 200)
+    assert len(index) == 1
+    assert index.find(c) is None
+    assert index.find(d ^ (1 << 63)) == d
+
+
+def test_index_ages_out_by_newest_time_for_out_of_order_items() -> None:
+    newer, older, newest = 0xFFFF_0000_FFFF_0000, 0, (1 << 64) - 1
+    index = NearDuplicateIndex(max_distance=3, window_seconds=3600)
+    index.add(newer, 5000)
+    index.add(older, 2000)  # a catch-up page, still inside the window
+    assert index.find(older) == older
+    index.add(newest, 6000)
+
+    assert index.find(older) is None
+    assert index.find(newer) == newer
+    assert len(index) == 2
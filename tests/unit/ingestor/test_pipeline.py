@@ -1,9 +1,12 @@
+import asyncio
 from datetime import datetime
 
 import pytest
 
 from common.config import RedditSettings
 from common.models import MentionEvent, RedditItem
+from ingestor.neardup import NearDuplicateDetector
+from ingestor.repository import MentionWriter
 from ingestor.service import RedditStreamIngestor
 from nlp.pipeline import MentionExtractor, SentimentAnnotator
 
@@ -15,22 +18,43 @@ ALIAS_MAP = {"palantir": "PLTR"}
 class FakeClient:
     def __init__(self, items: list[RedditItem]) -> None:
         self._items = items
+        self.done: list[str] = []
 
     async def stream_comments(self):  # type: ignore[override]
         for item in self._items:
             yield item
 
+    def mark_done(self, ids) -> None:
+        self.done.extend(ids)
 
-class InMemoryWriter:
+
+class InMemoryWriter(MentionWriter):
     def __init__(self) -> None:
         self.items: list[RedditItem] = []
         self.mentions: list[MentionEvent] = []
+        self.batches = 0
 
     async def persist(self, item: RedditItem, mentions: list[MentionEvent]) -> int:
         self.items.append(item)
         self.mentions.extend(mentions)
         return len(mentions)
 
+    async def persist_batch(self, batch):  # type: ignore[override]
+        self.batches += 1
+        return await super().persist_batch(batch)
+
+
+async def run_until_persisted(
+    ingestor: RedditStreamIngestor, writer: InMemoryWriter, count: int
+) -> None:
+    task = asyncio.create_task(ingestor.run())
+    for _ in range(500):
+        if len(writer.items) >= count:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
 
 def make_item(body: str) -> RedditItem:
     return RedditItem(
@@ -61,11 +85,14 @@ async def test_ingestor_handles_items_and_publishes_mentions() -> None:
     )
     ingestor = RedditStreamIngestor(extractor, annotator, writer, reddit_client=client, settings=settings)
 
-    count = await ingestor.handle_item(make_item("$PLTR is ripping"))
+    top_level = make_item("$PLTR is ripping").model_copy(update={"parent_id": "t3_p1"})
+    count = await ingestor.handle_item(top_level)
 
     assert count == 1
     assert len(writer.mentions) == 1
     assert writer.mentions[0].ticker == "PLTR"
+    assert writer.mentions[0].thread_id == "t3_p1"
+    assert ingestor.threads.get("t3_p1") is not None
 
 
 @pytest.mark.asyncio
@@ -91,3 +118,115 @@ async def test_fetch_items_streams_from_client() -> None:
         break
 
     assert items[0].id == item.id
+
+
+@pytest.mark.asyncio
+async def test_run_pipes_items_through_stages_and_records_stats() -> None:
+    extractor = MentionExtractor(TICKERS, STOPLIST, alias_map=ALIAS_MAP)
+    annotator = SentimentAnnotator()
+    writer = InMemoryWriter()
+    items = [make_item("$PLTR calls"), make_item("nothing here"), make_item("palantir to the moon")]
+    client = FakeClient(items)
+    settings = RedditSettings(
+        client_id="c",
+        client_secret="s",  # noqa: S106 - dummy test credentials
+        username="u",
+        password="p",  # noqa: S106 - dummy test credentials
+        user_agent="wsb",
+        subreddit="wallstreetbets",
+        poll_interval_seconds=60,
+    )
+    ingestor = RedditStreamIngestor(
+        extractor,
+        annotator,
+        writer,
+        reddit_client=client,
+        settings=settings,
+        batch_size=2,
+        flush_interval=0.01,
+    )
+
+    await run_until_persisted(ingestor, writer, len(items))
+
+    snapshot = ingestor.stats.snapshot()
+    assert len(writer.items) == 3
+    assert [m.ticker for m in writer.mentions] == ["PLTR", "PLTR"]
+    assert snapshot["items_persisted"] == 3
+    assert snapshot["mentions_persisted"] == 2
+    assert snapshot["fetch_queue_depth"] == 0
+    assert ingestor.stats.ingest_to_persist.count == 3
+    assert writer.batches == 2
+    assert sorted(client.done) == sorted(item.id for item in items)
+
+
+@pytest.mark.asyncio
+async def test_run_offloads_extraction_to_process_pool() -> None:
+    extractor = MentionExtractor(TICKERS, STOPLIST, alias_map=ALIAS_MAP)
+    writer = InMemoryWriter()
+    items = [make_item("$PLTR calls"), make_item("palantir puts")]
+    settings = RedditSettings(
+        client_id="c",
+        client_secret="s",  # noqa: S106 - dummy test credentials
+        username="u",
+        password="p",  # noqa: S106 - dummy test credentials
+        user_agent="wsb",
+        subreddit="wallstreetbets",
+        poll_interval_seconds=60,
+    )
+    ingestor = RedditStreamIngestor(
+        extractor,
+        SentimentAnnotator(),
+        writer,
+        reddit_client=FakeClient(items),
+        settings=settings,
+        flush_interval=0.01,
+        process_workers=1,
+    )
+
+    await run_until_persisted(ingestor, writer, len(items))
+
+    assert [m.ticker for m in writer.mentions] == ["PLTR", "PLTR"]
+    assert [m.option_side for m in writer.mentions] == [1, -1]
+
+
+@pytest.mark.asyncio
+async def test_run_once_returns_after_draining_a_single_pass() -> None:
+    extractor = MentionExtractor(TICKERS, STOPLIST, alias_map=ALIAS_MAP)
+    writer = InMemoryWriter()
+    items = [make_item("$PLTR calls"), make_item("nothing here")]
+    ingestor = RedditStreamIngestor(
+        extractor,
+        SentimentAnnotator(),
+        writer,
+        reddit_client=FakeClient(items),
+        settings=None,
+        flush_interval=0.01,
+    )
+
+    await asyncio.wait_for(ingestor.run(once=True), timeout=5)
+
+    assert len(writer.items) == 2
+    assert ingestor.stats.items_persisted == 2
+
+
+@pytest.mark.asyncio
+async def test_near_duplicates_skip_extraction() -> None:
+    pasta = "$PLTR is the future of defense software and the shorts have no idea what is coming"
+    writer = InMemoryWriter()
+    ingestor = RedditStreamIngestor(
+        MentionExtractor(TICKERS, STOPLIST, alias_map=ALIAS_MAP),
+        SentimentAnnotator(),
+        writer,
+        reddit_client=FakeClient(
+            [make_item(pasta), make_item(pasta + "!!"), make_item(pasta.lower())]
+        ),
+        settings=None,
+        flush_interval=0.01,
+        near_dups=NearDuplicateDetector(action="mark"),
+    )
+
+    await asyncio.wait_for(ingestor.run(once=True), timeout=5)
+
+    assert len(writer.items) == 3
+    assert [m.ticker for m in writer.mentions] == ["PLTR"]
+    assert ingestor.stats.snapshot()["items_suppressed"] == 2
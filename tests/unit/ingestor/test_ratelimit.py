@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from ingestor.ratelimit import RequestBudget
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_budget(clock: FakeClock, **kwargs) -> RequestBudget:
+    rng = random.Random(0)  # noqa: S311 - deterministic jitter
+    return RequestBudget(60, burst=5, clock=clock, rng=rng, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_headers_clamp_budget_and_reserve_it_for_priority_feed() -> None:
+    clock = FakeClock()
+    budget = make_budget(clock, reserve=2)
+
+    budget.update_from_headers({"x-ratelimit-remaining": "2", "x-ratelimit-reset": "30"})
+
+    assert budget.remaining == 2
+    assert budget._delay(priority=False) > 0
+    assert budget._delay(priority=True) == 0
+    await budget.acquire(priority=True)
+    assert budget.remaining == 1
+
+
+def test_exhausted_window_waits_for_reset() -> None:
+    clock = FakeClock()
+    budget = make_budget(clock)
+
+    budget.update_from_headers({"x-ratelimit-remaining": "0", "x-ratelimit-reset": "12"})
+
+    assert budget._delay(priority=True) == 12
+    clock.now = 13
+    assert budget._delay(priority=True) == 0
+
+
+def test_retry_after_and_failures_back_off_with_jitter() -> None:
+    clock = FakeClock()
+    budget = make_budget(clock)
+
+    delay = budget.throttled_response({"retry-after": "20"})
+
+    assert 20 <= delay <= 25
+    assert budget.throttled == 1
+    assert budget._delay(priority=True) == pytest.approx(delay)
+    clock.now = 30
+    assert 4 <= budget.backoff() <= 5
+
+
+def test_any_success_resets_the_failure_streak() -> None:
+    clock = FakeClock()
+    budget = make_budget(clock)
+
+    assert 2 <= budget.backoff() <= 2.5
+    assert 4 <= budget.backoff() <= 5
+    budget.update_from_headers({})
+    assert 8 <= budget.backoff() <= 10
+    budget.record_success()
+    assert 2 <= budget.backoff() <= 2.5
@@ -0,0 +1,201 @@
+import asyncio
+
+import httpx
+import pytest
+
+from common.config import RedditSettings
+from ingestor.ratelimit import RequestBudget
+from ingestor.reddit_client import RedditClient
+
+
+def make_settings(**overrides) -> RedditSettings:
+    values = dict(
+        client_id="c",
+        client_secret="s",  # noqa: S106 - dummy test credentials
+        username="u",
+        password="p",  # noqa: S106 - dummy test credentials
+        user_agent="wsb",
+        subreddit="wallstreetbets",
+        subreddits=["stocks", "wallstreetbets"],
+    )
+    values.update(overrides)
+    return RedditSettings(**values)
+
+
+def make_listing(ids: list[str], subreddit: str = "wallstreetbets") -> dict:
+    children = [
+        {
+            "kind": "t1",
+            "data": {
+                "id": comment_id,
+                "subreddit": subreddit,
+                "author": "u/test",
+                "body": "$PLTR to the moon",
+                "created_utc": 1704067200,
+                "score": 1,
+                "permalink": f"/r/{subreddit}/{comment_id}",
+                "link_id": "t3_abc",
+            },
+        }
+        for comment_id in ids
+    ]
+    return {"data": {"children": children}}
+
+
+def make_client(handler, **overrides) -> RedditClient:
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return RedditClient(make_settings(**overrides), http_client=http, budget=RequestBudget(6000))
+
+
+def test_feeds_include_main_subreddit_first_without_duplicates() -> None:
+    assert make_settings().feeds == ["wallstreetbets", "stocks"]
+
+
+@pytest.mark.asyncio
+async def test_poll_once_returns_unseen_comments_oldest_first() -> None:
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        return httpx.Response(200, json=make_listing(["c3", "c2", "c1"], "stocks"))
+
+    client = make_client(handler)
+
+    first = await client.poll_once("stocks")
+    second = await client.poll_once("stocks")
+
+    assert requested == ["/r/stocks/comments.json", "/r/stocks/comments.json"]
+    assert [item.id for item in first] == ["c1", "c2", "c3"]
+    assert first[0].subreddit == "stocks"
+    assert second == []
+    await client.close()
+
+
+def test_adapt_interval_speeds_up_busy_feeds_and_backs_off_quiet_ones() -> None:
+    client = make_client(lambda request: httpx.Response(200, json=make_listing([])))
+    busy = client.feeds["wallstreetbets"]
+    quiet = client.feeds["stocks"]
+
+    client._adapt_interval(busy, 100)
+    client._adapt_interval(quiet, 0)
+
+    assert busy.interval == 1.0
+    assert quiet.interval == 3.0
+    for _ in range(20):
+        client._adapt_interval(quiet, 0)
+    assert quiet.interval == 30.0
+
+
+@pytest.mark.asyncio
+async def test_poll_once_follows_after_cursor_until_previous_newest_id() -> None:
+    polls = iter(
+        [
+            {None: (["a1"], "t1_a1")},
+            {
+                None: (["a9", "a8"], "t1_a8"),
+                "t1_a8": (["a7", "a6"], "t1_a6"),
+                "t1_a6": (["a5", "a1"], "t1_a1"),
+            },
+        ]
+    )
+    current: dict = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids, after = current[request.url.params.get("after")]
+        listing = make_listing(ids)
+        listing["data"]["after"] = after
+        return httpx.Response(200, json=listing)
+
+    client = make_client(handler)
+    current = next(polls)
+    await client.poll_once("wallstreetbets")
+    current = next(polls)
+
+    items = await client.poll_once("wallstreetbets")
+
+    state = client.feeds["wallstreetbets"]
+    assert [item.id for item in items] == ["a5", "a6", "a7", "a8", "a9"]
+    assert state.last_recovered == 3
+    assert state.newest_id == "a9"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_poll_posts_builds_post_items_attributed_to_their_own_thread() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/r/wallstreetbets/new.json"
+        post = {
+            "id": "p1",
+            "title": "GME DD",
+            "selftext": "$GME float analysis",
+            "author": "u/dd",
+            "created_utc": 1704067200,
+            "link_flair_text": "DD",
+        }
+        return httpx.Response(200, json={"data": {"children": [{"kind": "t3", "data": post}]}})
+
+    client = make_client(handler)
+
+    posts = await client.poll_posts("wallstreetbets")
+    again = await client.poll_posts("wallstreetbets")
+
+    assert [(p.kind, p.id, p.link_id, p.flair) for p in posts] == [
+        ("post", "t3_p1", "t3_p1", "DD")
+    ]
+    assert posts[0].body.startswith("GME DD")
+    assert again == []
+    assert set(client.post_feeds) == {"wallstreetbets", "stocks"}
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_only_keeps_ids_the_pipeline_has_written(tmp_path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=make_listing(["c2", "c1"]))
+
+    path = tmp_path / "seen.txt"
+    client = make_client(handler, subreddits=[], seen_snapshot_path=str(path))
+    queue: asyncio.Queue = asyncio.Queue()
+    poller = asyncio.create_task(client._poll_feed(client.feeds["wallstreetbets"], queue))
+    first = await queue.get()
+    await queue.get()
+    poller.cancel()
+    await asyncio.gather(poller, return_exceptions=True)
+
+    client.mark_done([first.id])
+    await client.close()
+
+    assert path.read_text().split() == ["c1"]
+
+
+async def _poll_until_failed(client: RedditClient, subreddit: str) -> None:
+    poller = asyncio.create_task(client._poll_feed(client.feeds[subreddit], asyncio.Queue()))
+    for _ in range(20):
+        await asyncio.sleep(0)
+    poller.cancel()
+    await asyncio.gather(poller, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_feed_specific_errors_back_off_only_that_feed() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"<html>not a listing</html>")
+
+    client = make_client(handler, poll_interval_seconds=5)
+    await _poll_until_failed(client, "stocks")
+
+    assert client.feeds["stocks"].interval == 10
+    assert client.feeds["wallstreetbets"].interval == 5
+    assert client.budget._blocked_until == 0.0
+
+
+@pytest.mark.asyncio
+async def test_server_errors_back_off_every_feed() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    client = make_client(handler, poll_interval_seconds=5)
+    await _poll_until_failed(client, "stocks")
+
+    assert client.feeds["stocks"].interval == 5
+    assert client.budget._blocked_until > 0.0
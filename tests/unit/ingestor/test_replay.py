@@ -0,0 +1,62 @@
+import gzip
+import json
+
+import pytest
+
+from ingestor.replay import ReplayRedditClient
+
+
+def make_comment(comment_id: str, created: int) -> dict:
+    return {
+        "id": comment_id,
+        "subreddit": "wallstreetbets",
+        "author": "u/test",
+        "body": "$PLTR calls",
+        "created_utc": created,
+        "permalink": f"/r/wallstreetbets/{comment_id}",
+    }
+
+
+@pytest.mark.asyncio
+async def test_replay_reads_listing_pages_and_gzipped_ndjson(tmp_path) -> None:
+    page = tmp_path / "comments.json"
+    page.write_text(
+        json.dumps(
+            {
+                "data": {
+                    "children": [
+                        {"kind": "t1", "data": make_comment("b", 20)},
+                        {"kind": "t1", "data": make_comment("a", 10)},
+                    ]
+                }
+            }
+        )
+    )
+    dump = tmp_path / "dump.ndjson.gz"
+    with gzip.open(dump, "wt") as handle:
+        handle.write(json.dumps(make_comment("c", 30)) + "\n\n")
+        handle.write(json.dumps({"kind": "t1", "data": make_comment("d", 40)}) + "\n")
+
+    client = ReplayRedditClient([page, dump])
+    ids = [item.id async for item in client.stream_comments()]
+
+    assert ids == ["a", "b", "c", "d"]
+    assert client.items_replayed == 4
+
+
+@pytest.mark.asyncio
+async def test_replay_paces_by_created_utc(tmp_path) -> None:
+    dump = tmp_path / "dump.ndjson"
+    lines = (json.dumps(make_comment(cid, ts)) for cid, ts in (("a", 0), ("b", 10)))
+    dump.write_text("\n".join(lines) + "\n")
+    delays: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        delays.append(seconds)
+
+    client = ReplayRedditClient([dump], speed=10.0, sleep=fake_sleep)
+    items = [item async for item in client.stream_comments()]
+
+    assert len(items) == 2
+    assert len(delays) == 1
+    assert 0.9 < delays[0] <= 1.0
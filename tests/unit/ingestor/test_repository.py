@@ -1,15 +1,34 @@
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 import pytest
+from pydantic import ValidationError
 
-from common.models import MentionEvent, RedditItem
+from common.models import MentionEvent, MentionRecord, RedditItem
 from ingestor.repository import MentionRepository
 
 
+class FakeConnection:
+    def __init__(self, log: list) -> None:
+        self._log = log
+
+    async def execute(self, query, *args):
+        self._log.append(("execute", query.strip(), args))
+
+    async def copy_records_to_table(self, table, records, columns):
+        self._log.append(("copy", table, list(records)))
+
+
 class FakeDB:
     def __init__(self) -> None:
         self.executed: list[tuple[str, object]] = []
         self.prices: dict[tuple[str, datetime], float] = {}
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.transactions += 1
+        yield FakeConnection(self.executed)
 
     async def execute(self, query, *args):
         self.executed.append(("execute", query.strip(), args))
@@ -77,3 +96,56 @@ async def test_repository_persists_item_and_mentions():
     assert "INSERT INTO reddit_items" in db.executed[0][1]
     assert db.executed[1][0] == "executemany"
     assert "INSERT INTO mention_events" in db.executed[1][1]
+
+
+@pytest.mark.asyncio
+async def test_persist_batch_copies_deduplicated_rows_in_one_transaction():
+    db = FakeDB()
+    price_service = FakePriceService()
+    repo = MentionRepository(db, price_service=price_service)  # type: ignore[arg-type]
+    item = make_item()
+    updated = make_mention()
+    updated.sentiment_score = -0.5
+
+    count = await repo.persist_batch([(item, [make_mention()]), (item, [updated])])
+
+    copies = [entry for entry in db.executed if entry[0] == "copy"]
+    assert count == 1
+    assert db.transactions == 1
+    assert [entry[1] for entry in copies] == ["_stage_reddit_items", "_stage_mention_events"]
+    assert len(copies[0][2]) == 1
+    assert copies[1][2][0][10] == -0.5
+    assert copies[1][2][0][8] == 10.0
+    assert len(price_service.calls) == 1
+    executed = [entry[1] for entry in db.executed if entry[0] == "execute"]
+    assert any("INSERT INTO mention_events" in query for query in executed)
+
+
+@pytest.mark.asyncio
+async def test_both_write_paths_store_the_resolved_thread_id():
+    db = FakeDB()
+    repo = MentionRepository(db, price_service=FakePriceService())  # type: ignore[arg-type]
+    mention = make_mention()
+    mention.thread_id = "t3_p1"
+
+    await repo.persist(make_item(), [mention])
+    await repo.persist_batch([(make_item(), [mention])])
+
+    (many,) = [entry for entry in db.executed if entry[0] == "executemany"]
+    copied = [entry for entry in db.executed if entry[0] == "copy"][1]
+    assert "thread_id" in many[1]
+    assert many[2][0][-1] == "t3_p1"
+    assert copied[2][0][-1] == "t3_p1"
+
+
+@pytest.mark.asyncio
+async def test_persist_batch_validates_hot_path_records_before_writing():
+    db = FakeDB()
+    repo = MentionRepository(db)  # type: ignore[arg-type]
+    record = MentionRecord.from_event(make_mention())
+    record.sentiment_score = 3.0
+
+    with pytest.raises(ValidationError):
+        await repo.persist_batch([(make_item(), [record])])
+
+    assert db.transactions == 0
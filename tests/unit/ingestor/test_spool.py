@@ -0,0 +1,146 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from common.models import MentionEvent, MentionRecord, RedditItem
+from ingestor.repository import MentionWriter
+from ingestor.spool import DiskSpool, SpoolingMentionWriter, SpoolRecord
+
+
+class FlakyWriter(MentionWriter):
+    def __init__(self) -> None:
+        self.down = False
+        self.poison: set[str] = set()
+        self.items: list[str] = []
+
+    async def persist(self, item, mentions):  # type: ignore[override]
+        if self.down or item.id in self.poison:
+            raise ConnectionError("db unavailable")
+        self.items.append(item.id)
+        return len(mentions)
+
+    async def persist_batch(self, batch):  # type: ignore[override]
+        if self.down or any(item.id in self.poison for item, _ in batch):
+            raise ConnectionError("db unavailable")
+        return await super().persist_batch(batch)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_item(item_id: str) -> RedditItem:
+    return RedditItem(
+        id=item_id,
+        kind="comment",
+        subreddit="wallstreetbets",
+        author="u/test",
+        body="$PLTR",
+        created_utc=datetime(2024, 1, 1, 0, 0, 0),
+        permalink=f"https://reddit.com/{item_id}",
+    )
+
+
+def make_mention(item_id: str) -> MentionEvent:
+    return MentionEvent(
+        ts_utc=datetime(2024, 1, 1, 0, 0, 0),
+        subreddit="wallstreetbets",
+        reddit_id=item_id,
+        author="u/test",
+        ticker="PLTR",
+        confidence=0.9,
+    )
+
+
+def make_writer(
+    tmp_path, inner: MentionWriter, clock: FakeClock, **kwargs
+) -> SpoolingMentionWriter:
+    spool = DiskSpool(tmp_path / "spool", segment_max_bytes=200)
+    return SpoolingMentionWriter(inner, spool, tmp_path / "dlq.ndjson", clock=clock, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_spooled_and_replayed_when_db_returns(tmp_path) -> None:
+    inner = FlakyWriter()
+    clock = FakeClock()
+    writer = make_writer(tmp_path, inner, clock)
+
+    inner.down = True
+    batch = [(make_item("a"), [make_mention("a")]), (make_item("b"), [])]
+    assert await writer.persist_batch(batch) == 0
+    inner.down = False
+    assert await writer.persist(make_item("c"), []) == 0
+    assert writer.spool_depth == 3
+    assert len(list((tmp_path / "spool").glob("spool-*.ndjson"))) >= 2
+
+    clock.now = 10
+    await writer.persist(make_item("d"), [])
+
+    assert inner.items == ["a", "b", "c", "d"]
+    assert writer.spool_depth == 0
+    assert writer.snapshot()["replayed"] == 3
+    assert not list((tmp_path / "spool").glob("spool-*.ndjson"))
+    restarted = DiskSpool(tmp_path / "spool")
+    assert restarted.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_poison_records_move_to_dead_letter_file(tmp_path) -> None:
+    inner = FlakyWriter()
+    clock = FakeClock()
+    writer = make_writer(tmp_path, inner, clock, retry_interval=0, max_attempts=2)
+    inner.poison.add("bad")
+
+    await writer.persist_batch([(make_item("ok"), []), (make_item("bad"), [])])
+    await writer.persist(make_item("x"), [])
+    assert writer.spool_depth == 2
+    await writer.persist(make_item("y"), [])
+
+    assert inner.items == ["ok", "x", "y"]
+    assert writer.spool_depth == 0
+    assert writer.stats.dead_lettered == 1
+    assert '"id": "bad"' in (tmp_path / "dlq.ndjson").read_text()
+
+
+@pytest.mark.asyncio
+async def test_outages_during_replay_do_not_count_as_attempts(tmp_path) -> None:
+    inner = FlakyWriter()
+    clock = FakeClock()
+    writer = make_writer(tmp_path, inner, clock, retry_interval=0, max_attempts=1)
+
+    inner.down = True
+    await writer.persist(make_item("a"), [])
+    await writer.persist(make_item("b"), [])
+    await writer.persist(make_item("c"), [])
+    assert writer.spool_depth == 3
+    inner.down = False
+    await writer.persist(make_item("d"), [])
+
+    assert inner.items == ["a", "b", "c", "d"]
+    assert writer.stats.dead_lettered == 0
+
+
+def test_spool_record_validates_hot_path_records() -> None:
+    record = MentionRecord.from_event(make_mention("a"))
+    restored = SpoolRecord.from_json(SpoolRecord(make_item("a"), [record]).to_json())
+    assert restored.mentions == [record.to_event()]
+
+
+def test_rewrite_fsyncs_the_new_segment_before_replacing(tmp_path, monkeypatch) -> None:
+    spool = DiskSpool(tmp_path / "spool")
+    spool.append([SpoolRecord(item=make_item("a"), mentions=[])])
+    path = spool.segments()[0]
+    events: list[str] = []
+    fsync, replace = os.fsync, os.replace
+    monkeypatch.setattr(os, "fsync", lambda fd: (events.append("fsync"), fsync(fd))[1])
+    monkeypatch.setattr(os, "replace", lambda *a: (events.append("replace"), replace(*a))[1])
+
+    spool.rewrite(path, [SpoolRecord(item=make_item("b"), mentions=[])])
+
+    assert events == ["fsync", "replace"]
+    assert [record.item.id for record in spool.read(path)] == ["b"]
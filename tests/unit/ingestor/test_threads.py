@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from common.models import RedditItem
+from ingestor.threads import ThreadCache
+
+
+def make_item(item_id: str, kind: str, link_id: str, **extra) -> RedditItem:
+    return RedditItem(
+        id=item_id,
+        kind=kind,
+        subreddit="wallstreetbets",
+        author="u/test",
+        body="body",
+        created_utc=datetime(2024, 1, 1, 0, 0, 0),
+        permalink=f"https://reddit.com/{item_id}",
+        link_id=link_id,
+        **extra,
+    )
+
+
+def test_comments_resolve_to_cached_threads() -> None:
+    cache = ThreadCache()
+    cache.observe(make_item("p1", "post", "t3_p1", title="GME deep value", flair="DD"))
+
+    info = cache.observe(make_item("c1", "comment", "t3_p1"))
+    cache.observe(make_item("c2", "comment", "t3_zz"))
+    cache.observe(make_item("c3", "comment", "t3_zz"))
+
+    assert info is not None and info.is_dd and info.comments_seen == 1
+    assert (cache.hits, cache.misses, cache.dd_posts) == (2, 1, 1)
+
+
+def test_cache_evicts_least_recently_used_and_warms_from_rows() -> None:
+    cache = ThreadCache(capacity=2)
+    cache.warm(
+        [
+            {"id": "t3_a", "body": "[DD] AMC\n\ntext", "subreddit": "wallstreetbets"},
+            {"id": "t3_b", "body": "meme"},
+        ]
+    )
+    cache.get("t3_a")
+    cache.observe(make_item("c", "post", "t3_c"))
+
+    assert cache.get("t3_b") is None
+    warmed = cache.get("t3_a")
+    assert warmed is not None and warmed.is_dd and warmed.subreddit == "wallstreetbets"
+    assert cache.evictions == 1
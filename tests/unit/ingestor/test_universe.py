@@ -0,0 +1,64 @@
+import pickle
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from common.models import RedditItem
+from ingestor.universe import CsvUniverseSource, TickerMasterSource, UniverseManager
+from nlp.pipeline import MentionExtractor
+
+
+def make_item(body: str) -> RedditItem:
+    return RedditItem(
+        id="t1",
+        kind="comment",
+        subreddit="wallstreetbets",
+        author="u/test",
+        body=body,
+        created_utc=datetime(2024, 1, 1),
+        score=1,
+        permalink="",
+    )
+
+
+@pytest.mark.asyncio
+async def test_csv_change_swaps_matcher_and_versions_mentions(tmp_path: Path) -> None:
+    path = tmp_path / "tickers.csv"
+    path.write_text("symbol,exchange,name\nGME,NYSE,GameStop\n", encoding="utf-8")
+    extractor = MentionExtractor((), set())
+    swaps: list[int] = []
+    manager = UniverseManager(
+        CsvUniverseSource(path), extractor, on_swap=swaps.append, clock=lambda: 1000.0
+    )
+
+    assert await manager.refresh() is True
+    assert await manager.refresh() is False
+    body = "GME and RDDT, reddit ipo"
+    mentions = extractor.extract(make_item(body)).mentions
+    assert [(m.ticker, m.universe_version) for m in mentions] == [("GME", 1000)]
+
+    path.write_text(
+        "symbol,exchange,name,aliases\nGME,NYSE,GameStop,\nRDDT,NYSE,Reddit,reddit|reddit inc\n",
+        encoding="utf-8",
+    )
+    assert await manager.refresh() is True
+    mentions = extractor.extract(make_item(body)).mentions
+    assert [(m.ticker, m.universe_version) for m in mentions] == [("GME", 1001), ("RDDT", 1001)]
+    assert swaps == [1000, 1001]
+    assert manager.snapshot()["universe_aliases"] == 2
+
+    clone = pickle.loads(pickle.dumps(extractor))  # noqa: S301 - round-trips our own object
+    assert [m.ticker for m in clone.extract(make_item("reddit inc")).mentions] == ["RDDT"]
+
+
+@pytest.mark.asyncio
+async def test_ticker_master_source_reads_active_symbols() -> None:
+    class FakeDB:
+        async def fetch(self, query: str, *args) -> list[dict]:
+            assert "is_active" in query
+            return [{"symbol": "pltr"}, {"symbol": "AMC"}]
+
+    snapshot = await TickerMasterSource(FakeDB(), {"palantir": "PLTR"}).load()
+    assert snapshot.tickers == {"PLTR", "AMC"}
+    assert snapshot.aliases == {"palantir": "PLTR"}
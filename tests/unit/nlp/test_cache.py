@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from common.models import MentionEvent
+from nlp.cache import SpanCache
+from nlp.pipeline import SentimentAnnotator
+from nlp.scoring import LexiconScorer
+
+
+def make_mention(span_text: str) -> MentionEvent:
+    return MentionEvent(
+        ts_utc=datetime(2024, 1, 1),
+        subreddit="wallstreetbets",
+        reddit_id="t1",
+        author="u/test",
+        ticker="GME",
+        confidence=1.0,
+        upvotes=1,
+        span_text=span_text,
+    )
+
+
+def test_span_cache_evicts_lru_by_entries_and_bytes() -> None:
+    cache: SpanCache[int] = SpanCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses, cache.evictions, len(cache)) == (1, 1, 1, 2)
+
+    tiny: SpanCache[int] = SpanCache(max_entries=100, max_bytes=500)
+    for idx in range(10):
+        tiny.put(f"span {idx}", idx)
+    assert 0 < tiny.bytes <= 500
+    assert tiny.evictions == 10 - len(tiny)
+
+
+def test_cached_annotation_matches_uncached() -> None:
+    spans = [
+        "GME to the moon 🚀🚀",
+        "gme TO THE MOON",
+        "AMC puts are printing",
+        "GME to the moon",
+    ] * 3
+    uncached = SentimentAnnotator(scorer=LexiconScorer()).annotate(
+        [make_mention(span) for span in spans]
+    )
+    cache: SpanCache[tuple[float, int]] = SpanCache()
+    cached_annotator = SentimentAnnotator(scorer=LexiconScorer(), cache=cache)
+    cached = cached_annotator.annotate([make_mention(span) for span in spans[:6]])
+    cached = [*cached, *cached_annotator.annotate([make_mention(span) for span in spans[6:]])]
+    assert [m.model_dump() for m in cached] == [m.model_dump() for m in uncached]
+    assert (cache.misses, cache.hits, len(cache)) == (2, 6, 2)
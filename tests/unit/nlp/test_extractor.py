@@ -1,6 +1,9 @@
 from datetime import datetime
 
-from common.models import RedditItem
+import pytest
+from pydantic import ValidationError
+
+from common.models import MentionRecord, RedditItem
 from nlp.pipeline import MentionExtractor
 
 DEFAULT_TICKERS = {"PLTR", "AAPL", "AMC", "A"}
@@ -45,3 +48,35 @@ def test_alias_map_converts_company_names() -> None:
     result = extractor.extract(make_item("Palantir is ripping"))
     tickers = [m.ticker for m in result.mentions]
     assert tickers == ["PLTR"]
+
+
+def test_multi_word_alias_matches() -> None:
+    extractor = MentionExtractor(
+        DEFAULT_TICKERS | {"AMD"},
+        STOPLIST,
+        alias_map={"advanced micro devices": "AMD", "advanced": "AAPL"},
+    )
+    result = extractor.extract(make_item("Advanced Micro Devices earnings beat"))
+    assert [(m.ticker, m.confidence) for m in result.mentions] == [("AMD", 0.65)]
+
+
+def test_extract_batch_matches_per_item_extraction() -> None:
+    extractor = MentionExtractor(DEFAULT_TICKERS, STOPLIST, alias_map=ALIAS_MAP, context_window=2)
+    bodies = ["A is awesome", "buy A now calls", "calls x y A", "$AMC and Palantir", ""]
+    batch = extractor.extract_batch([make_item(body) for body in bodies])
+    tickers = [[m.ticker for m in result.mentions] for result in batch]
+    assert tickers == [[], ["A"], [], ["AMC", "PLTR"], []]
+    for body, result in zip(bodies, batch, strict=True):
+        single = extractor.extract(make_item(body))
+        assert [m.span_text for m in single.mentions] == [m.span_text for m in result.mentions]
+
+
+def test_mentions_are_records_validated_on_conversion() -> None:
+    extractor = MentionExtractor(DEFAULT_TICKERS, STOPLIST, alias_map=ALIAS_MAP)
+    record = extractor.extract(make_item("$PLTR to the moon")).mentions[0]
+    assert isinstance(record, MentionRecord)
+    event = record.to_event()
+    assert MentionRecord.from_event(event) == record
+    record.confidence = 1.5
+    with pytest.raises(ValidationError):
+        record.to_event()
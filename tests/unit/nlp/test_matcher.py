@@ -0,0 +1,31 @@
+from nlp.matcher import TickerMatcher, tokenize
+
+
+def scan(matcher: TickerMatcher, text: str) -> list[tuple[str, str, int, int]]:
+    tokens, lowered = tokenize(text)
+    return [(m.ticker, m.kind, m.start, m.end) for m in matcher.scan(tokens, lowered)]
+
+
+def test_scan_resolves_cashtags_symbols_and_aliases_in_order() -> None:
+    matcher = TickerMatcher({"GME", "PLTR", "AMD"}, {"game stop": "GME", "palantir": "PLTR"})
+    assert scan(matcher, "$amd then Game Stop and PLTR; game over") == [
+        ("AMD", "cashtag", 0, 1),
+        ("GME", "alias", 2, 4),
+        ("PLTR", "symbol", 5, 6),
+    ]
+
+
+def test_longest_alias_wins_and_unknown_symbols_are_dropped() -> None:
+    matcher = TickerMatcher({"BAC"}, {"bank": "BAC", "bank of america": "BAC", "tesla": "TSLA"})
+    assert matcher.alias_count == 2
+    assert scan(matcher, "bank of america vs tesla vs bank") == [
+        ("BAC", "alias", 0, 3),
+        ("BAC", "alias", 6, 7),
+    ]
+
+
+def test_tokenize_skips_non_ascii_letters() -> None:
+    # KELVIN SIGN lowercases to "k"; it must not be glued onto the ASCII token.
+    tokens, lowered = tokenize("K\u212a GME")
+    assert tokens == ["K", "GME"]
+    assert lowered == ["k", "gme"]
@@ -0,0 +1,51 @@
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from common.models import MentionEvent
+from nlp.pipeline import SentimentAnnotator
+from nlp.scoring import BlendedScorer, HashedLinearScorer, LexiconScorer, load_scorer
+
+
+def test_lexicon_scorer_handles_negation_and_boosters() -> None:
+    scorer = LexiconScorer()
+    plain, negated, boosted = scorer.score_batch(
+        [["gme", "to", "the", "moon"], ["not", "going", "to", "moon"], ["super", "moon"]]
+    )
+    assert 0 < plain < boosted < 1
+    assert negated < 0
+
+
+def test_linear_scorer_batch_matches_single_span_scoring(tmp_path: Path) -> None:
+    weights = np.random.default_rng(3).normal(size=1 << 12).astype(np.float32)
+    scorer = HashedLinearScorer(weights, bias=0.1)
+    spans = [["pltr", "calls", "printing"], [], ["bag", "holder"], ["moon"]]
+    batch = scorer.score_batch(spans)
+    singles = [scorer.score_batch([span])[0] for span in spans]
+    np.testing.assert_allclose(batch, singles, rtol=1e-6)
+    assert batch[1] == np.tanh(0.1)
+
+    path = tmp_path / "weights.npz"
+    scorer.save(path)
+    np.testing.assert_allclose(HashedLinearScorer.load(path).score_batch(spans), batch, rtol=1e-6)
+    blended = load_scorer(path, linear_weight=0.25).score_batch(spans)
+    expected = 0.75 * LexiconScorer().score_batch(spans) + 0.25 * batch
+    np.testing.assert_allclose(blended, np.clip(expected, -1, 1), rtol=1e-6)
+
+
+def test_annotator_uses_pluggable_scorer() -> None:
+    mention = MentionEvent(
+        ts_utc=datetime(2024, 1, 1),
+        subreddit="wallstreetbets",
+        reddit_id="t1",
+        author="u/test",
+        ticker="AMC",
+        confidence=1.0,
+        upvotes=1,
+        span_text="AMC is not going to moon, buying puts",
+    )
+    annotator = SentimentAnnotator(scorer=BlendedScorer([(LexiconScorer(), 1.0)]))
+    annotated = annotator.annotate([mention])[0]
+    assert annotated.sentiment_label == -1
+    assert annotated.option_side == -1
@@ -1,7 +1,11 @@
+from dataclasses import replace
 from datetime import datetime
 
-from common.models import MentionEvent
-from nlp.pipeline import SentimentAnnotator
+import pytest
+from corpus import ALIASES, STOPLIST, TICKERS, make_corpus
+
+from common.models import MentionEvent, RedditItem
+from nlp.pipeline import MentionExtractor, SentimentAnnotator
 
 
 def make_mention(span_text: str) -> MentionEvent:
@@ -41,3 +45,63 @@ def test_neutral_span_stays_zero() -> None:
     annotated = annotator.annotate([mention])[0]
     assert annotated.sentiment_label == 0
     assert annotated.has_options_intent is False
+
+
+def test_token_spans_from_extractor_match_span_text_scoring() -> None:
+    item = RedditItem(
+        id="t1",
+        kind="comment",
+        subreddit="wallstreetbets",
+        author="u/test",
+        body="PLTR calls and AMC puts, bearish on AMC but moon for PLTR",
+        created_utc=datetime(2024, 1, 1, 0, 0, 0),
+        score=1,
+        permalink="",
+    )
+    extraction = MentionExtractor({"PLTR", "AMC"}, set(), span_window=3).extract(item)
+    annotator = SentimentAnnotator()
+    shared = annotator.annotate([replace(m) for m in extraction.mentions], extraction.token_spans)
+    resplit = annotator.annotate([replace(m) for m in extraction.mentions])
+    assert list(shared) == list(resplit)
+    assert [(m.ticker, m.option_side) for m in shared] == [("PLTR", 1), ("AMC", -1)]
+
+
+def assert_token_spans_match_span_text(extractor: MentionExtractor, items) -> list:
+    annotator = SentimentAnnotator()
+    shared: list = []
+    resplit: list = []
+    for extraction in extractor.extract_batch(items):
+        mentions = extraction.mentions
+        shared += annotator.annotate([replace(m) for m in mentions], extraction.token_spans)
+        resplit += annotator.annotate([replace(m) for m in mentions])
+    assert shared == resplit
+    return shared
+
+
+def test_token_spans_match_span_text_over_the_bench_corpus() -> None:
+    extractor = MentionExtractor(TICKERS, STOPLIST, alias_map=ALIASES)
+    mentions = assert_token_spans_match_span_text(extractor, make_corpus(500))
+    assert any(m.has_options_intent for m in mentions)
+
+
+def test_token_spans_split_dollars_and_digits_like_span_text() -> None:
+    bodies = ["x2calls $moon GME", "$GME puts4days", "moon$ $calls GME"]
+    items = [
+        RedditItem(
+            id=f"t{idx}",
+            kind="comment",
+            subreddit="wallstreetbets",
+            author="u/test",
+            body=body,
+            created_utc=datetime(2024, 1, 1, 0, 0, 0),
+            score=1,
+            permalink="",
+        )
+        for idx, body in enumerate(bodies)
+    ]
+    mentions = assert_token_spans_match_span_text(MentionExtractor({"GME"}, set()), items)
+    assert [(m.sentiment_score, m.option_side) for m in mentions] == [
+        (pytest.approx(0.5), 1),
+        (pytest.approx(-0.3), -1),
+        (pytest.approx(0.5), 1),
+    ]
@@ -1,9 +1,9 @@
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 
 import pytest
 
 from common.models import MinuteAggregation
-from trend.aggregator import AggregationRepository
+from trend.aggregator import AggregationRepository, MentionsAggregator
 
 
 class FakeDB:
@@ -16,13 +16,17 @@ class FakeDB:
     async def fetch(self, query, arg):
         return []
 
+    async def execute(self, query, *args):
+        self.executed.append((query.strip(), list(args)))
+        return "INSERT 0 3"
+
 
 @pytest.mark.asyncio
 async def test_upsert_writes_rows() -> None:
     db = FakeDB()
     repo = AggregationRepository(db)  # type: ignore[arg-type]
     agg = MinuteAggregation(
-        ts_utc=datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc),
+        ts_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
         ticker="PLTR",
         mentions=5,
         unique_authors=3,
@@ -38,3 +42,72 @@ async def test_upsert_writes_rows() -> None:
     assert len(db.executed) == 1
     assert "INSERT INTO mentions_1m" in db.executed[0][0]
     assert db.executed[0][1][0][1] == "PLTR"
+
+
+@pytest.mark.asyncio
+async def test_rollup_since_pushes_down_from_a_whole_minute() -> None:
+    db = FakeDB()
+    repo = AggregationRepository(db)  # type: ignore[arg-type]
+
+    buckets = await repo.rollup_since(datetime(2024, 1, 1, 0, 5, 42, tzinfo=UTC))
+
+    assert buckets == 3
+    query, args = db.executed[0]
+    assert "GROUP BY" in query and "ON CONFLICT (ticker, ts_utc)" in query
+    assert "THEN mentions_1m.authors_hll" in query
+    assert args == [datetime(2024, 1, 1, 0, 5, tzinfo=UTC)]
+
+
+@pytest.mark.asyncio
+async def test_streamed_mentions_fold_chunk_by_chunk() -> None:
+    class StreamDB(FakeDB):
+        def __init__(self) -> None:
+            super().__init__()
+            self.prefetch = None
+
+        async def stream(self, query, since, prefetch):
+            self.prefetch = prefetch
+            for minute in (0, 0, 1):
+                yield [
+                    {
+                        "ts_utc": datetime(2024, 1, 1, 0, minute, 30, tzinfo=UTC),
+                        "subreddit": "wallstreetbets",
+                        "reddit_id": f"c{minute}",
+                        "author": "alice",
+                        "thread_id": "t3_a",
+                        "ticker": "PLTR",
+                        "confidence": 0.9,
+                        "sentiment_score": None,
+                    }
+                ]
+
+    db = StreamDB()
+    repo = AggregationRepository(db)  # type: ignore[arg-type]
+    aggregator = MentionsAggregator(repo)
+
+    stream = repo.iter_mentions_since(datetime(2024, 1, 1, tzinfo=UTC), prefetch=2)
+    mentions = await aggregator.extend_chunks(stream)
+    buckets = await aggregator.flush()
+
+    assert (mentions, buckets, db.prefetch) == (3, 2, 2)
+    assert [row[2] for row in db.executed[0][1]] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_extend_chunks_closes_the_stream_when_folding_fails() -> None:
+    class BrokenStreamDB(FakeDB):
+        closed = False
+
+        async def stream(self, query, since, prefetch):
+            try:
+                yield [{"ts_utc": None}]
+                yield []
+            finally:
+                BrokenStreamDB.closed = True
+
+    repo = AggregationRepository(BrokenStreamDB())  # type: ignore[arg-type]
+
+    with pytest.raises(KeyError):
+        await MentionsAggregator(repo).extend_chunks(repo.iter_mentions_since(datetime(2024, 1, 1)))
+
+    assert BrokenStreamDB.closed
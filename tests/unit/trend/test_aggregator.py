@@ -1,9 +1,9 @@
-from datetime import datetime, timezone
+from datetime import UTC, datetime, timedelta
 
 import pytest
 
-from common.models import MentionEvent, MinuteAggregation
-from trend.aggregator import MentionsAggregator, MinuteAggregationWriter
+from common.models import MentionEvent, MentionRecord, MinuteAggregation
+from trend.aggregator import IncrementalAggregator, MentionsAggregator, MinuteAggregationWriter
 
 
 class FakeWriter(MinuteAggregationWriter):
@@ -37,7 +37,7 @@ def make_mention(ts: datetime, ticker: str, author: str, thread_id: str) -> Ment
 async def test_mentions_aggregator_groups_by_minute() -> None:
     writer = FakeWriter()
     aggregator = MentionsAggregator(writer)
-    base = datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc)
+    base = datetime(2024, 1, 1, 0, 0, tzinfo=UTC)
     aggregator.add(make_mention(base, "PLTR", "u1", "t1"))
     aggregator.add(make_mention(base.replace(second=30), "PLTR", "u2", "t2"))
     aggregator.add(make_mention(base.replace(minute=1), "AAPL", "u1", "t3"))
@@ -49,3 +49,78 @@ async def test_mentions_aggregator_groups_by_minute() -> None:
     assert first.mentions == 2
     assert first.unique_authors == 2
     assert first.threads_touched == 2
+
+
+class FakeRowSource(FakeWriter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows: dict[str, tuple[datetime, MentionRecord]] = {}
+        self.upserts: list[list[MinuteAggregation]] = []
+
+    async def upsert(self, aggregations):  # type: ignore[override]
+        self.upserts.append(list(aggregations))
+
+    async def fetch_changed_minutes(self, changed_since, since):  # type: ignore[no-untyped-def]
+        def key(mention):  # type: ignore[no-untyped-def]
+            return mention.ticker, mention.ts_utc.replace(second=0, microsecond=0)
+
+        rows = list(self.rows.values())
+        changed = {key(m) for updated, m in rows if updated >= changed_since and m.ts_utc >= since}
+        return [(updated, m) for updated, m in rows if key(m) in changed]
+
+    def upsert_row(
+        self,
+        row: str,
+        ts: datetime,
+        ticker: str,
+        author: str,
+        updated: datetime,
+        sentiment: float = 0.2,
+    ) -> None:
+        mention = MentionRecord.from_event(make_mention(ts, ticker, author, f"t{row}"))
+        mention.sentiment_score = sentiment
+        self.rows[row] = (updated, mention)
+
+
+@pytest.mark.asyncio
+async def test_incremental_aggregator_rebuilds_only_changed_minutes() -> None:
+    source = FakeRowSource()
+    base = datetime(2024, 1, 1, 0, 10, tzinfo=UTC)
+    aggregator = IncrementalAggregator(source, clock=lambda: base.timestamp() + 120)
+    source.upsert_row("a", base, "PLTR", "u1", updated=base)
+    source.upsert_row("b", base, "PLTR", "u2", updated=base)
+    next_minute = base + timedelta(minutes=1)
+    source.upsert_row("c", next_minute, "AAPL", "u1", updated=next_minute)
+
+    assert await aggregator.run_once() == 3
+    assert {(agg.ticker, agg.mentions) for agg in source.upserts[-1]} == {("PLTR", 2), ("AAPL", 1)}
+
+    # A late commit stamped inside the lag, then a re-score of an existing row.
+    late, rescored = base + timedelta(seconds=50), base + timedelta(minutes=2)
+    source.upsert_row("d", base.replace(minute=11), "AAPL", "u2", updated=late)
+    source.upsert_row("a", base, "PLTR", "u1", updated=rescored, sentiment=-1.0)
+    await aggregator.run_once()
+
+    latest = {agg.ticker: agg for agg in source.upserts[-1]}
+    assert (latest["AAPL"].mentions, latest["AAPL"].unique_authors) == (2, 2)
+    assert latest["PLTR"].mentions == 2
+    assert latest["PLTR"].avg_sentiment == pytest.approx(-0.4)
+    assert aggregator.watermark == rescored
+
+
+@pytest.mark.asyncio
+async def test_incremental_aggregator_leaves_minutes_behind_the_window() -> None:
+    source = FakeRowSource()
+    base = datetime(2024, 1, 1, 0, 0, tzinfo=UTC)
+    now = [base.timestamp()]
+    aggregator = IncrementalAggregator(source, window=timedelta(minutes=5), clock=lambda: now[0])
+    source.upsert_row("a", base, "PLTR", "u1", updated=base)
+    await aggregator.run_once()
+
+    now[0] += 600
+    updated = base + timedelta(minutes=10)
+    source.upsert_row("a", base, "PLTR", "u1", updated=updated)  # too old to revisit
+    source.upsert_row("b", base + timedelta(minutes=9), "PLTR", "u2", updated=updated)
+    assert await aggregator.run_once() == 1
+    assert [(agg.ts_utc.minute, agg.mentions) for agg in source.upserts[-1]] == [(9, 1)]
+    assert aggregator.snapshot()["aggregator_buckets"] == 1
@@ -0,0 +1,30 @@
+import pytest
+
+from trend.hll import HyperLogLog
+
+
+def test_small_sketches_are_sparse_and_near_exact() -> None:
+    sketch = HyperLogLog.from_items(f"user{idx}" for idx in range(50))
+    payload = sketch.to_bytes()
+
+    assert len(payload) < 200
+    assert len(sketch) == 50
+    assert len(HyperLogLog.from_bytes(payload)) == 50
+    assert len(HyperLogLog.from_bytes(HyperLogLog().to_bytes())) == 0
+
+
+def test_merge_all_estimates_the_union_of_overlapping_windows() -> None:
+    # Every minute shares 2,000 regulars and adds 200 newcomers: 4,000 distinct in total.
+    minutes = [
+        HyperLogLog.from_items(
+            [*(f"regular{idx}" for idx in range(2000)), *(f"new{m}-{idx}" for idx in range(200))]
+        )
+        for m in range(10)
+    ]
+    merged = HyperLogLog.merge_all(sketch.to_bytes() for sketch in minutes)
+
+    assert merged.estimate() == pytest.approx(4000, rel=0.05)
+    minutes[0].merge(minutes[1])
+    assert minutes[0].estimate() == pytest.approx(2400, rel=0.05)
+    with pytest.raises(ValueError):
+        HyperLogLog.merge_all([HyperLogLog(10).to_bytes(), HyperLogLog(12).to_bytes()])
@@ -0,0 +1,64 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from common.models import MinuteAggregation
+from trend.hll import HyperLogLog
+from trend.rollup import RollupStage, floor_to
+
+
+class FakeDB:
+    def __init__(self, stored=None) -> None:
+        self.stored = stored or []
+        self.fetched: list[tuple[str, tuple]] = []
+        self.written: list[tuple[str, list]] = []
+
+    async def fetch(self, query, *args):
+        self.fetched.append((query, args))
+        return self.stored if "mentions_5m" in query else []
+
+    async def executemany(self, query, rows):
+        self.written.append((query, list(rows)))
+
+
+def _minute(minute: int, authors: list[str]) -> MinuteAggregation:
+    return MinuteAggregation(
+        ts_utc=datetime(2024, 1, 1, 0, minute, tzinfo=UTC),
+        ticker="PLTR",
+        mentions=len(authors),
+        unique_authors=len(authors),
+        threads_touched=1,
+        avg_sentiment=0.0,
+        authors_hll=HyperLogLog.from_items(authors).to_bytes(),
+    )
+
+
+def test_floor_to_aligns_to_utc_buckets() -> None:
+    ts = datetime(2024, 1, 1, 13, 47, 12, tzinfo=UTC)
+
+    assert floor_to(ts, timedelta(minutes=5)) == datetime(2024, 1, 1, 13, 45, tzinfo=UTC)
+    assert floor_to(ts, timedelta(days=1)) == datetime(2024, 1, 1, tzinfo=UTC)
+    naive = ts.replace(tzinfo=None)
+    assert floor_to(naive, timedelta(hours=1)) == datetime(2024, 1, 1, 13, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_apply_merges_minute_sketches_into_stored_buckets() -> None:
+    bucket = datetime(2024, 1, 1, 0, 5, tzinfo=UTC)
+    sketch = HyperLogLog.from_items(["u1", "u9"]).to_bytes()
+    stored = [{"ticker": "PLTR", "ts_utc": bucket, "authors_hll": sketch}]
+    db = FakeDB(stored)
+
+    minutes = [_minute(6, ["u1", "u2"]), _minute(8, ["u2", "u3"])]
+    written = await RollupStage(db).apply(minutes)  # type: ignore[arg-type]
+
+    assert written == 3
+    tables = [query.split()[2] for query, _ in db.written]
+    assert tables == ["mentions_5m", "mentions_1h", "mentions_1d"]
+    (five_minute,) = db.written[0][1]
+    assert five_minute[:2] == (bucket, "PLTR")
+    assert five_minute[3] == 4
+    assert five_minute[4] == timedelta(minutes=5)
+    (hourly,) = db.written[1][1]
+    assert hourly[0] == datetime(2024, 1, 1, tzinfo=UTC)
+    assert hourly[3] == 3